@@ -1,6 +1,7 @@
 from typing import Dict, Any
 from graph.state import GraphState
-from ingestion import retriever
+from ingestion import retriever, search_web_cache
+from web_cache import WEB_RESULT_WRITEBACK
 
 def retrieve(state: GraphState) -> Dict[str, Any]:
     print("Retrieving...")
@@ -8,4 +9,10 @@ def retrieve(state: GraphState) -> Dict[str, Any]:
 
     documents = retriever.invoke(question)
 
-    return {"documents": documents, "question": question}
\ No newline at end of file
+    # Also search web results stored by earlier web searches
+    if WEB_RESULT_WRITEBACK:
+        cached_documents = search_web_cache(question)
+        print(f"Found {len(cached_documents)} cached web results")
+        documents = documents + cached_documents
+
+    return {"documents": documents, "question": question}
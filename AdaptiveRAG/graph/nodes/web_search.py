@@ -3,6 +3,8 @@ from dotenv import load_dotenv
 from langchain.schema import Document
 from langchain_tavily import TavilySearch
 from graph.state import GraphState
+from ingestion import store_web_results
+from web_cache import WEB_RESULT_WRITEBACK
 
 load_dotenv()
 
@@ -20,6 +22,11 @@ def web_search(state: GraphState) -> Dict[str, Any]:
 
     web_results = Document(page_content = joined_results)
 
+    # Keep relevant results so the next similar question can skip web search
+    if WEB_RESULT_WRITEBACK:
+        stored = store_web_results(question, tavily_results)
+        print(f"Stored {stored} web result chunks")
+
     # Add web results in existing docs (or create new list if documents is empty)
     if docs:
         docs.append(web_results)
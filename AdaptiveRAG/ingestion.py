@@ -1,3 +1,4 @@
+from langchain.schema import Document
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_chroma import Chroma
 from langchain_community.document_loaders import WebBaseLoader
@@ -5,6 +6,8 @@ from model import  embed_model
 from dotenv import load_dotenv
 load_dotenv()
 
+import web_cache
+
 urls = [
     "https://www.google.com/search?q=langchain",
     "https://www.google.com/search?q=langgraph",
@@ -32,3 +35,28 @@ vectorestore = Chroma.from_documents(
 #Create Retriever
 
 retriever = vectorestore.as_retriever(k=3)
+
+web_vectorstore = Chroma(
+    collection_name='RAG_WEB_CACHE',
+    embedding_function=embed,
+    persist_directory='./chroma_db',
+)
+
+
+def store_web_results(question: str, web_results: list[dict]) -> int:
+    """Grade web results in one batch and write the relevant ones to the web cache"""
+    # Imported here to avoid loading the grader LLM when write-back is disabled
+    from graph.chains.retrieval_grader import retrieval_grader
+
+    relevant_docs = web_cache.grade_web_results(question, web_results, retrieval_grader)
+    return web_cache.store_web_results(web_vectorstore, text_splitter, question, relevant_docs)
+
+
+def search_web_cache(question: str, k: int = 3) -> list[Document]:
+    """Search cached web results that have not expired yet"""
+    return web_cache.search_web_cache(web_vectorstore, question, k)
+
+
+def purge_expired_web_results() -> int:
+    """Delete cached web results whose TTL has passed"""
+    return web_cache.purge_expired_web_results(web_vectorstore)
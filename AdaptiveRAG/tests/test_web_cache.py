@@ -0,0 +1,107 @@
+from types import SimpleNamespace
+
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+import web_cache
+
+TTL = 100
+
+
+class FakeGrader:
+    """Grades a result relevant when its text mentions the keyword"""
+
+    def __init__(self, keyword: str):
+        self.keyword = keyword
+        self.batches = []
+
+    def batch(self, inputs):
+        self.batches.append(inputs)
+        return [
+            SimpleNamespace(binary_score="yes" if self.keyword in item["document"] else "no")
+            for item in inputs
+        ]
+
+
+class FakeChroma:
+    """In-memory stand-in for the Chroma calls the web cache makes"""
+
+    def __init__(self):
+        self.documents = {}
+
+    def add_documents(self, documents, ids):
+        self.documents.update(zip(ids, documents))
+
+    def get(self, where, include):
+        limit = where["expires_at"]["$lte"]
+        return {"ids": [chunk_id for chunk_id, doc in self.documents.items() if doc.metadata["expires_at"] <= limit]}
+
+    def delete(self, ids):
+        for chunk_id in ids:
+            del self.documents[chunk_id]
+
+    def similarity_search(self, question, k, filter):
+        after = filter["expires_at"]["$gt"]
+        return [doc for doc in self.documents.values() if doc.metadata["expires_at"] > after][:k]
+
+
+splitter = RecursiveCharacterTextSplitter(chunk_size=200, chunk_overlap=0)
+results = [
+    {"content": "LangGraph builds agent workflows as graphs.", "url": "https://a"},
+    {"content": "A recipe for banana bread.", "url": "https://b"},
+    {"content": "   ", "url": "https://c"},
+]
+
+
+def store(chroma, now):
+    documents = web_cache.grade_web_results("langgraph", results, FakeGrader("LangGraph"))
+    return web_cache.store_web_results(chroma, splitter, "langgraph", documents, ttl_seconds=TTL, now=now)
+
+
+def test_irrelevant_results_are_dropped_in_one_grader_batch():
+    grader = FakeGrader("LangGraph")
+
+    documents = web_cache.grade_web_results("langgraph", results, grader)
+
+    assert [doc.metadata["source"] for doc in documents] == ["https://a"]
+    # One call for every non-empty result
+    assert len(grader.batches) == 1
+    assert len(grader.batches[0]) == 2
+
+
+def test_expired_results_are_not_returned():
+    chroma = FakeChroma()
+    store(chroma, now=0)
+
+    assert len(web_cache.search_web_cache(chroma, "langgraph", now=TTL - 1)) == 1
+    assert web_cache.search_web_cache(chroma, "langgraph", now=TTL) == []
+
+
+def test_results_can_be_stored_again_after_expiry():
+    chroma = FakeChroma()
+    store(chroma, now=0)
+
+    assert store(chroma, now=TTL + 10) == 1
+
+    found = web_cache.search_web_cache(chroma, "langgraph", now=TTL + 20)
+    assert len(found) == 1
+    assert found[0].metadata["expires_at"] == 2 * TTL + 10
+
+
+def test_refetching_extends_the_expiry_without_duplicates():
+    chroma = FakeChroma()
+    store(chroma, now=0)
+
+    store(chroma, now=50)
+
+    assert len(chroma.documents) == 1
+    assert web_cache.search_web_cache(chroma, "langgraph", now=TTL + 10)[0].metadata["expires_at"] == 50 + TTL
+
+
+def test_storing_purges_expired_chunks():
+    chroma = FakeChroma()
+    store(chroma, now=0)
+
+    written = web_cache.store_web_results(chroma, splitter, "other", [], ttl_seconds=TTL, now=TTL)
+
+    assert written == 0
+    assert chroma.documents == {}
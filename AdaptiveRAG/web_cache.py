@@ -0,0 +1,100 @@
+import hashlib
+import os
+import time
+
+from dotenv import load_dotenv
+from langchain_core.documents import Document
+
+# The settings below are read at import, which may come before anything else loads .env
+load_dotenv()
+
+# Web result write-back (opt-in): relevant web search results are kept in a
+# separate collection so similar questions can be answered without Tavily
+WEB_RESULT_WRITEBACK = os.getenv("WEB_RESULT_WRITEBACK", "false").lower() == "true"
+WEB_CACHE_TTL_SECONDS = int(os.getenv("WEB_CACHE_TTL_SECONDS", 7 * 24 * 60 * 60))
+
+
+def chunk_id(content: str) -> str:
+    """Content-addressed id so the same chunk is stored only once"""
+    normalized = " ".join(content.split()).lower()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def grade_web_results(question: str, web_results: list[dict], grader) -> list[Document]:
+    """
+    Keep the web results the retrieval grader judges relevant to the question
+
+    Args:
+        question (str): The question the web search was run for
+        web_results (list[dict]): Raw Tavily results with 'content' and 'url'
+        grader: Retrieval grader chain; all results are graded in one batch
+
+    Returns:
+        list[Document]: The relevant results
+    """
+    web_results = [web_result for web_result in web_results if web_result.get("content", "").strip()]
+    if not web_results:
+        return []
+
+    grades = grader.batch(
+        [{"question": question, "document": web_result["content"]} for web_result in web_results]
+    )
+    return [
+        Document(page_content=web_result["content"], metadata={"source": web_result.get("url", "")})
+        for web_result, grade in zip(web_results, grades)
+        if grade.binary_score.lower() == "yes"
+    ]
+
+
+def store_web_results(vectorstore, text_splitter, question: str, documents: list[Document],
+                      ttl_seconds: int = WEB_CACHE_TTL_SECONDS, now: float | None = None) -> int:
+    """
+    Split, deduplicate and upsert relevant web results with a fresh expiry
+
+    Expired chunks are purged first. Chunks that are stored again, whether
+    they had expired or not, get a new expires_at.
+
+    Args:
+        vectorstore: Chroma collection holding the web cache
+        text_splitter: Splitter used for the main collection
+        question (str): The question the web search was run for
+        documents (list[Document]): Web results graded as relevant
+        ttl_seconds (int): Seconds the chunks stay searchable
+        now (float): Current time, defaults to time.time()
+
+    Returns:
+        int: Number of chunks written to the web cache collection
+    """
+    now = time.time() if now is None else now
+    purge_expired_web_results(vectorstore, now)
+    if not documents:
+        return 0
+
+    # Deduplicate within the batch; ids already in the collection are overwritten
+    chunks = {}
+    for chunk in text_splitter.split_documents(documents):
+        chunks.setdefault(chunk_id(chunk.page_content), chunk)
+
+    for chunk in chunks.values():
+        chunk.metadata.update({
+            "question": question,
+            "ingested_at": now,
+            "expires_at": now + ttl_seconds,
+        })
+    vectorstore.add_documents(documents=list(chunks.values()), ids=list(chunks))
+    return len(chunks)
+
+
+def search_web_cache(vectorstore, question: str, k: int = 3, now: float | None = None) -> list[Document]:
+    """Search cached web results that have not expired yet"""
+    now = time.time() if now is None else now
+    return vectorstore.similarity_search(question, k=k, filter={"expires_at": {"$gt": now}})
+
+
+def purge_expired_web_results(vectorstore, now: float | None = None) -> int:
+    """Delete cached web results whose TTL has passed"""
+    now = time.time() if now is None else now
+    expired_ids = vectorstore.get(where={"expires_at": {"$lte": now}}, include=[])["ids"]
+    if expired_ids:
+        vectorstore.delete(ids=expired_ids)
+    return len(expired_ids)
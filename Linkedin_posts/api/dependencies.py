@@ -0,0 +1,16 @@
+from fastapi import Request
+from src.jobs.manager import JobManager
+from src.workflows.registry import WorkflowRegistry
+from src.workflows.youtube_workflow import YouTubeWorkflow
+
+def get_registry(request: Request) -> WorkflowRegistry:
+    """Get the workflow registry created in the application lifespan"""
+    return request.app.state.registry
+
+def get_workflow(request: Request) -> YouTubeWorkflow:
+    """Get the shared default workflow instance"""
+    return get_registry(request).get()
+
+def get_job_manager(request: Request) -> JobManager:
+    """Get the background job manager created in the application lifespan"""
+    return request.app.state.job_manager
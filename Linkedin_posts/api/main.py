@@ -11,7 +11,12 @@ from contextlib import asynccontextmanager
 from datetime import datetime
 
 # Import route modules with fixed paths
-from api.routes import workflow, health
+from api.middleware.rate_limit import RateLimitMiddleware
+from api.routes import workflow, health, jobs
+from src.jobs import JobManager, JobStore
+from src.llm import llm_clients
+from src.ratelimit import RateLimiter
+from src.workflows.registry import WorkflowRegistry
 
 # Import configuration
 try:
@@ -30,9 +35,24 @@ async def lifespan(app: FastAPI):
     """Application lifespan management"""
     logger.info("Starting YouTube Multi-Agent Workflow API")
     logger.info(f"Version: 2.0.0")
+    
+    # Build the workflow once and share it across all requests
+    app.state.registry = WorkflowRegistry()
+    app.state.registry.get()
+    
+    # Background jobs pick up where a previous process left off
+    app.state.job_manager = JobManager(JobStore.from_settings(), app.state.registry)
+    await app.state.job_manager.start()
+    
+    # Fresh buckets per process start; RATE_LIMIT_BACKEND=sqlite shares them between workers
+    app.state.rate_limiter = RateLimiter.from_settings() if settings.RATE_LIMIT_ENABLED else None
     logger.info("LinkedIn Content Generation Ready!")
     yield
     logger.info("Shutting down YouTube Multi-Agent Workflow API")
+    await app.state.job_manager.stop()
+    if app.state.rate_limiter is not None:
+        app.state.rate_limiter.close()
+    await llm_clients.aclose()
 
 # Create FastAPI application
 app = FastAPI(
@@ -58,7 +78,7 @@ app = FastAPI(
     1. Get your OpenAI API key and add it to .env file
     2. Use `/workflow/linkedin-post` for LinkedIn-optimized posts
     3. Use `/workflow/process-video` for general content
-    4. Check `/health` for system status
+    4. Check `/health` for liveness and `/health/ready` for upstream status
     """,
     version="2.0.0",
     lifespan=lifespan,
@@ -66,6 +86,9 @@ app = FastAPI(
     redoc_url="/redoc"
 )
 
+# Per-client rate limiting; added before CORS so 429 responses still carry CORS headers
+app.add_middleware(RateLimitMiddleware)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -78,6 +101,7 @@ app.add_middleware(
 # Include routers
 app.include_router(health.router)
 app.include_router(workflow.router)
+app.include_router(jobs.router)
 
 @app.get("/")
 async def root():
@@ -99,10 +123,12 @@ async def root():
         "endpoints": {
             "documentation": "/docs",
             "health_check": "/health",
+            "readiness_check": "/health/ready",
             "linkedin_post": "/workflow/linkedin-post",
             "linkedin_bulk": "/workflow/linkedin-bulk",
             "linkedin_preview": "/workflow/linkedin-preview",
-            "general_processing": "/workflow/process-video"
+            "general_processing": "/workflow/process-video",
+            "bulk_jobs": "/jobs"
         },
         "quick_start": {
             "step_1": "Set OPENAI_API_KEY in your .env file",
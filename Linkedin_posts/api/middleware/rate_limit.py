@@ -0,0 +1,53 @@
+import asyncio
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+from src.config.settings import settings
+from src.ratelimit import RateLimiter
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+def client_key(request: Request) -> str:
+    """Rate limit key: the caller's API key when it is a configured one, otherwise its address"""
+    api_key = request.headers.get("x-api-key", "")
+    authorization = request.headers.get("authorization", "")
+    if not api_key and authorization.lower().startswith("bearer "):
+        api_key = authorization[7:].strip()
+    # Unknown keys are free to invent, so they must not earn a fresh bucket
+    if api_key not in settings.RATE_LIMIT_API_KEYS:
+        api_key = ""
+    
+    address = request.client.host if request.client else ""
+    if settings.RATE_LIMIT_TRUST_FORWARDED and request.headers.get("x-forwarded-for"):
+        address = request.headers["x-forwarded-for"].split(",")[0].strip()
+    return RateLimiter.client_key(api_key, address)
+
+class RateLimitMiddleware(BaseHTTPMiddleware):
+    """Answers 429 with Retry-After once a client's token bucket is empty, before any work is done"""
+    
+    async def dispatch(self, request: Request, call_next):
+        # The limiter is created in the application lifespan; without it requests pass through
+        limiter = getattr(request.app.state, "rate_limiter", None)
+        if limiter is None or request.method == "OPTIONS" or request.url.path in settings.RATE_LIMIT_EXEMPT_PATHS:
+            return await call_next(request)
+        
+        key = client_key(request)
+        # The SQLite backend can wait on other processes' write locks, so the check runs off the event loop
+        decision = await asyncio.to_thread(limiter.check, key)
+        headers = {
+            "X-RateLimit-Limit": str(decision['limit']),
+            "X-RateLimit-Remaining": str(decision['remaining'])
+        }
+        if not decision['allowed']:
+            headers["Retry-After"] = str(decision['retry_after'])
+            logger.warning(f"Rate limited {key[:20]} on {request.url.path}; retry in {decision['retry_after']}s")
+            return JSONResponse(
+                status_code=429,
+                content={"detail": f"Rate limit exceeded. Retry in {decision['retry_after']} seconds."},
+                headers=headers
+            )
+        
+        response = await call_next(request)
+        response.headers.update(headers)
+        return response
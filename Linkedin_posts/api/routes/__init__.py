@@ -3,6 +3,6 @@ Routes package for FastAPI application.
 Contains organized route handlers for different endpoints.
 """
 
-from . import workflow, health
+from . import workflow, health, jobs
 
-__all__ = ["workflow", "health"]
\ No newline at end of file
+__all__ = ["workflow", "health", "jobs"]
\ No newline at end of file
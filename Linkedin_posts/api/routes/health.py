@@ -1,22 +1,43 @@
-from fastapi import APIRouter
+import asyncio
+import time
+import httpx
+from fastapi import APIRouter, Depends, Request
 from datetime import datetime
-from src.models.responses import HealthResponse, ToolsResponse
-from src.workflows.youtube_workflow import YouTubeWorkflow
+from typing import Dict, Any
+from src.models.responses import HealthResponse, ReadinessResponse, ToolsResponse
+from src.cache.transcript_cache import transcript_cache
+from src.cache.llm_cache import llm_response_cache
+from src.cache.result_cache import result_cache
+from src.llm.clients import llm_clients
+from src.resilience.breaker import circuit_breakers
+from src.workflows.registry import WorkflowRegistry
 from src.config.settings import settings
+from api.dependencies import get_registry
 
 router = APIRouter(tags=["health"])
 
+# Upstreams probed by the readiness check
+UPSTREAM_PROBES = {
+    "openai": "https://api.openai.com/v1/models",
+    "youtube": "https://www.youtube.com",
+    "duckduckgo": "https://duckduckgo.com"
+}
+
+# Cached readiness results shared by all requests
+_readiness_cache: Dict[str, Any] = {"checked_at": 0.0, "checks": None}
+_readiness_lock = asyncio.Lock()
+
 @router.get("/health", response_model=HealthResponse)
-async def health_check():
-    """Comprehensive health check endpoint"""
+async def health_check(registry: WorkflowRegistry = Depends(get_registry)):
+    """Liveness check - reads the shared workflow, never calls upstreams"""
     
-    # Initialize workflow to check tools
-    workflow = YouTubeWorkflow()
+    workflow = registry.get()
     
     return HealthResponse(
         status="healthy",
         timestamp=datetime.now().isoformat(),
         version=settings.APP_VERSION,
+        uptime=registry.uptime,
         agents=["TranscriptAgent", "TitleAgent", "ContentAgent"],
         tools_loaded={
             "transcript_tools": len(workflow.transcript_agent.tools),
@@ -25,11 +46,39 @@ async def health_check():
         }
     )
 
+@router.get("/health/ready", response_model=ReadinessResponse)
+async def readiness_check():
+    """Readiness check - probes upstream services, results cached for READINESS_CACHE_TTL seconds"""
+    
+    checks, cached = await _get_upstream_checks()
+    ready = all(check["reachable"] for check in checks.values())
+    
+    return ReadinessResponse(
+        status="ready" if ready else "degraded",
+        timestamp=datetime.now().isoformat(),
+        checks=checks,
+        cached=cached
+    )
+
+@router.get("/metrics")
+async def get_metrics(request: Request):
+    """Runtime metrics for caches and other shared components"""
+    rate_limiter = getattr(request.app.state, "rate_limiter", None)
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "transcript_cache": transcript_cache.stats(),
+        "llm_cache": llm_response_cache.stats(),
+        "result_cache": result_cache.stats(),
+        "llm_clients": llm_clients.stats(),
+        "rate_limiter": rate_limiter.stats() if rate_limiter is not None else {"enabled": False},
+        "circuit_breakers": circuit_breakers.stats()
+    }
+
 @router.get("/tools", response_model=ToolsResponse)
-async def get_available_tools():
+async def get_available_tools(registry: WorkflowRegistry = Depends(get_registry)):
     """Get detailed information about all available tools"""
     
-    workflow = YouTubeWorkflow()
+    workflow = registry.get()
     
     return ToolsResponse(
         transcript_agent_tools=[
@@ -51,3 +100,49 @@ async def get_available_tools():
             } for tool in workflow.content_agent.tools
         ]
     )
+
+async def _get_upstream_checks() -> tuple[Dict[str, Dict[str, Any]], bool]:
+    """Return cached upstream checks, refreshing them once the TTL has passed"""
+    if _is_cache_fresh():
+        return _readiness_cache["checks"], True
+    
+    async with _readiness_lock:
+        # Another request may have refreshed the cache while we waited
+        if _is_cache_fresh():
+            return _readiness_cache["checks"], True
+        
+        async with httpx.AsyncClient(timeout=settings.READINESS_PROBE_TIMEOUT) as client:
+            results = await asyncio.gather(
+                *(_probe_upstream(client, name, url) for name, url in UPSTREAM_PROBES.items())
+            )
+        
+        _readiness_cache["checks"] = dict(results)
+        _readiness_cache["checked_at"] = time.monotonic()
+        return _readiness_cache["checks"], False
+
+def _is_cache_fresh() -> bool:
+    return (
+        _readiness_cache["checks"] is not None
+        and time.monotonic() - _readiness_cache["checked_at"] < settings.READINESS_CACHE_TTL
+    )
+
+async def _probe_upstream(client: httpx.AsyncClient, name: str, url: str) -> tuple[str, Dict[str, Any]]:
+    """Probe a single upstream; any response below 500 counts as reachable"""
+    headers = {}
+    if name == "openai" and settings.OPENAI_API_KEY:
+        headers["Authorization"] = f"Bearer {settings.OPENAI_API_KEY}"
+    
+    start_time = time.monotonic()
+    try:
+        response = await client.head(url, headers=headers, follow_redirects=True)
+        return name, {
+            "reachable": response.status_code < 500,
+            "status_code": response.status_code,
+            "latency_ms": round((time.monotonic() - start_time) * 1000, 1)
+        }
+    except httpx.HTTPError as e:
+        return name, {
+            "reachable": False,
+            "error": str(e) or e.__class__.__name__,
+            "latency_ms": round((time.monotonic() - start_time) * 1000, 1)
+        }
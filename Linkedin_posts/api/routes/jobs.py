@@ -0,0 +1,107 @@
+import asyncio
+import json
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from src.config.settings import settings
+from src.jobs.manager import JobManager
+from src.jobs.store import JOB_ACTIVE_STATUSES
+from src.models.requests import BulkYouTubeRequest
+from src.models.responses import JobSubmitResponse, JobStatusResponse
+from api.dependencies import get_job_manager
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+# Events after which a job produces no further events
+TERMINAL_EVENTS = ("job_completed", "job_cancelled", "job_error")
+
+async def submit_job(manager: JobManager, request: BulkYouTubeRequest, output_format: str, linkedin: bool = False) -> JobSubmitResponse:
+    """Queue a bulk request as a background job"""
+    job_id = await manager.submit(
+        [str(url) for url in request.urls],
+        output_format=output_format,
+        language=request.language,
+        linkedin=linkedin
+    )
+    return JobSubmitResponse(
+        job_id=job_id,
+        status="queued",
+        total=len(request.urls),
+        status_url=f"/jobs/{job_id}",
+        events_url=f"/jobs/{job_id}/events"
+    )
+
+@router.post("", response_model=JobSubmitResponse, status_code=202)
+async def create_job(request: BulkYouTubeRequest, manager: JobManager = Depends(get_job_manager)):
+    """Queue a bulk request and return immediately with a job id"""
+    return await submit_job(manager, request, request.output_format)
+
+@router.get("/{job_id}", response_model=JobStatusResponse)
+async def get_job_status(
+    job_id: str,
+    include_results: bool = Query(True, description="Include results of finished items"),
+    manager: JobManager = Depends(get_job_manager)
+):
+    """Job progress with per-item status and any results produced so far"""
+    job = await asyncio.to_thread(manager.store.get_job, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    
+    counts = job['counts']
+    return JobStatusResponse(
+        job_id=job_id,
+        status=job['status'],
+        total=job['total'],
+        pending=counts.get('pending', 0),
+        running=counts.get('running', 0),
+        done=counts.get('done', 0),
+        failed=counts.get('failed', 0),
+        cancelled=counts.get('cancelled', 0),
+        created_at=job['created_at'],
+        updated_at=job['updated_at'],
+        items=await asyncio.to_thread(manager.store.get_items, job_id, include_results)
+    )
+
+@router.get("/{job_id}/events")
+async def stream_job_events(
+    job_id: str,
+    request: Request,
+    last_event_id: Optional[int] = Header(None),
+    manager: JobManager = Depends(get_job_manager)
+):
+    """Server-sent events for job progress; reconnects resume from Last-Event-ID"""
+    if await asyncio.to_thread(manager.store.get_job, job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    
+    async def events():
+        last_seq = last_event_id or 0
+        while not await request.is_disconnected():
+            batch = await manager.wait_for_events(job_id, last_seq, settings.JOB_EVENTS_HEARTBEAT)
+            if not batch:
+                job = await asyncio.to_thread(manager.store.get_job, job_id)
+                if job['status'] not in JOB_ACTIVE_STATUSES:
+                    return
+                yield ": keep-alive\n\n"
+                continue
+            for event in batch:
+                last_seq = event['seq']
+                yield f"id: {event['seq']}\nevent: {event['type']}\ndata: {json.dumps(event['data'])}\n\n"
+            if batch[-1]['type'] in TERMINAL_EVENTS:
+                return
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.delete("/{job_id}")
+async def cancel_job(job_id: str, manager: JobManager = Depends(get_job_manager)):
+    """Cancel a queued or running job; finished items keep their results"""
+    if await asyncio.to_thread(manager.store.get_job, job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    if not await manager.cancel(job_id):
+        raise HTTPException(status_code=409, detail=f"Job {job_id} has already finished")
+    return {"job_id": job_id, "status": "cancelled"}
@@ -2,107 +2,150 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks, Query
-from typing import Optional, List
-from pydantic import BaseModel, HttpUrl, validator
-import logging
+from fastapi import APIRouter, HTTPException, Header, Query, Depends, File, Form, UploadFile
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import Any, AsyncIterator, Dict, Optional
+import json
+import time
 
 # Fixed imports
 try:
     from src.workflows.youtube_workflow import YouTubeWorkflow
+    from src.cache.result_cache import result_cache
+    from src.models.requests import YouTubeRequest, BulkYouTubeRequest, StreamBulkYouTubeRequest, MultiFormatYouTubeRequest
+    from src.models.responses import WorkflowResponse, BulkWorkflowResponse, MultiFormatWorkflowResponse
+    from src.config.settings import settings
+    from src.jobs.manager import JobManager
+    from api.dependencies import get_workflow, get_job_manager
+    from api.routes.jobs import submit_job
+    from utils.exceptions import IdempotencyConflictError
+    from utils.helpers import add_linkedin_metadata
     from utils.logger import setup_logger
+    from utils.validators import validate_output_format, validate_youtube_url
 except ImportError:
     # Fallback for development
     project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     sys.path.insert(0, project_root)
     from src.workflows.youtube_workflow import YouTubeWorkflow
+    from src.cache.result_cache import result_cache
+    from src.models.requests import YouTubeRequest, BulkYouTubeRequest, StreamBulkYouTubeRequest, MultiFormatYouTubeRequest
+    from src.models.responses import WorkflowResponse, BulkWorkflowResponse, MultiFormatWorkflowResponse
+    from src.config.settings import settings
+    from src.jobs.manager import JobManager
+    from api.dependencies import get_workflow, get_job_manager
+    from api.routes.jobs import submit_job
+    from utils.exceptions import IdempotencyConflictError
+    from utils.helpers import add_linkedin_metadata
     from utils.logger import setup_logger
-
-# Define request/response models locally
-class YouTubeRequest(BaseModel):
-    url: HttpUrl
-    language: str = "en"
-    output_format: str = "linkedin"
-    
-    @validator('output_format')
-    def validate_output_format(cls, v):
-        allowed_formats = ["linkedin", "blog", "article", "twitter"]
-        if v not in allowed_formats:
-            raise ValueError(f"Output format must be one of: {allowed_formats}")
-        return v
-
-class BulkYouTubeRequest(BaseModel):
-    urls: List[HttpUrl]
-    language: str = "en"
-    output_format: str = "linkedin"
-    
-    @validator('urls')
-    def validate_urls_count(cls, v):
-        if len(v) > 10:
-            raise ValueError("Maximum 10 URLs allowed for bulk processing")
-        return v
-
-class WorkflowResponse(BaseModel):
-    transcript: str
-    title: str
-    content: str
-    metadata: dict
-    seo_analysis: Optional[dict] = None
-
-class BulkWorkflowResponse(BaseModel):
-    results: List[WorkflowResponse]
-    total_processed: int
-    success_count: int
-    error_count: int
-    errors: List[str] = []
+    from utils.validators import validate_output_format, validate_youtube_url
 
 logger = setup_logger(__name__)
 router = APIRouter(prefix="/workflow", tags=["workflow"])
 
-# Initialize workflow
-workflow = YouTubeWorkflow()
-
 @router.post("/process-video", response_model=WorkflowResponse)
-async def process_single_video(request: YouTubeRequest):
+async def process_single_video(
+    request: YouTubeRequest,
+    idempotency_key: Optional[str] = Header(None),
+    workflow: YouTubeWorkflow = Depends(get_workflow)
+):
     """Process a single YouTube video through the multi-agent workflow"""
     try:
         logger.info(f"Processing single video: {request.url}")
         
-        result = await workflow.process_youtube_video(
+        result = await _generate_cached(
+            workflow,
             youtube_url=str(request.url),
             output_format=request.output_format,
-            language=request.language
+            language=request.language,
+            bypass_cache=request.bypass_cache,
+            idempotency_key=idempotency_key
         )
         
         return WorkflowResponse(**result)
-        
+    
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Unexpected error processing video: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Processing failed: {str(e)}")
 
+@router.post("/process-formats", response_model=MultiFormatWorkflowResponse)
+async def process_video_formats(request: MultiFormatYouTubeRequest, workflow: YouTubeWorkflow = Depends(get_workflow)):
+    """Generate several platform variants of one video; the transcript is fetched and analyzed only once"""
+    try:
+        logger.info(f"Processing {len(request.output_formats)} formats for: {request.url}")
+        
+        result = await workflow.process_youtube_video_formats(
+            youtube_url=str(request.url),
+            output_formats=request.output_formats,
+            language=request.language,
+            bypass_cache=request.bypass_cache
+        )
+        
+        return MultiFormatWorkflowResponse(**result)
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Multi-format processing failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Processing failed: {str(e)}")
+
 @router.post("/process-bulk", response_model=BulkWorkflowResponse)  
-async def process_bulk_videos(request: BulkYouTubeRequest, background_tasks: BackgroundTasks):
-    """Process multiple YouTube videos in bulk"""
+async def process_bulk_videos(
+    request: BulkYouTubeRequest,
+    workflow: YouTubeWorkflow = Depends(get_workflow),
+    job_manager: JobManager = Depends(get_job_manager)
+):
+    """Process multiple YouTube videos in bulk; large batches are queued as a background job"""
+    if len(request.urls) > settings.BULK_SYNC_MAX_URLS:
+        job = await submit_job(job_manager, request, request.output_format)
+        return JSONResponse(status_code=202, content=job.model_dump())
+    
     try:
         logger.info(f"Processing bulk videos: {len(request.urls)} URLs")
         
         urls = [str(url) for url in request.urls]
         result = await workflow.process_multiple_videos(
             youtube_urls=urls,
-            output_format=request.output_format
+            output_format=request.output_format,
+            language=request.language
         )
         
         return BulkWorkflowResponse(**result)
-        
+    
     except Exception as e:
         logger.error(f"Bulk processing failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Bulk processing failed: {str(e)}")
 
+@router.post("/process-stream")
+async def stream_bulk_videos(request: StreamBulkYouTubeRequest, workflow: YouTubeWorkflow = Depends(get_workflow)):
+    """Process many videos, streaming one NDJSON record per video as soon as it completes"""
+    logger.info(f"Streaming bulk videos: {len(request.urls)} URLs")
+    records = workflow.stream_multiple_videos(request.urls, request.output_format, request.language)
+    return StreamingResponse(_ndjson_stream(records), media_type="application/x-ndjson")
+
+@router.post("/process-stream/upload")
+async def stream_bulk_upload(
+    file: UploadFile = File(..., description="Text or CSV file with one YouTube URL per line (first column)"),
+    output_format: str = Form("linkedin"),
+    language: str = Form("en"),
+    workflow: YouTubeWorkflow = Depends(get_workflow)
+):
+    """Stream results for an uploaded URL list of any size, reading it line by line"""
+    if not validate_output_format(output_format):
+        raise HTTPException(status_code=422, detail=f"Unsupported output format: {output_format}")
+    
+    logger.info(f"Streaming bulk videos from upload: {file.filename}")
+    records = workflow.stream_multiple_videos(_read_url_lines(file), output_format.lower(), language)
+    return StreamingResponse(_ndjson_stream(records), media_type="application/x-ndjson")
+
 # LinkedIn-specific endpoints
 @router.post("/linkedin-post", response_model=WorkflowResponse)
-async def generate_linkedin_post(request: YouTubeRequest):
+async def generate_linkedin_post(
+    request: YouTubeRequest,
+    idempotency_key: Optional[str] = Header(None),
+    workflow: YouTubeWorkflow = Depends(get_workflow)
+):
     """
     Generate LinkedIn post from YouTube video
     Optimized specifically for LinkedIn format with engagement features
@@ -111,46 +154,76 @@ async def generate_linkedin_post(request: YouTubeRequest):
         logger.info(f"Generating LinkedIn post from: {request.url}")
         
         # Force LinkedIn format
-        result = await workflow.process_youtube_video(
+        result = await _generate_cached(
+            workflow,
             youtube_url=str(request.url),
             output_format="linkedin",
-            language=request.language
+            language=request.language,
+            bypass_cache=request.bypass_cache,
+            idempotency_key=idempotency_key
         )
         
         # Add LinkedIn-specific metadata
-        result['metadata']['linkedin_optimized'] = True
-        result['metadata']['estimated_engagement_score'] = _calculate_engagement_score(result['content'])
-        result['metadata']['character_count'] = len(result['content'])
-        result['metadata']['hashtag_count'] = result['content'].count('#')
+        add_linkedin_metadata(result)
         
         return WorkflowResponse(**result)
-        
+    
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"LinkedIn post generation failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"LinkedIn post generation failed: {str(e)}")
 
+@router.post("/linkedin-post/stream")
+async def stream_linkedin_post(request: YouTubeRequest, workflow: YouTubeWorkflow = Depends(get_workflow)):
+    """
+    Generate LinkedIn post from YouTube video, streaming progress as server-sent events
+    Emits an event as each agent finishes, the content tokens as they are written, then the result
+    """
+    logger.info(f"Streaming LinkedIn post from: {request.url}")
+    return _sse_response(_linkedin_post_events(workflow, str(request.url), request.language, request.bypass_cache))
+
+@router.get("/linkedin-post/stream")
+async def stream_linkedin_post_from_query(
+    url: str = Query(..., description="YouTube video URL"),
+    language: str = Query("en", description="Transcript language"),
+    bypass_cache: bool = Query(False, description="Generate fresh LLM answers instead of reusing cached ones"),
+    workflow: YouTubeWorkflow = Depends(get_workflow)
+):
+    """Same as POST /linkedin-post/stream, for EventSource clients that can only send GET"""
+    if not validate_youtube_url(url):
+        raise HTTPException(status_code=400, detail=f"Invalid YouTube URL: {url}")
+    
+    logger.info(f"Streaming LinkedIn post from: {url}")
+    return _sse_response(_linkedin_post_events(workflow, url, language, bypass_cache))
+
 @router.post("/linkedin-bulk", response_model=BulkWorkflowResponse)
-async def generate_bulk_linkedin_posts(request: BulkYouTubeRequest):
-    """Generate LinkedIn posts from multiple YouTube videos"""
+async def generate_bulk_linkedin_posts(
+    request: BulkYouTubeRequest,
+    workflow: YouTubeWorkflow = Depends(get_workflow),
+    job_manager: JobManager = Depends(get_job_manager)
+):
+    """Generate LinkedIn posts from multiple YouTube videos; large batches are queued as a background job"""
+    if len(request.urls) > settings.BULK_SYNC_MAX_URLS:
+        job = await submit_job(job_manager, request, "linkedin", linkedin=True)
+        return JSONResponse(status_code=202, content=job.model_dump())
+    
     try:
         logger.info(f"Generating LinkedIn posts for {len(request.urls)} videos")
         
         urls = [str(url) for url in request.urls]
         result = await workflow.process_multiple_videos(
             youtube_urls=urls,
-            output_format="linkedin"
+            output_format="linkedin",
+            language=request.language
         )
         
         # Add LinkedIn-specific metadata to each result
         for video_result in result['results']:
-            video_result['metadata']['linkedin_optimized'] = True
-            video_result['metadata']['estimated_engagement_score'] = _calculate_engagement_score(video_result['content'])
-            video_result['metadata']['character_count'] = len(video_result['content'])
+            add_linkedin_metadata(video_result)
         
         return BulkWorkflowResponse(**result)
-        
+    
     except Exception as e:
         logger.error(f"Bulk LinkedIn generation failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Bulk LinkedIn generation failed: {str(e)}")
@@ -159,13 +232,20 @@ async def generate_bulk_linkedin_posts(request: BulkYouTubeRequest):
 async def preview_linkedin_format(
     url: str = Query(..., description="YouTube video URL"),
     include_hashtags: bool = Query(True, description="Include hashtags in preview"),
-    include_emojis: bool = Query(True, description="Include emojis in preview")
+    include_emojis: bool = Query(True, description="Include emojis in preview"),
+    language: str = Query("en", description="Transcript language"),
+    bypass_cache: bool = Query(False, description="Generate fresh LLM answers instead of reusing cached ones"),
+    workflow: YouTubeWorkflow = Depends(get_workflow)
 ):
     """Preview how a YouTube video would be formatted for LinkedIn"""
     try:
-        result = await workflow.process_youtube_video(
+        # Shares cached generations with /linkedin-post
+        result = await _generate_cached(
+            workflow,
             youtube_url=url,
-            output_format="linkedin"
+            output_format="linkedin",
+            language=language,
+            bypass_cache=bypass_cache
         )
         
         content = result['content']
@@ -193,13 +273,13 @@ async def preview_linkedin_format(
             "stats": preview_stats,
             "optimization_tips": _get_linkedin_tips(content, preview_stats)
         }
-        
+    
     except Exception as e:
         logger.error(f"LinkedIn preview failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Preview generation failed: {str(e)}")
 
 @router.get("/workflow-info")
-async def get_workflow_information():
+async def get_workflow_information(workflow: YouTubeWorkflow = Depends(get_workflow)):
     """Get detailed information about the workflow and its capabilities"""
     return workflow.get_workflow_info()
 
@@ -239,31 +319,78 @@ async def get_supported_platforms():
         ]
     }
 
-# Helper functions for LinkedIn optimization
-def _calculate_engagement_score(content: str) -> int:
-    """Calculate estimated engagement score for LinkedIn content"""
-    score = 50
-    
-    if content.startswith('🚀') or content.startswith('💡'):
-        score += 10
-    if '?' in content:
-        score += 15
-    if content.count('#') >= 3:
-        score += 10
-    if len(content.split('\n\n')) >= 3:
-        score += 5
-    if any(word in content.lower() for word in ['insights', 'tips', 'secrets', 'guide']):
-        score += 10
-    
-    if len(content) > 3000:
-        score -= 20
-    if content.count('#') > 10:
-        score -= 15
-    if content.count('!') > 5:
-        score -= 10
+async def _generate_cached(
+    workflow: YouTubeWorkflow,
+    youtube_url: str,
+    output_format: str,
+    language: str,
+    bypass_cache: bool = False,
+    idempotency_key: Optional[str] = None
+) -> Dict[str, Any]:
+    """Run the workflow through the shared result cache, so repeated and concurrent requests reuse one generation"""
+    try:
+        return await result_cache.get_or_generate(
+            workflow.result_cache_key(youtube_url, output_format, language),
+            lambda: workflow.process_youtube_video(youtube_url, output_format, language, bypass_cache),
+            bypass=bypass_cache,
+            idempotency_key=idempotency_key
+        )
+    except IdempotencyConflictError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+# Streaming helpers
+async def _read_url_lines(file: UploadFile, chunk_size: int = 64 * 1024) -> AsyncIterator[str]:
+    """Yield URLs from an uploaded file in chunks, skipping blanks, comments and a CSV header"""
+    buffer = b""
+    while True:
+        chunk = await file.read(chunk_size)
+        lines = (buffer + chunk).split(b"\n")
+        buffer = lines.pop() if chunk else b""
+        for line in lines:
+            url = line.decode("utf-8", errors="replace").split(",", 1)[0].strip().strip('"')
+            if url and not url.startswith("#") and url.lower() != "url":
+                yield url
+        if not chunk:
+            return
+
+async def _ndjson_stream(records: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+    """Serialize workflow records as NDJSON, ending with a summary record"""
+    started = time.perf_counter()
+    success_count = error_count = 0
+    async for record in records:
+        if record['success']:
+            success_count += 1
+        else:
+            error_count += 1
+        yield json.dumps({'type': 'result', **record}, default=str) + "\n"
     
-    return max(0, min(100, score))
+    yield json.dumps({
+        'type': 'summary',
+        'total_processed': success_count + error_count,
+        'success_count': success_count,
+        'error_count': error_count,
+        'duration_seconds': round(time.perf_counter() - started, 3)
+    }) + "\n"
+
+async def _linkedin_post_events(workflow: YouTubeWorkflow, url: str, language: str, bypass_cache: bool = False) -> AsyncIterator[str]:
+    """SSE frames for a streamed LinkedIn post; the first one is sent before any work starts"""
+    yield _sse("started", {'youtube_url': url, 'output_format': "linkedin", 'language': language})
+    async for event in workflow.stream_youtube_video(url, "linkedin", language, bypass_cache):
+        if event['event'] == 'result':
+            add_linkedin_metadata(event['data'])
+        yield _sse(event['event'], event['data'])
 
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+def _sse_response(frames: AsyncIterator[str]) -> StreamingResponse:
+    return StreamingResponse(
+        frames,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# Helper functions for LinkedIn optimization
 def _remove_hashtags(content: str) -> str:
     import re
     return re.sub(r'#\w+', '', content)
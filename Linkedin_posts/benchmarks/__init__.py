@@ -0,0 +1,4 @@
+"""
+Benchmarks for YouTube Agent Workflow.
+Run from the project root, e.g. `python -m benchmarks.transcript_strategies`.
+"""
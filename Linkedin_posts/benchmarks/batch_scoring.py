@@ -0,0 +1,44 @@
+"""Re-scoring an archive of posts: string tool interface vs the typed batch API, in-process and pooled"""
+
+import json
+import os
+import random
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")  # Settings require a key; nothing here calls OpenAI
+
+from src.tools.scoring import score_documents
+from src.tools.seo_tools import AdvancedSEOTool
+
+DOCUMENTS = 2000
+WORDS = "agents plan tasks call tools and keep memory retrieval pipelines chunk documents evaluation needs golden datasets".split()
+
+def make_post(seed: int) -> str:
+    random.seed(seed)
+    paragraphs = [
+        " ".join(random.choices(WORDS, k=random.randint(8, 20))).capitalize() + "."
+        for _ in range(random.randint(4, 10))
+    ]
+    return "\n\n".join(paragraphs) + "\n\n#AI #Agents"
+
+def tool_round_trip(posts: list) -> list:
+    """Previous approach: one tool call per post, then parse the JSON back out of the string"""
+    tool = AdvancedSEOTool()
+    return [json.loads(tool._run(post).split("Advanced SEO Analysis:", 1)[1]) for post in posts]
+
+def main():
+    posts = [make_post(seed) for seed in range(DOCUMENTS)]
+    cpus = os.cpu_count() or 1
+    print(f"{len(posts)} posts, {sum(map(len, posts)) // len(posts)} characters on average, {cpus} CPUs")
+    
+    runs = [("tool + json.loads", tool_round_trip), ("score_documents", lambda docs: score_documents(docs, workers=0))]
+    if cpus > 1:
+        runs.append((f"score_documents, {cpus} processes", lambda docs: score_documents(docs, workers=cpus)))
+    for name, func in runs:
+        started = time.perf_counter()
+        func(posts)
+        elapsed = time.perf_counter() - started
+        print(f"  {name:32s} {elapsed * 1000:8.0f} ms  ({elapsed / len(posts) * 1e6:6.0f} us/post)")
+
+if __name__ == "__main__":
+    main()
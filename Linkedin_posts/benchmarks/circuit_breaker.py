@@ -0,0 +1,81 @@
+"""Workflow latency while the trend search and YouTube stall and fail, with and without circuit breakers"""
+
+import asyncio
+import logging
+import os
+import statistics
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")  # Importing the agents builds ChatOpenAI clients
+
+from src.agents import transcript_agent
+from src.cache.transcript_cache import TranscriptCache
+from src.resilience import CircuitBreaker
+from src.tools import youtube_tools
+from src.workflows.youtube_workflow import YouTubeWorkflow
+from tests.fixtures.fake_llm import SlowFakeChatModel
+from tests.fixtures.faults import FaultySearchTool, Outage, make_faulty_transcript_api
+from tests.fixtures.stub_workflow import make_stubbed_workflow
+from utils.hedging import HedgedStrategyRunner
+
+URL = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+REQUESTS = 40
+STALL = 0.5      # seconds a failing upstream hangs before the connection errors out
+LLM_DELAY = 0.02
+MIN_CALLS = 5
+
+def percentile(latencies: list, fraction: float) -> float:
+    ordered = sorted(latencies)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+def report(name: str, latencies: list, outcomes: str) -> None:
+    print(
+        f"  {name:28s} p50 {statistics.median(latencies) * 1000:7.1f} ms  p99 {percentile(latencies, 0.99) * 1000:7.1f} ms"
+        f"  total {sum(latencies):6.2f} s  {outcomes}"
+    )
+
+async def trend_outage(enabled: bool) -> None:
+    """Search is down: requests still succeed, but each waits for the stalled search unless its breaker is open"""
+    outage = Outage(stall=STALL)
+    outage.down = True
+    workflow = make_stubbed_workflow(YouTubeWorkflow, llm_delay=LLM_DELAY)
+    workflow.title_agent.tools[1] = FaultySearchTool(outage)
+    workflow.title_agent.trend_breaker = CircuitBreaker("trend_search", min_calls=MIN_CALLS, enabled=enabled)
+    
+    latencies = []
+    for _ in range(REQUESTS):
+        started = time.perf_counter()
+        await workflow.process_youtube_video(URL)
+        latencies.append(time.perf_counter() - started)
+    report(f"trend search, breaker {'on' if enabled else 'off'}", latencies, f"{outage.calls} search calls")
+
+async def youtube_outage(enabled: bool) -> None:
+    """YouTube is down: every request fails, either after all extraction methods stall or at once"""
+    outage = Outage(stall=STALL)
+    outage.down = True
+    youtube_tools.YouTubeTranscriptApi = make_faulty_transcript_api(outage)
+    youtube_tools._strategy_runner = HedgedStrategyRunner(hedge_delay=None, max_workers=1)
+    youtube_tools._transcript_breaker = CircuitBreaker("youtube_transcripts", min_calls=MIN_CALLS, enabled=enabled)
+    agent = transcript_agent.TranscriptAgent()
+    agent.llm = SlowFakeChatModel(delay=LLM_DELAY, respond=lambda prompt: "Cleaned transcript")
+    
+    latencies, failed = [], 0
+    for _ in range(REQUESTS):
+        started = time.perf_counter()
+        state = await agent.process({'youtube_url': URL, 'transcript': "", 'metadata': {}, 'error': ""})
+        latencies.append(time.perf_counter() - started)
+        failed += bool(state['error'])
+    report(f"youtube, breaker {'on' if enabled else 'off'}", latencies, f"{failed} failed, {outage.calls} upstream calls")
+
+async def main():
+    logging.disable(logging.ERROR)  # Failed requests are expected here
+    cache = TranscriptCache(":memory:", ttl_seconds=0, max_bytes=0, max_memory_entries=0, enabled=False)
+    youtube_tools.transcript_cache = transcript_agent.transcript_cache = cache
+    print(f"{REQUESTS} sequential requests, failing upstreams stall {STALL * 1000:.0f} ms, breakers open after {MIN_CALLS} calls")
+    for enabled in (False, True):
+        await trend_outage(enabled)
+    for enabled in (False, True):
+        await youtube_outage(enabled)
+
+if __name__ == "__main__":
+    asyncio.run(main())
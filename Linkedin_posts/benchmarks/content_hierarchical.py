@@ -0,0 +1,95 @@
+"""Single-prompt vs hierarchical (chapter summaries first) content generation with fake LLMs"""
+
+import asyncio
+import os
+import random
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")  # ChatOpenAI clients are built but never called
+
+from src.agents.content_agent import ContentAgent
+from src.models.transcript import TranscriptSegments
+from tests.fixtures.fake_llm import SlowFakeChatModel
+
+# Simulated latencies are multiplied by SCALE so the benchmark finishes in seconds
+SCALE = 0.02
+CHARS_PER_TOKEN = 4
+VIDEO_MINUTES = [20, 60, 120]
+WORDS_PER_MINUTE = 150
+TOPICS = [
+    "agents plan tasks call tools and keep memory between steps",
+    "retrieval pipelines chunk documents embed them and rank results",
+    "evaluation needs golden datasets regression checks and human review",
+    "deployment adds queues rate limits caching and observability",
+    "costs depend on tokens model choice batching and prompt length",
+]
+
+# (base seconds, seconds per input token, seconds per output token)
+LARGE_MODEL = (0.8, 0.00025, 0.030)
+SMALL_MODEL = (0.4, 0.00005, 0.008)
+# USD per 1k (input, output) tokens
+LARGE_PRICE = (0.03, 0.06)
+SMALL_PRICE = (0.00015, 0.0006)
+
+def make_segments(minutes: int) -> TranscriptSegments:
+    random.seed(minutes)
+    parts, start = [], 0.0
+    words_per_segment = 10
+    for index in range(minutes * WORDS_PER_MINUTE // words_per_segment):
+        topic = TOPICS[index * len(TOPICS) // (minutes * WORDS_PER_MINUTE // words_per_segment)]
+        text = " ".join(random.choices(topic.split(), k=words_per_segment))
+        parts.append({"text": text, "start": start, "duration": 4.0})
+        start += 4.0
+    return TranscriptSegments.from_parts(parts)
+
+def fake_model(profile: tuple, output_chars: int) -> SlowFakeChatModel:
+    base, per_input, per_output = profile
+    return SlowFakeChatModel(
+        respond=lambda prompt: "x" * output_chars,
+        latency=lambda prompt, response: SCALE * (
+            base + per_input * len(prompt) / CHARS_PER_TOKEN + per_output * len(response) / CHARS_PER_TOKEN
+        )
+    )
+
+def token_usage(model: SlowFakeChatModel, output_chars: int) -> tuple:
+    input_tokens = sum(len(call) for call in model.calls) // CHARS_PER_TOKEN
+    output_tokens = len(model.calls) * output_chars // CHARS_PER_TOKEN
+    return input_tokens, output_tokens
+
+async def run(agent: ContentAgent, segments: TranscriptSegments, hierarchical: bool) -> dict:
+    agent.llm = fake_model(LARGE_MODEL, 1800)
+    agent.summary_llm = fake_model(SMALL_MODEL, 900)
+    transcript = segments.text()
+
+    started = time.perf_counter()
+    summaries = await agent._summarize_chapters(transcript, segments, "Agents") if hierarchical else None
+    content = await agent._generate_base_content(transcript, "Agents", "linkedin", summaries)
+    elapsed = (time.perf_counter() - started) / SCALE
+
+    large_in, large_out = token_usage(agent.llm, 1800)
+    small_in, small_out = token_usage(agent.summary_llm, 900)
+    cost = (large_in * LARGE_PRICE[0] + large_out * LARGE_PRICE[1] + small_in * SMALL_PRICE[0] + small_out * SMALL_PRICE[1]) / 1000
+    return {
+        "cost": cost,
+        "seconds": elapsed,
+        "large_tokens": large_in + large_out,
+        "small_tokens": small_in + small_out,
+        "calls": len(agent.llm.calls) + len(agent.summary_llm.calls),
+        "coverage": min(1.0, 50000 / len(transcript)) if not hierarchical else 1.0,
+        "output_chars": len(content),
+    }
+
+async def main():
+    agent = ContentAgent()
+    print(f"{'video':>6} {'mode':>13} {'sim. s':>8} {'calls':>6} {'large tok':>10} {'small tok':>10} {'coverage':>9} {'out chars':>10} {'est. $':>7}")
+    for minutes in VIDEO_MINUTES:
+        segments = make_segments(minutes)
+        for mode, hierarchical in [("single prompt", False), ("hierarchical", True)]:
+            result = await run(agent, segments, hierarchical)
+            print(
+                f"{minutes:>4}m {mode:>14} {result['seconds']:8.1f} {result['calls']:6d} "
+                f"{result['large_tokens']:10d} {result['small_tokens']:10d} {result['coverage']:9.0%} {result['output_chars']:10d} {result['cost']:7.3f}"
+            )
+
+if __name__ == "__main__":
+    asyncio.run(main())
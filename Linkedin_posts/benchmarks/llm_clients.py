@@ -0,0 +1,99 @@
+"""Client start-up cost and TCP connections opened: per-agent ChatOpenAI clients vs the shared factory"""
+
+import asyncio
+import logging
+import os
+import socket
+import threading
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")  # Requests go to a local stub server
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, Request
+from langchain_core.messages import HumanMessage
+from langchain_openai import ChatOpenAI
+from src.config.settings import settings
+from src.llm.clients import LLMClientFactory
+
+WORKFLOWS = 10   # Workflow instances built at start-up (registry variants, tests, scripts)
+VIDEOS = 8       # Videos processed concurrently
+STUB_LATENCY = 0.05
+# LLM calls per video by agent, in pipeline order: (agent, calls made concurrently)
+STAGES = [("transcript", 4), ("title", 2), ("summary", 4), ("content", 2)]
+
+def stub_server() -> tuple:
+    """OpenAI-compatible stub that records each client connection it sees"""
+    app = FastAPI()
+    connections = set()
+    
+    @app.post("/v1/chat/completions")
+    async def complete(request: Request):
+        connections.add((request.client.host, request.client.port))
+        await asyncio.sleep(STUB_LATENCY)
+        return {
+            "id": "stub", "object": "chat.completion", "created": 0, "model": "stub",
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "ok"}}],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2}
+        }
+    
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, port=port, log_level="error"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, f"http://127.0.0.1:{port}/v1", connections
+
+def per_agent_clients(base_url: str) -> dict:
+    """One ChatOpenAI with its own connection pool per agent, as BaseAgent used to build them"""
+    def build(model):
+        return ChatOpenAI(model=model, api_key=settings.OPENAI_API_KEY, base_url=base_url, http_async_client=httpx.AsyncClient())
+    return {agent: build(settings.CONTENT_SUMMARY_MODEL if agent == "summary" else settings.OPENAI_MODEL) for agent, _ in STAGES}
+
+def shared_clients(factory: LLMClientFactory) -> dict:
+    return {
+        agent: factory.get(settings.CONTENT_SUMMARY_MODEL, temperature=0.3) if agent == "summary" else factory.get()
+        for agent, _ in STAGES
+    }
+
+async def process_videos(clients_per_workflow: list) -> None:
+    async def video(clients):
+        for agent, calls in STAGES:
+            await asyncio.gather(*(clients[agent].ainvoke([HumanMessage("hi")]) for _ in range(calls)))
+    await asyncio.gather(*(video(clients_per_workflow[index % len(clients_per_workflow)]) for index in range(VIDEOS)))
+
+async def run(name: str, build, connections: set) -> None:
+    started = time.perf_counter()
+    clients = [build() for _ in range(WORKFLOWS)]
+    startup = time.perf_counter() - started
+    
+    connections.clear()
+    started = time.perf_counter()
+    await process_videos(clients)
+    await process_videos(clients)  # Second pass shows connection reuse
+    elapsed = time.perf_counter() - started
+    print(f"  {name:18s} start-up {startup * 1000:7.1f} ms   connections opened {len(connections):4d}   two passes {elapsed:.2f}s")
+
+async def main():
+    logging.disable(logging.INFO)
+    server, base_url, connections = stub_server()
+    print(f"{WORKFLOWS} workflows built, {VIDEOS} concurrent videos x {sum(calls for _, calls in STAGES)} LLM calls, run twice")
+    
+    await run("per-agent clients", lambda: per_agent_clients(base_url), connections)
+    factory = LLMClientFactory(
+        api_key=settings.OPENAI_API_KEY,
+        base_url=base_url,
+        max_connections=settings.LLM_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.LLM_MAX_KEEPALIVE_CONNECTIONS
+    )
+    await run("shared factory", lambda: shared_clients(factory), connections)
+    print(f"  shared pool: {factory.stats()['open_connections']['async']} connections left open (max {factory.limits.max_connections})")
+    
+    await factory.aclose()
+    server.should_exit = True
+
+if __name__ == "__main__":
+    asyncio.run(main())
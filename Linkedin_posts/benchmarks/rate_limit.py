@@ -0,0 +1,129 @@
+"""Latency of well-behaved clients while others flood the API, with and without per-client rate limiting"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+import httpx
+from fastapi import FastAPI
+from api.middleware.rate_limit import RateLimitMiddleware
+from src.config.settings import settings
+from src.ratelimit import MemoryBucketBackend, RateLimiter, SQLiteBucketBackend
+
+WORKERS = 10          # requests the stubbed upstream serves at once
+UPSTREAM_DELAY = 0.05  # seconds per request, so capacity is WORKERS / UPSTREAM_DELAY = 200 requests/s
+PER_MINUTE = 60
+GOOD_CLIENTS = 10
+GOOD_INTERVAL = 1.5   # seconds between a good client's requests, under PER_MINUTE
+ABUSE_RATE = 400      # requests/s offered by the abusive keys together, twice the capacity
+ABUSE_KEYS = 3
+DURATION = 10.0
+WARMUP = 2.0          # the abusers' initial burst allowance drains in this window
+PROCESSES = 4         # worker processes sharing one SQLite bucket file; the flood is split between them
+
+# Only configured keys get their own buckets. Good clients are distinct per process; the
+# abusers use the same keys everywhere, so their buckets are contended across processes
+settings.RATE_LIMIT_API_KEYS = [
+    f"good-{process}-{index}" for process in range(PROCESSES) for index in range(GOOD_CLIENTS)
+] + [f"abuser-{index}" for index in range(ABUSE_KEYS)]
+
+def make_app(backend: str, path: str = "") -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware)
+    if backend == "memory":
+        app.state.rate_limiter = RateLimiter(MemoryBucketBackend(), per_minute=PER_MINUTE)
+    elif backend == "sqlite":
+        app.state.rate_limiter = RateLimiter(SQLiteBucketBackend(path), per_minute=PER_MINUTE)
+    else:
+        app.state.rate_limiter = None
+    upstream = asyncio.Semaphore(WORKERS)
+    
+    @app.get("/work")
+    async def work():
+        async with upstream:
+            await asyncio.sleep(UPSTREAM_DELAY)
+        return {"ok": True}
+    
+    return app
+
+async def good_client(client: httpx.AsyncClient, key: str, delay: float, started: float, latencies: list) -> None:
+    await asyncio.sleep(delay)
+    while time.perf_counter() - started < DURATION:
+        sent = time.perf_counter()
+        response = await client.get("/work", headers={"X-API-Key": key})
+        assert response.status_code == 200
+        if sent - started >= WARMUP:
+            latencies.append(time.perf_counter() - sent)
+        await asyncio.sleep(GOOD_INTERVAL)
+
+async def abuser(client: httpx.AsyncClient, rate: float, started: float, statuses: list) -> None:
+    """Open-loop flood: requests go out at a fixed rate whether or not earlier ones finished"""
+    tasks, sent = [], 0
+    while time.perf_counter() - started < DURATION:
+        due = int((time.perf_counter() - started) * rate)
+        for _ in range(due - sent):
+            tasks.append(asyncio.create_task(client.get("/work", headers={"X-API-Key": f"abuser-{sent % ABUSE_KEYS}"})))
+            sent += 1
+        await asyncio.sleep(0.005)
+    for response in await asyncio.gather(*tasks, return_exceptions=True):
+        statuses.append(getattr(response, "status_code", 0))
+
+async def measure(backend: str, abuse: bool, path: str = "", process: int = 0, processes: int = 1) -> tuple:
+    """Good-client latencies and abuser statuses seen by one worker process"""
+    transport = httpx.ASGITransport(app=make_app(backend, path))
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        latencies, statuses = [], []
+        started = time.perf_counter()
+        jobs = [
+            good_client(client, f"good-{process}-{index}", index * GOOD_INTERVAL / GOOD_CLIENTS, started, latencies)
+            for index in range(GOOD_CLIENTS)
+        ]
+        if abuse:
+            jobs.append(abuser(client, ABUSE_RATE / processes, started, statuses))
+        await asyncio.gather(*jobs)
+    return latencies, statuses
+
+def measure_in_process(path: str, process: int) -> tuple:
+    logging.disable(logging.WARNING)
+    return asyncio.run(measure("sqlite", abuse=True, path=path, process=process, processes=PROCESSES))
+
+def report(name: str, latencies: list, statuses: list) -> None:
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    rejected = sum(1 for status in statuses if status == 429)
+    print(
+        f"  {name:28s} good p50 {statistics.median(latencies) * 1000:7.1f} ms  p99 {p99 * 1000:7.1f} ms"
+        f"  ({len(latencies)} requests)" + (f"  abuse: {len(statuses)} sent, {rejected} rejected" if statuses else "")
+    )
+
+def run_processes(path: str) -> None:
+    """The same flood spread over PROCESSES workers, all taking tokens from one SQLite file"""
+    with multiprocessing.get_context("spawn").Pool(PROCESSES) as pool:
+        results = pool.starmap(measure_in_process, [(path, process) for process in range(PROCESSES)])
+    latencies = [latency for process_latencies, _ in results for latency in process_latencies]
+    statuses = [status for _, process_statuses in results for status in process_statuses]
+    report(f"sqlite x {PROCESSES} processes + abuse", latencies, statuses)
+
+def main():
+    logging.disable(logging.WARNING)
+    print(
+        f"Upstream {WORKERS} x {UPSTREAM_DELAY * 1000:.0f} ms, {GOOD_CLIENTS} good clients every {GOOD_INTERVAL}s, "
+        f"{ABUSE_RATE} req/s abuse over {ABUSE_KEYS} keys, limit {PER_MINUTE}/min; first {WARMUP}s excluded"
+    )
+    report("unlimited", *asyncio.run(measure("none", abuse=False)))
+    report("unlimited + abuse", *asyncio.run(measure("none", abuse=True)))
+    report("memory + abuse", *asyncio.run(measure("memory", abuse=True)))
+    
+    # RATE_LIMIT_BACKEND=sqlite: the bucket check takes a file lock, and with several processes it waits for the others
+    with tempfile.TemporaryDirectory() as directory:
+        report("sqlite + abuse", *asyncio.run(measure("sqlite", abuse=True, path=os.path.join(directory, "single.db"))))
+        run_processes(os.path.join(directory, "shared.db"))
+
+if __name__ == "__main__":
+    main()
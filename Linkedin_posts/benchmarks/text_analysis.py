@@ -0,0 +1,134 @@
+"""Per-tool tokenization vs one shared TextFeatures pass, and keyword extraction, on 50k-character content"""
+
+import os
+import random
+import re
+import timeit
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")  # Importing the agents builds ChatOpenAI clients
+
+from src.agents.title_agent import TitleAnalysisTool
+from src.tools.content_tools import ContentStructureTool
+from src.tools.seo_tools import AdvancedSEOTool, KeywordExtractorTool
+from utils.text_analysis import TextFeatures, analyze_text
+
+CHARACTERS = 50_000
+RUNS = 20
+WORDS = "Agents plan tasks, call tools and keep memory. Retrieval pipelines chunk documents! Why evaluate? #AI".split()
+STOP_WORDS = {'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'from', 'is', 'are'}
+
+def make_content(characters: int) -> str:
+    random.seed(42)
+    parts, size = [], 0
+    while size < characters:
+        word = random.choice(WORDS)
+        parts.append(word + ("\n\n" if random.random() < 0.02 else " "))
+        size += len(parts[-1])
+    return "".join(parts)[:characters]
+
+def separate_passes(content: str) -> None:
+    """Previous approach: each tool and helper re-tokenized the content on its own"""
+    # AdvancedSEOTool basic metrics
+    len(content.split())
+    len([s for s in content.split('.') if s.strip()])
+    len([p for p in content.split('\n\n') if p.strip()])
+    # calculate_readability_score, with its per-character syllable loop
+    len([s for s in content.split('.') if s.strip()])
+    len(content.split())
+    on_vowel, syllables = False, 0
+    for char in content.lower():
+        is_vowel = char in "aeiouy"
+        if is_vowel and not on_vowel:
+            syllables += 1
+        on_vowel = is_vowel
+    # AdvancedSEOTool._analyze_keywords
+    words = content.lower().split()
+    word_freq = {}
+    for word in words:
+        word = re.sub(r'[^\w]', '', word)
+        if len(word) > 2 and word not in STOP_WORDS:
+            word_freq[word] = word_freq.get(word, 0) + 1
+    len([w for w in words if len(w) > 2])
+    # AdvancedSEOTool meta suggestions
+    content.split('.')[0].strip()
+    # ContentStructureTool basic metrics
+    len(content.split())
+    len([s for s in content.split('.') if s.strip()])
+    len([p for p in content.split('\n\n') if p.strip()])
+    # TitleAnalysisTool
+    title_freq = {}
+    for word in content[:3000].lower().split():
+        word = word.strip('.,!?";:()[]{}')
+        if len(word) > 3 and word not in STOP_WORDS:
+            title_freq[word] = title_freq.get(word, 0) + 1
+
+def shared_pass(content: str) -> None:
+    """The same features read from one TextFeatures object"""
+    features = TextFeatures(content)
+    features.word_count, features.sentence_count, features.paragraph_count
+    features.readability
+    features.keyword_counts(STOP_WORDS)
+    sum(1 for w in features.lower_tokens if len(w) > 2)
+    features.first_sentence
+    title_freq = {}
+    for word in TextFeatures(content[:3000]).lower_tokens:
+        word = word.strip('.,!?";:()[]{}')
+        if len(word) > 3 and word not in STOP_WORDS:
+            title_freq[word] = title_freq.get(word, 0) + 1
+
+def previous_keywords(content: str) -> None:
+    """Previous KeywordExtractorTool counting: re-split per n, re.sub on every word of every window, full sorts"""
+    def extract_phrases(n):
+        words = content.lower().split()
+        phrases = []
+        for i in range(len(words) - n + 1):
+            phrase_words = []
+            for j in range(n):
+                word = re.sub(r'[^\w]', '', words[i + j])
+                if len(word) > 2:
+                    phrase_words.append(word)
+            if len(phrase_words) == n:
+                phrase = ' '.join(phrase_words)
+                if len(phrase) > 6:
+                    phrases.append(phrase)
+        return phrases
+    
+    word_freq = {}
+    for word in content.lower().split():
+        word = re.sub(r'[^\w]', '', word)
+        if len(word) > 2 and word not in STOP_WORDS:
+            word_freq[word] = word_freq.get(word, 0) + 1
+    phrase_freq = {}
+    for phrase in extract_phrases(2) + extract_phrases(3):
+        phrase_freq[phrase] = phrase_freq.get(phrase, 0) + 1
+    sorted(word_freq.items(), key=lambda x: x[1], reverse=True)[:20]
+    sorted(phrase_freq.items(), key=lambda x: x[1], reverse=True)[:10]
+
+def keyword_extractor(content: str) -> None:
+    """KeywordExtractorTool end to end, from a cold feature cache"""
+    analyze_text.cache_clear()
+    KeywordExtractorTool()._extract_keywords(content)
+
+def all_tools(content: str) -> None:
+    """Every text tool over the same content, as one workflow run would call them"""
+    analyze_text.cache_clear()
+    AdvancedSEOTool()._run(content)
+    ContentStructureTool()._run(f"{content}|||linkedin")
+    TitleAnalysisTool()._run(content[:3000])
+
+def main():
+    content = make_content(CHARACTERS)
+    print(f"{len(content)} characters, {len(content.split())} words")
+    
+    for name, func in [
+        ("separate passes", separate_passes),
+        ("shared features", shared_pass),
+        ("all tools (end to end)", all_tools),
+        ("previous keyword counting", previous_keywords),
+        ("keyword extractor", keyword_extractor),
+    ]:
+        seconds = min(timeit.repeat(lambda: func(content), number=1, repeat=RUNS))
+        print(f"  {name:24s} {seconds * 1000:8.2f} ms")
+
+if __name__ == "__main__":
+    main()
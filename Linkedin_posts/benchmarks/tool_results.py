@@ -0,0 +1,56 @@
+"""JSON text round trips vs typed tool results, for the analyses ContentAgent runs on 50k-character content"""
+
+import json
+import os
+import timeit
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+from benchmarks.text_analysis import make_content
+from src.tools.content_tools import ContentStructureTool, SEOAnalysisTool
+from src.tools.seo_tools import KeywordExtractorTool
+
+CHARACTERS = 50_000
+RUNS = 20
+
+def previous_round_trip(content: str) -> None:
+    """Previous ContentAgent path: tools dumped indented JSON, the agent split the label off and parsed it back"""
+    structure_text = ContentStructureTool()._run(f"{content}|||linkedin")
+    seo_raw = SEOAnalysisTool()._run(content)
+    json.loads(seo_raw.split("SEO Analysis:")[1].strip())
+    structure_text[:200]
+
+def typed_results(content: str) -> None:
+    """Typed results; the structure text is rendered once, for the enhancement prompt"""
+    structure = ContentStructureTool().analyze(content, "linkedin")
+    SEOAnalysisTool().analyze(content).data
+    structure.text[:200]
+
+def main():
+    content = make_content(CHARACTERS)
+    print(f"{len(content)} characters, {len(content.split())} words")
+    
+    # Warm the shared feature cache so the timings isolate the result handling
+    tools = [
+        ("structure", lambda: ContentStructureTool().analyze(content, "linkedin")),
+        ("seo", lambda: SEOAnalysisTool().analyze(content)),
+        ("keywords", lambda: KeywordExtractorTool().analyze(content)),
+    ]
+    for name, analyze in tools:
+        result = analyze()
+        text = result.text
+        label = f"{result.label}:"
+        dump = min(timeit.repeat(lambda: json.dumps(result.data, indent=2), number=1, repeat=RUNS))
+        parse = min(timeit.repeat(lambda: json.loads(text.split(label)[1].strip()), number=1, repeat=RUNS))
+        seconds = min(timeit.repeat(analyze, number=1, repeat=RUNS))
+        print(
+            f"  {name:10s} analysis {seconds * 1000:7.2f} ms, text {len(text):6d} chars: "
+            f"dumps {dump * 1000:6.3f} ms + split/loads {parse * 1000:6.3f} ms"
+        )
+    
+    for name, func in [("previous round trip", previous_round_trip), ("typed results", typed_results)]:
+        seconds = min(timeit.repeat(lambda: func(content), number=1, repeat=RUNS))
+        print(f"  {name:24s} {seconds * 1000:8.2f} ms")
+
+if __name__ == "__main__":
+    main()
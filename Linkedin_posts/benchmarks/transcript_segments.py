@@ -0,0 +1,61 @@
+"""Join/clean/slice cost of the segment store vs string concatenation on 2-hour transcripts"""
+
+import random
+import re
+import timeit
+from src.models.transcript import TranscriptSegments
+
+HOURS = 2
+SEGMENT_SECONDS = 3.0
+RUNS = 20
+WORDS = "agents model training data pipeline evaluation memory tools planning retrieval".split()
+
+def make_parts(hours: float) -> list[dict]:
+    random.seed(42)
+    parts = []
+    for index in range(int(hours * 3600 / SEGMENT_SECONDS)):
+        text = " ".join(random.choices(WORDS, k=random.randint(6, 12)))
+        if index % 40 == 0:
+            text += " [music]"
+        parts.append({"text": text, "start": index * SEGMENT_SECONDS, "duration": SEGMENT_SECONDS})
+    return parts
+
+def string_pipeline(parts: list[dict]) -> str:
+    """Previous approach: concatenate everything, then regex-clean the whole string"""
+    full_transcript = ""
+    total_duration = 0
+    for part in parts:
+        full_transcript += part['text'] + " "
+        total_duration += part['duration']
+    cleaned = re.sub(r'\s+', ' ', full_transcript)
+    cleaned = re.sub(r'\[.*?\]', '', cleaned)
+    cleaned = re.sub(r'\(.*?\)', '', cleaned)
+    return cleaned.strip()
+
+def segment_pipeline(parts: list[dict]) -> str:
+    segments = TranscriptSegments.from_parts(parts)
+    segments.text()
+    return segments.clean().text()
+
+def main():
+    parts = make_parts(HOURS)
+    segments = TranscriptSegments.from_parts(parts).clean()
+    text = segments.text()
+    print(f"{len(parts)} segments, {len(text)} characters ({HOURS}h)")
+    
+    for name, func in [("string concat + clean", string_pipeline), ("segment store + clean", segment_pipeline)]:
+        seconds = min(timeit.repeat(lambda: func(parts), number=1, repeat=RUNS))
+        print(f"  {name:28s} {seconds * 1000:8.2f} ms")
+    
+    # 10-minute window in the middle of the video
+    start, end = 3000.0, 3600.0
+    view_seconds = min(timeit.repeat(lambda: segments.slice_time(start, end), number=100, repeat=RUNS)) / 100
+    copy_seconds = min(timeit.repeat(
+        lambda: [t for t, s in zip(segments.texts, segments.starts) if start <= s < end],
+        number=100, repeat=RUNS
+    )) / 100
+    print(f"  {'slice 10 min (view)':28s} {view_seconds * 1e6:8.2f} us")
+    print(f"  {'slice 10 min (filter copy)':28s} {copy_seconds * 1e6:8.2f} us")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Latency distribution of sequential vs hedged transcript extraction against a local stub API"""
+
+import statistics
+import time
+from src.cache.transcript_cache import TranscriptCache
+from src.tools import youtube_tools
+from src.tools.youtube_tools import YouTubeTranscriptTool
+from tests.fixtures.stub_transcript_api import make_stub_api
+from utils.hedging import HedgedStrategyRunner
+
+RUNS = 30
+HEDGE_DELAY = 0.15
+
+# (latency, fails) per caption track
+SCENARIOS = {
+    "manual captions": dict(manual=(0.1, False), generated=(0.15, False)),
+    "manual captions fail slowly": dict(manual=(0.6, True), generated=(0.15, False)),
+    "no manual captions": dict(manual=(0.05, True), generated=(0.15, False)),
+}
+
+def measure(stub_api, hedge_delay) -> list[float]:
+    youtube_tools.YouTubeTranscriptApi = stub_api
+    tool = YouTubeTranscriptTool()
+    latencies = []
+    for run in range(RUNS):
+        # Fresh runner per run so the per-video memory doesn't hide the first-call cost
+        youtube_tools._strategy_runner = HedgedStrategyRunner(hedge_delay=hedge_delay, max_workers=3)
+        start = time.perf_counter()
+        tool._fetch_segments(f"video{run:06d}", "en")
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+def summarize(latencies: list[float]) -> str:
+    quantiles = statistics.quantiles(latencies, n=20)
+    return f"p50={statistics.median(latencies):7.1f}ms  p95={quantiles[18]:7.1f}ms  max={max(latencies):7.1f}ms"
+
+def main():
+    youtube_tools.transcript_cache = TranscriptCache(
+        ":memory:", ttl_seconds=0, max_bytes=0, max_memory_entries=1, enabled=False
+    )
+    for name, behaviour in SCENARIOS.items():
+        stub_api = make_stub_api(jitter=0.05, **behaviour)
+        print(f"{name}:")
+        print(f"  sequential  {summarize(measure(stub_api, hedge_delay=None))}")
+        print(f"  hedged      {summarize(measure(stub_api, hedge_delay=HEDGE_DELAY))}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""End-to-end latency of the sequential vs fan-out workflow graphs with stubbed LLMs and search"""
+
+import asyncio
+import logging
+import os
+import statistics
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")  # ChatOpenAI clients are built but never called
+
+from src.workflows import ParallelYouTubeWorkflow, YouTubeWorkflow
+from tests.fixtures.stub_workflow import make_stubbed_workflow
+
+LLM_DELAY = 0.5     # seconds per LLM round trip
+SEARCH_DELAY = 0.3  # seconds per DuckDuckGo query
+RUNS = 5
+URL = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+
+async def measure(workflow_cls) -> list:
+    workflow = make_stubbed_workflow(workflow_cls, llm_delay=LLM_DELAY, search_delay=SEARCH_DELAY)
+    timings = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        await workflow.process_youtube_video(URL)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+async def main():
+    logging.disable(logging.INFO)
+    print(f"LLM round trip {LLM_DELAY}s, search {SEARCH_DELAY}s, {RUNS} runs each")
+    medians = {}
+    for name, workflow_cls in [("sequential", YouTubeWorkflow), ("fan-out", ParallelYouTubeWorkflow)]:
+        timings = await measure(workflow_cls)
+        medians[name] = statistics.median(timings)
+        print(f"  {name:12s} median {medians[name]:.2f}s  min {min(timings):.2f}s  max {max(timings):.2f}s")
+    saved = medians["sequential"] - medians["fan-out"]
+    print(f"  saved {saved:.2f}s per video ({saved / LLM_DELAY:.1f} LLM round trips)")
+
+if __name__ == "__main__":
+    asyncio.run(main())
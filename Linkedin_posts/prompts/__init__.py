@@ -3,9 +3,14 @@ Prompts package for YouTube Agent Workflow.
 Contains organized LLM prompts for each agent and use case.
 """
 
+# Part of every LLM response cache key. Template text changes already produce new keys;
+# bump this when prompts change meaning without changing text (e.g. a new output parser)
+PROMPTS_VERSION = "1"
+
 from .transcript_prompts import (
     TRANSCRIPT_ANALYSIS_PROMPT,
-    TRANSCRIPT_CLEANUP_PROMPT
+    TRANSCRIPT_CLEANUP_PROMPT,
+    TRANSCRIPT_CHUNK_CLEANUP_PROMPT
 )
 from .title_prompts import (
     TITLE_GENERATION_PROMPT,
@@ -13,14 +18,18 @@ from .title_prompts import (
 )
 from .content_prompts import (
     CONTENT_GENERATION_PROMPT,
-    CONTENT_ENHANCEMENT_PROMPT
+    CONTENT_ENHANCEMENT_PROMPT,
+    CHAPTER_SUMMARY_PROMPT
 )
 
 __all__ = [
+    "PROMPTS_VERSION",
     "TRANSCRIPT_ANALYSIS_PROMPT",
     "TRANSCRIPT_CLEANUP_PROMPT",
+    "TRANSCRIPT_CHUNK_CLEANUP_PROMPT",
     "TITLE_GENERATION_PROMPT", 
     "TITLE_OPTIMIZATION_PROMPT",
     "CONTENT_GENERATION_PROMPT",
-    "CONTENT_ENHANCEMENT_PROMPT"
+    "CONTENT_ENHANCEMENT_PROMPT",
+    "CHAPTER_SUMMARY_PROMPT"
 ]
\ No newline at end of file
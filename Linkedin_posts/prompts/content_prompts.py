@@ -128,4 +128,24 @@ CONTENT_ENHANCEMENT_PROMPT = PromptTemplate(
     
     Enhanced Technical Content:
     """
-) 
\ No newline at end of file
+) 
+
+CHAPTER_SUMMARY_PROMPT = PromptTemplate(
+    input_variables=["title", "chapter_label", "transcript"],
+    template="""
+    Summarize one chapter of a technical YouTube video for a writer who will turn the video into a post.
+    
+    Video Title: {title}
+    Chapter: {chapter_label}
+    Chapter Transcript: {transcript}
+    
+    Please:
+    1. State the main point of this chapter in one sentence
+    2. Keep concrete examples, stories, names, numbers and quotes verbatim where possible
+    3. List any technical concepts, tools or methods mentioned
+    4. Skip greetings, sponsor reads and filler
+    5. Stay under 200 words
+    
+    Chapter Summary:
+    """
+)
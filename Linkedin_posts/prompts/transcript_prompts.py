@@ -34,4 +34,25 @@ TRANSCRIPT_CLEANUP_PROMPT = PromptTemplate(
     
     Cleaned Transcript:
     """
-) 
\ No newline at end of file
+) 
+
+TRANSCRIPT_CHUNK_CLEANUP_PROMPT = PromptTemplate(
+    input_variables=["context", "transcript"],
+    template="""
+    Clean and format one section of a longer YouTube video transcript for content generation.
+    
+    Preceding Text (for continuity only, do not repeat it): {context}
+    
+    Transcript Section: {transcript}
+    
+    Please:
+    1. Remove filler words (um, uh, like, you know)
+    2. Fix grammar and punctuation
+    3. Break into clear sentences and paragraphs
+    4. Remove speaker labels and timestamps
+    5. Maintain the original meaning and flow
+    6. Output only the cleaned section, without summarizing or adding commentary
+    
+    Cleaned Section:
+    """
+)
@@ -2,9 +2,9 @@
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List
 from langchain_core.tools import BaseTool
-from langchain_openai import ChatOpenAI
 from src.models.state import AgentState
 from src.config.settings import settings
+from src.llm.clients import llm_clients
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -14,12 +14,7 @@ class BaseAgent(ABC):
     
     def __init__(self, tools: List[BaseTool]):
         self.tools = tools
-        self.llm = ChatOpenAI(
-            model=settings.OPENAI_MODEL,
-            temperature=settings.DEFAULT_TEMPERATURE,
-            max_tokens=settings.DEFAULT_MAX_TOKENS,
-            api_key=settings.OPENAI_API_KEY
-        )
+        self.llm = llm_clients.get(settings.OPENAI_MODEL)
         self.agent_name = self.__class__.__name__
         
     @abstractmethod
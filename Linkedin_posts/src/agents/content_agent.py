@@ -1,15 +1,32 @@
+import asyncio
 from datetime import datetime
+from typing import List, Optional
 from .base_agents import BaseAgent
+from src.config.settings import settings
+from src.llm.clients import llm_clients
+from src.models.analysis import StructureAnalysis
 from src.models.state import AgentState
+from src.models.transcript import TranscriptSegments, TranscriptSlice
 from src.tools.content_tools import ContentStructureTool, SEOAnalysisTool
-from prompts.content_prompts import CONTENT_GENERATION_PROMPT, CONTENT_ENHANCEMENT_PROMPT
+from prompts.content_prompts import CONTENT_GENERATION_PROMPT, CONTENT_ENHANCEMENT_PROMPT, CHAPTER_SUMMARY_PROMPT
 from langchain_core.output_parsers import StrOutputParser
+from utils.chapters import detect_chapters
+from utils.deadline import within
 from utils.exceptions import ContentGenerationError
+from utils.helpers import split_sentences
 from utils.logger import setup_logger
-import json
 
 logger = setup_logger(__name__)
 
+# Tags that let streaming callers pick out the LLM calls that write the post
+CONTENT_DRAFT_TAG = "content_draft"
+CONTENT_ENHANCE_TAG = "content_enhance"
+
+def _format_timestamp(seconds: float) -> str:
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}" if hours else f"{minutes}:{secs:02d}"
+
 class ContentAgent(BaseAgent):
     """Expert AI/Agents technical analyst responsible for creating comprehensive, technically accurate content summaries"""
     
@@ -19,6 +36,12 @@ class ContentAgent(BaseAgent):
             SEOAnalysisTool()
         ]
         super().__init__(tools)
+        # Chapter summaries are extraction work; a faster, cheaper model is enough
+        self.summary_llm = llm_clients.get(
+            settings.CONTENT_SUMMARY_MODEL,
+            temperature=0.3,
+            max_tokens=settings.CONTENT_SUMMARY_MAX_TOKENS
+        )
     
     async def process(self, state: AgentState) -> AgentState:
         """Generate structured content from transcript and title"""
@@ -33,31 +56,44 @@ class ContentAgent(BaseAgent):
             seo_tool = self.tools[1]         # SEOAnalysisTool
             
             output_format = state.get('output_format', 'linkedin')
+            deadline = state.get('deadline')
+            
+            # Long videos are summarized chapter by chapter before writing the post
+            chapter_summaries = None
+            if len(state['transcript']) > settings.CONTENT_HIERARCHICAL_THRESHOLD:
+                chapter_summaries = await self._summarize_chapters(
+                    state['transcript'],
+                    state.get('transcript_segments'),
+                    state['title'],
+                    deadline
+                )
             
             # Generate initial content with LLM
             raw_content = await self._generate_base_content(
                 state['transcript'],
                 state['title'],
-                output_format
+                output_format,
+                chapter_summaries,
+                deadline
             )
             
-            # Get structure analysis
-            structure_input = f"{raw_content}|||{output_format}"
-            structure_analysis = structurer_tool._run(structure_input)
+            # Get structure analysis; the tools run in-process, so results stay typed
+            structure_analysis = structurer_tool.analyze(raw_content, output_format)
             
             # Enhance content based on structure analysis
             enhanced_content = await self._enhance_content(
                 raw_content,
                 output_format,
-                structure_analysis
+                structure_analysis,
+                deadline
             )
             
             # Perform SEO analysis
-            seo_analysis_raw = seo_tool._run(enhanced_content)
-            seo_analysis = self._parse_seo_analysis(seo_analysis_raw)
+            seo_analysis = self._analyze_seo(seo_tool, enhanced_content)
             
             # Apply final formatting based on platform
             final_content = self._apply_platform_formatting(enhanced_content, output_format, structure_analysis)
+            structure_text = structure_analysis.text
             
             # Update state
             state['content'] = final_content
@@ -70,19 +106,28 @@ class ContentAgent(BaseAgent):
                 content_generated=True,
                 content_length=len(final_content),
                 seo_score=seo_analysis.get('seo_score', 0),
-                structure_analysis=structure_analysis[:200] + "..." if len(structure_analysis) > 200 else structure_analysis
+                generation_mode="hierarchical" if chapter_summaries else "single_prompt",
+                chapter_count=len(chapter_summaries or []),
+                structure_analysis=structure_text[:200] + "..." if len(structure_text) > 200 else structure_text
             )
             
             logger.info(f"ContentAgent completed ({len(final_content)} characters)")
-            
+        
         except Exception as e:
             return self._handle_error(state, e)
         
         return state
     
-    async def _generate_base_content(self, transcript: str, title: str, output_format: str) -> str:
+    async def _generate_base_content(
+        self,
+        transcript: str,
+        title: str,
+        output_format: str,
+        chapter_summaries: Optional[List[str]] = None,
+        deadline: Optional[float] = None
+    ) -> str:
         """Generate expert-level technical content using LLM with AI/Agents domain expertise"""
-        content_chain = CONTENT_GENERATION_PROMPT | self.llm | StrOutputParser()
+        content_chain = (CONTENT_GENERATION_PROMPT | self.llm | StrOutputParser()).with_config(tags=[CONTENT_DRAFT_TAG])
         
         # Use the FULL transcript for comprehensive analysis
         transcript_length = len(transcript)
@@ -92,24 +137,73 @@ class ContentAgent(BaseAgent):
         # Increase to handle the full 20+ minute video transcripts
         max_transcript = min(transcript_length, 50000)  # Handle full 20+ minute videos
         
-        logger.info(f"Generating comprehensive content from {max_transcript}/{transcript_length} characters of transcript")
-        logger.info(f"Transcript preview (first 200 chars): {transcript[:200]}...")
-        logger.info(f"Transcript preview (last 200 chars): {transcript[-200:]}...")
-        
-        # Create a detailed structure analysis first
-        structure_analysis = await self._analyze_transcript_structure(transcript[:max_transcript])
+        if chapter_summaries:
+            source = "\n\n".join(chapter_summaries)
+            # Keyword analysis is local, so it can still see the whole transcript
+            structure_analysis = await self._analyze_transcript_structure(transcript)
+            logger.info(f"Generating content from {len(chapter_summaries)} chapter summaries ({len(source)}/{transcript_length} characters)")
+        else:
+            source = transcript[:max_transcript]
+            structure_analysis = await self._analyze_transcript_structure(source)
+            logger.info(f"Generating comprehensive content from {max_transcript}/{transcript_length} characters of transcript")
+            logger.info(f"Transcript preview (first 200 chars): {transcript[:200]}...")
+            logger.info(f"Transcript preview (last 200 chars): {transcript[-200:]}...")
         
-        content = await content_chain.ainvoke({
+        content = await within(content_chain.ainvoke({
             "title": title,
-            "transcript": transcript[:max_transcript],  # Use full available transcript
+            "transcript": source,
             "structure_analysis": structure_analysis,
             "output_format": output_format
-        })
+        }), deadline, what="content generation")
         
         # Clean the content to remove unwanted escape characters
         cleaned_content = self._clean_content_output(content.strip())
         return cleaned_content
     
+    async def _summarize_chapters(
+        self,
+        transcript: str,
+        segments: Optional[TranscriptSegments],
+        title: str,
+        deadline: Optional[float] = None
+    ) -> List[str]:
+        """Split the transcript into topical chapters and summarize them concurrently"""
+        if segments:
+            # Timestamped segments add pause information and chapter time ranges
+            ranges = detect_chapters(segments.texts, settings.CONTENT_CHAPTER_CHARS, segments.starts, segments.durations)
+            views = [TranscriptSlice(segments, first, last) for first, last in ranges]
+            chapters = [
+                (f"{_format_timestamp(view.start)}-{_format_timestamp(view.end)}", view.text())
+                for view in views
+            ]
+        else:
+            units = split_sentences(transcript)
+            ranges = detect_chapters(units, settings.CONTENT_CHAPTER_CHARS)
+            chapters = [(None, " ".join(units[first:last])) for first, last in ranges]
+        
+        logger.info(f"Summarizing {len(chapters)} chapters with {settings.CONTENT_SUMMARY_MODEL}")
+        summary_chain = CHAPTER_SUMMARY_PROMPT | self.summary_llm | StrOutputParser()
+        semaphore = asyncio.Semaphore(max(1, settings.CONTENT_SUMMARY_CONCURRENCY))
+        
+        async def summarize(index: int, time_range: Optional[str], text: str) -> str:
+            label = f"{index + 1} of {len(chapters)}" + (f" ({time_range})" if time_range else "")
+            async with semaphore:
+                try:
+                    summary = (await within(summary_chain.ainvoke({
+                        "title": title,
+                        "chapter_label": label,
+                        "transcript": text
+                    }), deadline, what=f"chapter {label} summary")).strip()
+                except Exception as e:
+                    # Keep the chapter's opening instead of losing it entirely
+                    logger.warning(f"Chapter {label} summary failed: {e}. Using chapter excerpt.")
+                    summary = text[:settings.CONTENT_SUMMARY_MAX_TOKENS * 4]
+            return f"Chapter {label}:\n{summary}"
+        
+        return list(await asyncio.gather(*(
+            summarize(index, time_range, text) for index, (time_range, text) in enumerate(chapters)
+        )))
+    
     async def _analyze_transcript_structure(self, transcript: str) -> str:
         """Expert analysis of transcript structure to identify AI/Agents technical topics and sections"""
         try:
@@ -164,7 +258,7 @@ class ContentAgent(BaseAgent):
             """
             
             return analysis
-            
+        
         except Exception as e:
             logger.warning(f"Transcript analysis failed: {e}")
             return "Comprehensive AI/Agents technical content analysis required"
@@ -206,35 +300,39 @@ class ContentAgent(BaseAgent):
         
         return cleaned.strip()
     
-    async def _enhance_content(self, content: str, platform: str, structure_analysis: str) -> str:
+    async def _enhance_content(
+        self,
+        content: str,
+        platform: str,
+        structure_analysis: StructureAnalysis,
+        deadline: Optional[float] = None
+    ) -> str:
         """Enhance content based on structure analysis"""
         try:
-            enhancement_chain = CONTENT_ENHANCEMENT_PROMPT | self.llm | StrOutputParser()
+            enhancement_chain = (CONTENT_ENHANCEMENT_PROMPT | self.llm | StrOutputParser()).with_config(tags=[CONTENT_ENHANCE_TAG])
             
-            enhanced = await enhancement_chain.ainvoke({
+            enhanced = await within(enhancement_chain.ainvoke({
                 "content": content,
                 "platform": platform,
-                "seo_analysis": structure_analysis
-            })
+                "seo_analysis": structure_analysis.text
+            }), deadline, what="content enhancement")
             
             return enhanced.strip()
-            
+        
         except Exception as e:
             logger.warning(f"Content enhancement failed: {e}")
             return content
     
-    def _parse_seo_analysis(self, seo_raw: str) -> dict:
-        """Parse SEO analysis from tool output"""
+    def _analyze_seo(self, seo_tool: SEOAnalysisTool, content: str) -> dict:
+        """SEO analysis as a dict, taken straight from the tool's typed result"""
         try:
-            if "SEO Analysis:" in seo_raw:
-                json_str = seo_raw.split("SEO Analysis:")[1].strip()
-                return json.loads(json_str)
-        except:
-            pass
-        
-        return {"raw_analysis": seo_raw, "parsing_failed": True}
+            return seo_tool.analyze(content).data
+        except Exception as e:
+            logger.warning(f"SEO analysis failed: {e}")
+            # Same shape the old JSON parsing fell back to, for API clients checking the flag
+            return {"raw_analysis": f"Error: Error in SEO analysis: {str(e)}", "parsing_failed": True}
     
-    def _apply_platform_formatting(self, content: str, platform: str, structure_analysis: str) -> str:
+    def _apply_platform_formatting(self, content: str, platform: str, structure_analysis: StructureAnalysis) -> str:
         """Apply platform-specific formatting to final content"""
         try:
             # Parse structure analysis to get formatting recommendations
@@ -250,7 +348,7 @@ class ContentAgent(BaseAgent):
             logger.warning(f"Platform formatting failed: {e}")
             return content
     
-    def _format_for_linkedin(self, content: str, structure_info: str) -> str:
+    def _format_for_linkedin(self, content: str, structure_info: StructureAnalysis) -> str:
         """Format content specifically for LinkedIn"""
         lines = content.split('\n')
         formatted_lines = []
@@ -305,16 +403,12 @@ class ContentAgent(BaseAgent):
         
         return '\n'.join(formatted_lines)
     
-    def _format_for_twitter(self, content: str, structure_info: str) -> str:
+    def _format_for_twitter(self, content: str, structure_info: StructureAnalysis) -> str:
         """Format content as Twitter thread"""
-        try:
-            # Try to extract tweet structure from structure_analysis
-            if "twitter_thread" in structure_info:
-                structure_data = json.loads(structure_info)
-                if "tweets" in structure_data:
-                    return '\n\n'.join(structure_data["tweets"])
-        except:
-            pass
+        # Use a tweet split from the structure analysis when it provides one
+        tweets = structure_info.data.get("tweets")
+        if tweets:
+            return '\n\n'.join(tweets)
         
         # Fallback: Split content into tweet-sized chunks
         words = content.split()
@@ -1,13 +1,19 @@
+import asyncio
 from datetime import datetime
+from typing import Dict, Optional
 from langchain_community.tools import DuckDuckGoSearchRun
 from langchain_core.tools import BaseTool
 
 from .base_agents import BaseAgent
+from src.config.settings import settings
 from src.models.state import AgentState
+from src.resilience.breaker import circuit_breakers
 from prompts.title_prompts import TITLE_GENERATION_PROMPT, TITLE_OPTIMIZATION_PROMPT
 from langchain_core.output_parsers import StrOutputParser
-from utils.exceptions import TitleGenerationError
+from utils.deadline import expired, time_left, within
+from utils.exceptions import DeadlineExceededError, TitleGenerationError
 from utils.logger import setup_logger
+from utils.text_analysis import analyze_text
 
 logger = setup_logger(__name__)
 
@@ -16,16 +22,16 @@ class TitleAnalysisTool(BaseTool):
     name: str = "title_analyzer"
     description: str = """Analyze text content and extract key themes, keywords, and topics
     that would make engaging titles. Input: content text. Output: analysis summary"""
-
+    
     def _run(self, content: str) -> str:
         try:
-            words = content.lower().split()
+            features = analyze_text(content)
             word_freq = {}
             
             # Filter out common stop words
             stop_words = {'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'from', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'must', 'shall', 'can', 'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they'}
             
-            for word in words:
+            for word in features.lower_tokens:
                 word = word.strip('.,!?";:()[]{}')
                 if len(word) > 3 and word not in stop_words:
                     word_freq[word] = word_freq.get(word, 0) + 1
@@ -49,13 +55,13 @@ class TitleAnalysisTool(BaseTool):
             }
             
             return f"Content Analysis: {analysis}"
-            
+        
         except Exception as e:
             return f"Error analyzing content: {str(e)}"
     
     def _identify_content_type(self, content: str) -> str:
         """Identify the type of content for better title targeting"""
-        content_lower = content.lower()
+        content_lower = analyze_text(content).lower
         if any(word in content_lower for word in ['how', 'tutorial', 'guide', 'step']):
             return "how-to"
         elif any(word in content_lower for word in ['review', 'comparison', 'vs']):
@@ -70,7 +76,7 @@ class TitleAnalysisTool(BaseTool):
     def _identify_emotional_triggers(self, content: str) -> list:
         """Identify emotional triggers that could make titles more engaging"""
         triggers = []
-        content_lower = content.lower()
+        content_lower = analyze_text(content).lower
         
         trigger_mapping = {
             'curiosity': ['secret', 'hidden', 'unknown', 'mystery', 'revealed'],
@@ -95,6 +101,7 @@ class TitleAgent(BaseAgent):
             DuckDuckGoSearchRun(name="web_search")
         ]
         super().__init__(tools)
+        self.trend_breaker = circuit_breakers.get("trend_search")
     
     async def process(self, state: AgentState) -> AgentState:
         """Generate optimized title from transcript"""
@@ -104,28 +111,25 @@ class TitleAgent(BaseAgent):
             
             logger.info("TitleAgent processing transcript for title generation")
             
-            # Use title analysis tool
-            title_analyzer = self.tools[0]  # TitleAnalysisTool
-            search_tool = self.tools[1]     # DuckDuckGoSearchRun
-            
-            # Analyze content for themes and keywords
-            content_analysis = title_analyzer._run(state['transcript'][:3000])
-            
-            # Search for trending topics to inform title
-            trend_info = await self._get_trending_topics(search_tool)
+            # Themes and trends do not depend on the platform, so callers may supply them precomputed
+            deadline = state.get('deadline')
+            analysis = state.get('title_analysis') or await self.analyze(state['transcript'], deadline)
+            content_analysis = analysis['content_analysis']
             
             # Generate title using LLM with analysis
             title = await self._generate_optimized_title(
                 state['transcript'], 
                 content_analysis, 
-                trend_info,
-                state.get('output_format', 'linkedin')
+                analysis['trend_info'],
+                state.get('output_format', 'linkedin'),
+                deadline
             )
             
             # Optimize title for platform
             optimized_title = await self._optimize_title_for_platform(
                 title, 
-                state.get('output_format', 'linkedin')
+                state.get('output_format', 'linkedin'),
+                deadline
             )
             
             # Update state
@@ -141,14 +145,31 @@ class TitleAgent(BaseAgent):
             )
             
             logger.info(f"TitleAgent completed: '{optimized_title}'")
-            
+        
         except Exception as e:
             return self._handle_error(state, e)
         
         return state
     
-    async def _get_trending_topics(self, search_tool) -> str:
+    async def analyze(self, transcript: str, deadline: Optional[float] = None) -> Dict[str, str]:
+        """Platform-independent title inputs: content themes and trending topics"""
+        title_analyzer = self.tools[0]  # TitleAnalysisTool
+        search_tool = self.tools[1]     # DuckDuckGoSearchRun
+        
+        return {
+            # Analyze content for themes and keywords
+            'content_analysis': title_analyzer._run(transcript[:3000]),
+            # Search for trending topics to inform title
+            'trend_info': await self._get_trending_topics(search_tool, deadline)
+        }
+    
+    async def _get_trending_topics(self, search_tool, deadline: Optional[float] = None) -> str:
         """Get trending topics for title inspiration"""
+        # Trends are optional: while the search is failing, go without them instead of waiting it out
+        if not self.trend_breaker.available():
+            logger.info("Trend search circuit open; skipping trend data")
+            return "No trend data available"
+        
         try:
             search_queries = [
                 "trending content topics 2025",
@@ -158,28 +179,50 @@ class TitleAgent(BaseAgent):
             
             trend_results = []
             for query in search_queries[:1]:  # Limit to avoid rate limits
+                if expired(deadline):
+                    break
+                # Running out of the request's own budget says nothing about the search service;
+                # only a search slower than its own cap counts against the breaker
+                budget_bound = time_left(deadline, settings.TREND_SEARCH_TIMEOUT) < settings.TREND_SEARCH_TIMEOUT
                 try:
-                    result = search_tool.run(query)
+                    # The search client is blocking; keep it off the event loop. Trends are optional,
+                    # so a slow search is abandoned rather than allowed to eat the request's budget
+                    with self.trend_breaker.guard(
+                        is_failure=lambda error: not (budget_bound and isinstance(error, DeadlineExceededError))
+                    ):
+                        result = await within(
+                            asyncio.to_thread(search_tool.run, query),
+                            deadline,
+                            cap=settings.TREND_SEARCH_TIMEOUT,
+                            what="trend search"
+                        )
                     trend_results.append(result[:200])  # Limit result length
-                except:
+                except Exception:
                     continue
             
             return " | ".join(trend_results) if trend_results else "No trend data available"
-            
+        
         except Exception as e:
             logger.warning(f"Could not fetch trending topics: {e}")
             return "Trend analysis unavailable"
     
-    async def _generate_optimized_title(self, transcript: str, analysis: str, trends: str, format_type: str) -> str:
+    async def _generate_optimized_title(
+        self,
+        transcript: str,
+        analysis: str,
+        trends: str,
+        format_type: str,
+        deadline: Optional[float] = None
+    ) -> str:
         """Generate title using LLM with analysis insights"""
         title_chain = TITLE_GENERATION_PROMPT | self.llm | StrOutputParser()
         
-        title_result = await title_chain.ainvoke({
+        title_result = await within(title_chain.ainvoke({
             "transcript": transcript[:3000],
             "content_analysis": analysis,
             "trend_info": trends,
             "output_format": format_type
-        })
+        }), deadline, what="title generation")
         
         # Extract the best title from the LLM response
         lines = title_result.split('\n')
@@ -193,15 +236,15 @@ class TitleAgent(BaseAgent):
         fallback_title = lines[0].strip() if lines else "Engaging Content from Video"
         return self._clean_title_output(fallback_title)
     
-    async def _optimize_title_for_platform(self, title: str, platform: str) -> str:
+    async def _optimize_title_for_platform(self, title: str, platform: str, deadline: Optional[float] = None) -> str:
         """Platform-specific title optimization"""
         try:
             optimization_chain = TITLE_OPTIMIZATION_PROMPT | self.llm | StrOutputParser()
             
-            optimized = await optimization_chain.ainvoke({
+            optimized = await within(optimization_chain.ainvoke({
                 "title": title,
                 "platform": platform
-            })
+            }), deadline, what="title optimization")
             
             # Extract just the optimized title, not the explanation
             lines = optimized.split('\n')
@@ -211,7 +254,7 @@ class TitleAgent(BaseAgent):
                     return line
             
             return title  # Fallback to original if parsing fails
-            
+        
         except Exception as e:
             logger.warning(f"Title optimization failed: {e}")
             return title
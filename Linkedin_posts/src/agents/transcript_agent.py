@@ -1,14 +1,20 @@
+import asyncio
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 from langchain_core.tools import BaseTool
 
 from .base_agents import BaseAgent
+from src.cache.transcript_cache import transcript_cache
+from src.config.settings import settings
 from src.models.state import AgentState
+from src.models.transcript import TranscriptSegments
+from src.resilience.breaker import circuit_breakers
 from src.tools.youtube_tools import YouTubeTranscriptTool, YouTubeMetadataTool
-from prompts.transcript_prompts import TRANSCRIPT_CLEANUP_PROMPT
+from prompts.transcript_prompts import TRANSCRIPT_CLEANUP_PROMPT, TRANSCRIPT_CHUNK_CLEANUP_PROMPT
 from langchain_core.output_parsers import StrOutputParser
-from utils.exceptions import TranscriptExtractionError
-from utils.helpers import create_metadata
+from utils.deadline import expired, time_left, within
+from utils.exceptions import DeadlineExceededError
+from utils.helpers import create_metadata, split_sentences, chunk_text
 from utils.validators import extract_youtube_video_id
 from utils.logger import setup_logger
 
@@ -17,12 +23,16 @@ logger = setup_logger(__name__)
 class TranscriptAgent(BaseAgent):
     """Agent responsible for extracting and processing YouTube transcripts"""
     
+    # Bump whenever cleaning logic or prompts change so cached cleaned transcripts are not reused
+    CLEANER_VERSION = "2"
+    
     def __init__(self):
         tools = [
             YouTubeTranscriptTool(),
             YouTubeMetadataTool()
         ]
         super().__init__(tools)
+        self.llm_breaker = circuit_breakers.get("openai")
     
     async def process(self, state: AgentState) -> AgentState:
         """Extract and clean YouTube transcript"""
@@ -31,40 +41,72 @@ class TranscriptAgent(BaseAgent):
             
             # Extract video ID for metadata
             video_id = extract_youtube_video_id(state['youtube_url'])
+            language = state['metadata'].get('language', settings.DEFAULT_LANGUAGE)
+            deadline = state.get('deadline')
             
             # Use YouTube transcript tool
             transcript_tool = self.tools[0]  # YouTubeTranscriptTool
             metadata_tool = self.tools[1]    # YouTubeMetadataTool
             
-            # Extract transcript
-            raw_transcript = transcript_tool._run(state['youtube_url'])
-            if raw_transcript.startswith("Error"):
-                raise TranscriptExtractionError(raw_transcript)
-            
-            # Log raw transcript details for debugging
-            logger.info(f"Raw transcript extracted: {len(raw_transcript)} characters")
-            logger.info(f"Raw transcript word count: {len(raw_transcript.split())}")
-            logger.info(f"Raw transcript preview (first 500 chars): {raw_transcript[:500]}...")
-            logger.info(f"Raw transcript preview (last 500 chars): {raw_transcript[-500:]}...")
-            
-            # Check if transcript seems too short for a 15-minute video
-            word_count = len(raw_transcript.split())
-            expected_min_words = 15 * 150  # 15 minutes * 150 words/minute minimum
-            if word_count < expected_min_words:
-                logger.warning(f"Transcript seems short: {word_count} words (expected ~{expected_min_words} for 15-minute video)")
-            
-            # Clean transcript using LLM
-            cleaned_transcript = await self._clean_transcript(raw_transcript)
+            # A cleaned transcript from an earlier request skips download and cleaning entirely;
+            # the cache reads and writes SQLite, so it is used from a thread
+            cached = await asyncio.to_thread(
+                transcript_cache.get_cleaned, video_id, language, self._cleaner_version()
+            ) if video_id else None
+            if cached:
+                logger.info(f"Using cached cleaned transcript for video {video_id}")
+                cleaned_transcript = cached['text']
+                raw_transcript_length = cached['raw_length']
+                simple_cleaning = False
+                cached_segments = await asyncio.to_thread(transcript_cache.get_segments, video_id, language)
+                segments = TranscriptSegments.from_dict(cached_segments).clean() if cached_segments else None
+            else:
+                # Extract timestamped segments off the event loop
+                segments = await transcript_tool.afetch_segments(
+                    state['youtube_url'],
+                    language=language,
+                    timeout=time_left(deadline, settings.YOUTUBE_TRANSCRIPT_TIMEOUT)
+                )
+                raw_transcript = segments.text()
+                
+                # Log raw transcript details for debugging
+                logger.info(f"Raw transcript extracted: {len(raw_transcript)} characters")
+                logger.info(f"Raw transcript word count: {len(raw_transcript.split())}")
+                logger.info(f"Raw transcript preview (first 500 chars): {raw_transcript[:500]}...")
+                logger.info(f"Raw transcript preview (last 500 chars): {raw_transcript[-500:]}...")
+                
+                # Check if transcript seems too short for a 15-minute video
+                word_count = len(raw_transcript.split())
+                expected_min_words = 15 * 150  # 15 minutes * 150 words/minute minimum
+                if word_count < expected_min_words:
+                    logger.warning(f"Transcript seems short: {word_count} words (expected ~{expected_min_words} for 15-minute video)")
+                
+                # Clean transcript using LLM; while OpenAI is failing, the regex cleaner keeps requests moving
+                simple_cleaning = not self.llm_breaker.available()
+                if simple_cleaning:
+                    logger.warning("OpenAI circuit open; using simple transcript cleaning")
+                    cleaned_transcript = self._simple_clean_transcript(raw_transcript)
+                else:
+                    cleaned_transcript = await self._clean_transcript(raw_transcript, segments, deadline)
+                raw_transcript_length = len(raw_transcript)
+                
+                # Don't cache the raw fallback used when cleaning failed, nor cleaning cut short by a deadline or outage
+                if video_id and cleaned_transcript != raw_transcript and not expired(deadline) and not simple_cleaning:
+                    await asyncio.to_thread(transcript_cache.set_cleaned, video_id, language, self._cleaner_version(), {
+                        'text': cleaned_transcript,
+                        'raw_length': raw_transcript_length
+                    })
             
             # Extract metadata
             metadata_raw = metadata_tool._run(state['youtube_url'])
             
             # Update state
             state['transcript'] = cleaned_transcript
+            state['transcript_segments'] = segments
             state['metadata'] = create_metadata(
                 video_id=video_id,
                 transcript_length=len(cleaned_transcript),
-                raw_transcript_length=len(raw_transcript),
+                raw_transcript_length=raw_transcript_length,
                 video_metadata=metadata_raw
             )
             
@@ -73,7 +115,9 @@ class TranscriptAgent(BaseAgent):
                 state, 
                 processed_at=datetime.now().isoformat(),
                 transcript_extracted=True,
-                cleaning_applied=True
+                cleaning_applied=True,
+                simple_cleaning=simple_cleaning,
+                transcript_cache_hit=bool(cached)
             )
             
             logger.info(f"TranscriptAgent completed successfully ({len(cleaned_transcript)} chars)")
@@ -83,35 +127,77 @@ class TranscriptAgent(BaseAgent):
         
         return state
     
-    async def _clean_transcript(self, raw_transcript: str) -> str:
+    def _cleaner_version(self) -> str:
+        """Cache key component identifying how cleaned transcripts were produced"""
+        return f"{self.CLEANER_VERSION}:{settings.OPENAI_MODEL}"
+    
+    async def _clean_transcript(
+        self,
+        raw_transcript: str,
+        segments: Optional[TranscriptSegments] = None,
+        deadline: Optional[float] = None
+    ) -> str:
         """Clean transcript using LLM"""
         try:
-            # Use the FULL transcript for cleaning - handle 20+ minute videos
             transcript_length = len(raw_transcript)
-            max_transcript = min(transcript_length, 50000)  # Handle full 20+ minute videos
             
-            logger.info(f"Cleaning transcript: {max_transcript}/{transcript_length} characters")
+            logger.info(f"Cleaning transcript: {transcript_length} characters")
             logger.info(f"Transcript preview (first 200 chars): {raw_transcript[:200]}...")
             logger.info(f"Transcript preview (last 200 chars): {raw_transcript[-200:]}...")
             
-            # For very long transcripts, we need to be more careful with LLM processing
-            # Let's use a simpler cleaning approach for long content
-            if transcript_length > 15000:
-                logger.info("Using simple cleaning for long transcript to preserve full content")
-                cleaned = self._simple_clean_transcript(raw_transcript[:max_transcript])
+            # Long transcripts are cleaned chunk by chunk so no content is dropped
+            if transcript_length > settings.TRANSCRIPT_SINGLE_PASS_CHARS:
+                cleaned = await self._clean_in_chunks(raw_transcript, segments, deadline)
             else:
                 logger.info("Using LLM cleaning for shorter transcript")
                 cleanup_chain = TRANSCRIPT_CLEANUP_PROMPT | self.llm | StrOutputParser()
-                cleaned = await cleanup_chain.ainvoke({
-                    "transcript": raw_transcript[:max_transcript]
-                })
+                cleaned = await within(cleanup_chain.ainvoke({
+                    "transcript": raw_transcript
+                }), deadline, what="transcript cleaning")
             
             return cleaned.strip()
             
+        except DeadlineExceededError as e:
+            logger.warning(f"Transcript cleaning stopped: {e}. Using simple cleaning.")
+            return self._simple_clean_transcript(raw_transcript)
         except Exception as e:
             logger.warning(f"Transcript cleaning failed: {e}. Using raw transcript.")
             return raw_transcript
     
+    async def _clean_in_chunks(
+        self,
+        raw_transcript: str,
+        segments: Optional[TranscriptSegments] = None,
+        deadline: Optional[float] = None
+    ) -> str:
+        """Map-reduce cleaning: clean chunks concurrently, then stitch them back in order"""
+        # Segment boundaries are natural cut points; fall back to sentences for plain text
+        units = segments.texts if segments else split_sentences(raw_transcript)
+        chunks = chunk_text(units, settings.TRANSCRIPT_CLEAN_CHUNK_CHARS, settings.TRANSCRIPT_CLEAN_CHUNK_OVERLAP)
+        logger.info(f"Using chunked LLM cleaning: {len(chunks)} chunks, concurrency {settings.TRANSCRIPT_CLEAN_CONCURRENCY}")
+        
+        cleanup_chain = TRANSCRIPT_CHUNK_CLEANUP_PROMPT | self.llm | StrOutputParser()
+        semaphore = asyncio.Semaphore(max(1, settings.TRANSCRIPT_CLEAN_CONCURRENCY))
+        
+        async def clean_chunk(index: int, context: str, body: str) -> str:
+            async with semaphore:
+                try:
+                    cleaned = await within(
+                        cleanup_chain.ainvoke({"context": context, "transcript": body}),
+                        deadline,
+                        what=f"chunk {index + 1} cleaning"
+                    )
+                    return cleaned.strip()
+                except Exception as e:
+                    # One failed chunk shouldn't discard the rest of the transcript
+                    logger.warning(f"Chunk {index + 1}/{len(chunks)} cleaning failed: {e}. Using simple cleaning.")
+                    return self._simple_clean_transcript(body)
+        
+        cleaned_chunks = await asyncio.gather(*(
+            clean_chunk(i, context, body) for i, (context, body) in enumerate(chunks)
+        ))
+        return "\n\n".join(chunk for chunk in cleaned_chunks if chunk)
+    
     def _simple_clean_transcript(self, transcript: str) -> str:
         """Simple cleaning for long transcripts to preserve full content"""
         if not transcript:
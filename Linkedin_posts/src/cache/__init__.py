@@ -0,0 +1,20 @@
+"""
+Cache package for YouTube Agent Workflow.
+Contains in-memory and SQLite-backed caches for expensive workflow stages and LLM calls.
+"""
+
+from .store import LRUCache, SQLiteBlobStore
+from .transcript_cache import TranscriptCache, transcript_cache
+from .llm_cache import LLMResponseCache, llm_response_cache
+from .result_cache import WorkflowResultCache, result_cache
+
+__all__ = [
+    "LRUCache",
+    "SQLiteBlobStore",
+    "TranscriptCache",
+    "transcript_cache",
+    "LLMResponseCache",
+    "llm_response_cache",
+    "WorkflowResultCache",
+    "result_cache"
+]
@@ -0,0 +1,106 @@
+import contextvars
+import hashlib
+import json
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Sequence
+from langchain_core.caches import BaseCache
+from langchain_core.messages import message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, Generation
+from prompts import PROMPTS_VERSION
+from src.cache.store import SQLiteBlobStore
+from src.config.settings import settings
+
+# Per-request settings and hit counters, set around a workflow run
+_request_usage: contextvars.ContextVar[Optional[Dict[str, Any]]] = contextvars.ContextVar("llm_cache_usage", default=None)
+
+class LLMResponseCache(BaseCache):
+    """SQLite cache of LLM completions keyed by model parameters, prompt template version and rendered prompt"""
+    
+    def __init__(self, path: str, ttl_seconds: int, max_bytes: int, enabled: bool = True):
+        self.enabled = enabled
+        self._disk = SQLiteBlobStore(path, "llm_responses", ttl_seconds, max_bytes)
+        self._stats = {"hits": 0, "misses": 0, "bypassed": 0}
+        self._stats_lock = threading.Lock()
+    
+    @classmethod
+    def from_settings(cls) -> "LLMResponseCache":
+        return cls(
+            path=settings.LLM_CACHE_PATH,
+            ttl_seconds=settings.LLM_CACHE_TTL,
+            max_bytes=settings.LLM_CACHE_MAX_BYTES,
+            enabled=settings.LLM_CACHE_ENABLED
+        )
+    
+    @staticmethod
+    def key(prompt: str, llm_string: str) -> str:
+        """llm_string carries the model name and every call parameter, including bound overrides"""
+        digest = hashlib.sha256(f"{PROMPTS_VERSION}\0{llm_string}\0{prompt}".encode("utf-8")).hexdigest()
+        return f"llm:{digest}"
+    
+    @contextmanager
+    def track(self, bypass: bool = False) -> Iterator[Dict[str, Any]]:
+        """Count hits for the calls made inside the block; bypass skips lookups but still stores fresh answers"""
+        usage = {"hits": 0, "misses": 0, "bypassed": bypass}
+        token = _request_usage.set(usage)
+        try:
+            yield usage
+        finally:
+            _request_usage.reset(token)
+    
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Generation]]:
+        if not self.enabled:
+            return None
+        
+        usage = _request_usage.get()
+        if usage is not None and usage["bypassed"]:
+            self._record("bypassed", usage, "misses")
+            return None
+        
+        raw = self._disk.get(self.key(prompt, llm_string))
+        generations = _decode(raw) if raw is not None else None
+        self._record("hits" if generations else "misses", usage)
+        return generations
+    
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Generation]) -> None:
+        if self.enabled:
+            self._disk.set(self.key(prompt, llm_string), _encode(return_val))
+    
+    def clear(self, **kwargs: Any) -> None:
+        self._disk.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        stats["enabled"] = self.enabled
+        stats["disk_bytes"] = self._disk.size_bytes() if self.enabled else 0
+        return stats
+    
+    def _record(self, outcome: str, usage: Optional[Dict[str, Any]], request_outcome: Optional[str] = None) -> None:
+        with self._stats_lock:
+            self._stats[outcome] += 1
+            if usage is not None:
+                usage[request_outcome or outcome] += 1
+
+def _encode(generations: Sequence[Generation]) -> bytes:
+    return json.dumps([
+        {'message': message_to_dict(generation.message), 'generation_info': generation.generation_info}
+        if isinstance(generation, ChatGeneration)
+        else {'text': generation.text, 'generation_info': generation.generation_info}
+        for generation in generations
+    ]).encode("utf-8")
+
+def _decode(raw: bytes) -> Sequence[Generation]:
+    generations = []
+    for item in json.loads(raw):
+        if 'message' in item:
+            message = messages_from_dict([item['message']])[0]
+            generations.append(ChatGeneration(message=message, generation_info=item['generation_info']))
+        else:
+            generations.append(Generation(text=item['text'], generation_info=item['generation_info']))
+    return generations
+
+# Shared LLM response cache instance
+llm_response_cache = LLMResponseCache.from_settings()
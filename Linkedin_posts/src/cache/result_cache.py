@@ -0,0 +1,149 @@
+import asyncio
+import copy
+import json
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+from src.cache.store import LRUCache, SQLiteBlobStore
+from src.config.settings import settings
+from utils.exceptions import IdempotencyConflictError
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# How each lookup outcome is counted in stats()
+_STATUS_COUNTERS = {"hit": "hits", "miss": "misses", "disabled": "misses", "coalesced": "coalesced", "bypassed": "bypassed"}
+
+class WorkflowResultCache:
+    """Finished workflow results per (video, format, language, workflow version), with single-flight generation"""
+    
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: int,
+        max_bytes: int,
+        max_memory_entries: int,
+        idempotency_ttl_seconds: int,
+        enabled: bool = True
+    ):
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds
+        self._memory = LRUCache(max_memory_entries)
+        self._disk = SQLiteBlobStore(path, "workflow_results", ttl_seconds, max_bytes)
+        self._idempotency = SQLiteBlobStore(path, "idempotency_keys", idempotency_ttl_seconds, max_bytes)
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._stats = {"hits": 0, "misses": 0, "coalesced": 0, "bypassed": 0, "replayed": 0}
+        self._stats_lock = threading.Lock()
+    
+    @classmethod
+    def from_settings(cls) -> "WorkflowResultCache":
+        return cls(
+            path=settings.RESULT_CACHE_PATH,
+            ttl_seconds=settings.RESULT_CACHE_TTL,
+            max_bytes=settings.RESULT_CACHE_MAX_BYTES,
+            max_memory_entries=settings.RESULT_CACHE_MEMORY_ENTRIES,
+            idempotency_ttl_seconds=settings.IDEMPOTENCY_KEY_TTL,
+            enabled=settings.RESULT_CACHE_ENABLED
+        )
+    
+    @staticmethod
+    def key(video_id: str, output_format: str, language: str, version: str) -> str:
+        return f"result:{video_id}:{output_format}:{language}:{version}"
+    
+    async def get_or_generate(
+        self,
+        key: str,
+        generate: Callable[[], Awaitable[Dict[str, Any]]],
+        bypass: bool = False,
+        idempotency_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Cached result for key, or generate it once no matter how many callers ask concurrently"""
+        if idempotency_key:
+            record = await asyncio.to_thread(self._load, self._idempotency, f"idempotency:{idempotency_key}")
+            if record is not None:
+                if record['key'] != key:
+                    raise IdempotencyConflictError("Idempotency-Key was already used for a different request")
+                self._record("replayed")
+                return self._tagged(record['result'], "replayed", record['stored_at'])
+        
+        if not self.enabled:
+            result, status, stored_at = await generate(), "disabled", time.time()
+        elif bypass:
+            # Fresh generation on request; the new answer replaces the cached one
+            result, status, stored_at = await self._single_flight(f"bypass:{key}", key, generate), "bypassed", time.time()
+        else:
+            entry = self._memory.get(key)
+            if entry is None and key not in self._in_flight:
+                # The memory tier is checked again after the disk read in case a generation finished meanwhile
+                entry = await asyncio.to_thread(self._load, self._disk, key) or self._memory.get(key)
+            if entry is not None and time.time() - entry['stored_at'] < self.ttl_seconds:
+                self._memory.set(key, entry)
+                result, status, stored_at = entry['result'], "hit", entry['stored_at']
+            else:
+                coalesced = key in self._in_flight
+                result = await self._single_flight(key, key, generate)
+                status, stored_at = ("coalesced" if coalesced else "miss"), time.time()
+        self._record(_STATUS_COUNTERS[status])
+        
+        if idempotency_key:
+            await asyncio.to_thread(
+                self._store, self._idempotency, f"idempotency:{idempotency_key}", {'key': key, 'result': result, 'stored_at': stored_at}
+            )
+        return self._tagged(result, status, stored_at)
+    
+    async def _single_flight(self, flight_key: str, key: str, generate: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Join the generation already running for flight_key, or start it as a task callers cannot cancel"""
+        task = self._in_flight.get(flight_key)
+        if task is not None:
+            logger.info(f"Joining in-flight generation for {key}")
+        else:
+            task = asyncio.create_task(self._generate_and_store(key, generate))
+            self._in_flight[flight_key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(flight_key, None))
+        return await asyncio.shield(task)
+    
+    async def _generate_and_store(self, key: str, generate: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        result = await generate()
+        if result['metadata'].get('deadline_exceeded'):
+            # Partial or trimmed down to meet a deadline: a later request may have time for the full result
+            return result
+        entry = {'result': result, 'stored_at': time.time()}
+        self._memory.set(key, entry)
+        await asyncio.to_thread(self._store, self._disk, key, entry)
+        return result
+    
+    def _tagged(self, result: Dict[str, Any], status: str, stored_at: float) -> Dict[str, Any]:
+        """A private copy, since routes add their own metadata to results"""
+        result = copy.deepcopy(result)
+        result['metadata']['result_cache'] = {'status': status, 'age_seconds': round(time.time() - stored_at, 1)}
+        return result
+    
+    # Blocking SQLite I/O, compression and JSON coding: callers run these in a thread
+    def _load(self, store: SQLiteBlobStore, key: str) -> Optional[Dict[str, Any]]:
+        raw = store.get(key)
+        return json.loads(raw) if raw is not None else None
+    
+    def _store(self, store: SQLiteBlobStore, key: str, value: Dict[str, Any]) -> None:
+        store.set(key, json.dumps(value, default=str).encode("utf-8"))
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"] + stats["coalesced"]
+        stats["hit_rate"] = round((stats["hits"] + stats["coalesced"]) / lookups, 3) if lookups else 0.0
+        stats["enabled"] = self.enabled
+        stats["in_flight"] = len(self._in_flight)
+        stats["memory_entries"] = len(self._memory)
+        return stats
+    
+    def clear(self) -> None:
+        self._memory.clear()
+        self._disk.clear()
+        self._idempotency.clear()
+    
+    def _record(self, outcome: str) -> None:
+        with self._stats_lock:
+            self._stats[outcome] += 1
+
+# Shared workflow result cache instance
+result_cache = WorkflowResultCache.from_settings()
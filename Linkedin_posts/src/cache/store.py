@@ -0,0 +1,176 @@
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Optional
+from utils.logger import setup_logger
+
+# zstd gives better ratios on transcript text; fall back to zlib when it is not installed
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = setup_logger(__name__)
+
+def compress(data: bytes) -> tuple[bytes, str]:
+    """Compress bytes, returning the payload and the codec used"""
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=6).compress(data), "zstd"
+    return zlib.compress(data, 6), "zlib"
+
+def decompress(payload: bytes, codec: str) -> Optional[bytes]:
+    """Decompress a payload, or None if its codec is unavailable"""
+    if codec == "zstd":
+        if zstandard is None:
+            return None
+        return zstandard.ZstdDecompressor().decompress(payload)
+    if codec == "zlib":
+        return zlib.decompress(payload)
+    return None
+
+class LRUCache:
+    """Thread-safe in-memory LRU cache with a maximum entry count"""
+    
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+    
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class SQLiteBlobStore:
+    """Compressed key/value blobs in SQLite with TTL and size-based eviction"""
+    
+    def __init__(self, path: str, table: str, ttl_seconds: int, max_bytes: int):
+        self.path = path
+        self.table = table
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Open the database lazily so importing a cache never touches the disk"""
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                f"""CREATE TABLE IF NOT EXISTS {self.table} (
+                    key TEXT PRIMARY KEY,
+                    value BLOB NOT NULL,
+                    codec TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )"""
+            )
+            self._conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{self.table}_accessed ON {self.table} (accessed_at)"
+            )
+            self._conn.commit()
+        return self._conn
+    
+    def get(self, key: str) -> Optional[bytes]:
+        """Get an unexpired value, refreshing its access time"""
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                f"SELECT value, codec, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            
+            payload, codec, expires_at = row
+            if expires_at <= now:
+                conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                conn.commit()
+                return None
+            
+            conn.execute(f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key))
+            conn.commit()
+        
+        return decompress(payload, codec)
+    
+    def set(self, key: str, value: bytes, ttl_seconds: Optional[int] = None) -> None:
+        """Store a value, evicting least recently used entries above the size cap"""
+        payload, codec = compress(value)
+        now = time.time()
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                f"""INSERT OR REPLACE INTO {self.table}
+                    (key, value, codec, size, created_at, expires_at, accessed_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (key, payload, codec, len(payload), now, now + ttl, now)
+            )
+            self._evict(conn, now)
+            conn.commit()
+    
+    def delete(self, key: str) -> None:
+        with self._lock:
+            conn = self._connection()
+            conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            conn.commit()
+    
+    def clear(self) -> None:
+        with self._lock:
+            conn = self._connection()
+            conn.execute(f"DELETE FROM {self.table}")
+            conn.commit()
+    
+    def size_bytes(self) -> int:
+        """Total compressed size of stored values"""
+        with self._lock:
+            row = self._connection().execute(f"SELECT COALESCE(SUM(size), 0) FROM {self.table}").fetchone()
+        return row[0]
+    
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        """Drop expired rows, then least recently used rows until under max_bytes"""
+        conn.execute(f"DELETE FROM {self.table} WHERE expires_at <= ?", (now,))
+        
+        total = conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {self.table}").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        
+        evicted = []
+        for key, size in conn.execute(f"SELECT key, size FROM {self.table} ORDER BY accessed_at ASC"):
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        
+        conn.executemany(f"DELETE FROM {self.table} WHERE key = ?", evicted)
+        logger.info(f"Evicted {len(evicted)} entries from {self.table} cache")
@@ -0,0 +1,110 @@
+import json
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from src.cache.store import LRUCache, SQLiteBlobStore
+from src.config.settings import settings
+
+class TranscriptCache:
+    """Two-level (memory LRU + SQLite) cache for raw transcript segments and cleaned text"""
+    
+    def __init__(self, path: str, ttl_seconds: int, max_bytes: int, max_memory_entries: int, enabled: bool = True):
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds
+        self._memory = LRUCache(max_memory_entries)
+        self._disk = SQLiteBlobStore(path, "transcripts", ttl_seconds, max_bytes)
+        self._stats = {
+            "segments": {"memory_hits": 0, "disk_hits": 0, "misses": 0},
+            "cleaned": {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+        }
+        self._stats_lock = threading.Lock()
+    
+    @classmethod
+    def from_settings(cls) -> "TranscriptCache":
+        return cls(
+            path=settings.TRANSCRIPT_CACHE_PATH,
+            ttl_seconds=settings.TRANSCRIPT_CACHE_TTL,
+            max_bytes=settings.TRANSCRIPT_CACHE_MAX_BYTES,
+            max_memory_entries=settings.TRANSCRIPT_CACHE_MEMORY_ENTRIES,
+            enabled=settings.TRANSCRIPT_CACHE_ENABLED
+        )
+    
+    @staticmethod
+    def segments_key(video_id: str, language: str) -> str:
+        return f"segments:{video_id}:{language}"
+    
+    @staticmethod
+    def cleaned_key(video_id: str, language: str, cleaner_version: str) -> str:
+        return f"cleaned:{video_id}:{language}:{cleaner_version}"
+    
+    def get_segments(self, video_id: str, language: str) -> Optional[Dict[str, List]]:
+        """Get raw transcript segments in TranscriptSegments.to_dict() form"""
+        return self._get("segments", self.segments_key(video_id, language))
+    
+    def set_segments(self, video_id: str, language: str, segments: Dict[str, List]) -> None:
+        self._set(self.segments_key(video_id, language), segments)
+    
+    def get_cleaned(self, video_id: str, language: str, cleaner_version: str) -> Optional[Dict[str, Any]]:
+        """Get cleaned transcript text and the raw length it was cleaned from"""
+        return self._get("cleaned", self.cleaned_key(video_id, language, cleaner_version))
+    
+    def set_cleaned(self, video_id: str, language: str, cleaner_version: str, cleaned: Dict[str, Any]) -> None:
+        self._set(self.cleaned_key(video_id, language, cleaner_version), cleaned)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters per entry kind plus current cache sizes"""
+        with self._stats_lock:
+            stats = {kind: dict(counts) for kind, counts in self._stats.items()}
+        
+        for counts in stats.values():
+            lookups = counts["memory_hits"] + counts["disk_hits"] + counts["misses"]
+            hits = counts["memory_hits"] + counts["disk_hits"]
+            counts["hit_rate"] = round(hits / lookups, 3) if lookups else 0.0
+        
+        stats["enabled"] = self.enabled
+        stats["memory_entries"] = len(self._memory)
+        stats["disk_bytes"] = self._disk.size_bytes() if self.enabled else 0
+        return stats
+    
+    def clear(self) -> None:
+        self._memory.clear()
+        self._disk.clear()
+    
+    def _get(self, kind: str, key: str) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        
+        # Both tiers hold {'value', 'stored_at'} so the memory tier honours the TTL too
+        entry = self._memory.get(key)
+        if entry is not None:
+            if self._fresh(entry):
+                self._record(kind, "memory_hits")
+                return entry['value']
+            self._memory.delete(key)
+        
+        raw = self._disk.get(key)
+        entry = json.loads(raw) if raw is not None else None
+        if isinstance(entry, dict) and 'stored_at' in entry and self._fresh(entry):
+            self._memory.set(key, entry)
+            self._record(kind, "disk_hits")
+            return entry['value']
+        
+        self._record(kind, "misses")
+        return None
+    
+    def _set(self, key: str, value: Any) -> None:
+        if not self.enabled:
+            return
+        entry = {'value': value, 'stored_at': time.time()}
+        self._memory.set(key, entry)
+        self._disk.set(key, json.dumps(entry).encode("utf-8"))
+    
+    def _fresh(self, entry: Dict[str, Any]) -> bool:
+        return time.time() - entry['stored_at'] < self.ttl_seconds
+    
+    def _record(self, kind: str, outcome: str) -> None:
+        with self._stats_lock:
+            self._stats[kind][outcome] += 1
+
+# Shared transcript cache instance
+transcript_cache = TranscriptCache.from_settings()
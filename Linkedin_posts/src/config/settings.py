@@ -10,6 +10,21 @@ class Settings(BaseSettings):
     OPENAI_MODEL: str = "gpt-4"  # Use GPT-4 for better handling of long content
     DEFAULT_TEMPERATURE: float = 0.7
     DEFAULT_MAX_TOKENS: int = 8000  # Increased for longer content generation
+    OPENAI_BASE_URL: Optional[str] = None  # OpenAI-compatible gateway or proxy
+    
+    # LLM Connection Pool - shared by every agent in the process
+    LLM_MAX_CONNECTIONS: int = 20
+    LLM_MAX_KEEPALIVE_CONNECTIONS: int = 20  # Below LLM_MAX_CONNECTIONS, bursts close and reopen sockets
+    LLM_KEEPALIVE_EXPIRY: float = 30.0  # Seconds an idle connection is kept open
+    LLM_REQUEST_TIMEOUT: float = 120.0
+    
+    # LLM Scheduler - keeps async calls within the OpenAI account's quotas, interactive work before bulk
+    LLM_SCHEDULER_ENABLED: bool = True
+    LLM_REQUESTS_PER_MINUTE: int = 0  # Set to the account's quotas; 0 leaves a quota unenforced
+    LLM_TOKENS_PER_MINUTE: int = 0  # Estimated as prompt characters / 4 plus max_tokens, as OpenAI counts it
+    LLM_THROTTLE_RETRIES: int = 4  # Retries of calls answered with 429, after jittered backoff
+    LLM_BACKOFF_BASE: float = 1.0
+    LLM_BACKOFF_MAX: float = 30.0
     
     # Application Configuration
     APP_NAME: str = "YouTube Multi-Agent Content Workflow"
@@ -26,6 +41,13 @@ class Settings(BaseSettings):
     MAX_CONTENT_LENGTH: int = 25000  # Allow longer content generation
     MAX_TITLE_LENGTH: int = 200
     
+    # Hierarchical Content Generation - long transcripts are summarized per chapter first
+    CONTENT_HIERARCHICAL_THRESHOLD: int = 20000  # Transcript characters
+    CONTENT_CHAPTER_CHARS: int = 6000
+    CONTENT_SUMMARY_MODEL: str = "gpt-4o-mini"
+    CONTENT_SUMMARY_MAX_TOKENS: int = 600
+    CONTENT_SUMMARY_CONCURRENCY: int = 8
+    
     # Platform-specific Settings
     LINKEDIN_CHAR_LIMIT: int = 3000
     TWITTER_CHAR_LIMIT: int = 280
@@ -34,10 +56,20 @@ class Settings(BaseSettings):
     # SEO Settings
     MIN_SEO_SCORE: int = 70
     TARGET_READABILITY_SCORE: int = 60
+    # Batch scoring: process pool size (0 or 1 scores in-process) and the smallest batch worth a pool
+    SCORING_WORKERS: int = 0
+    SCORING_PROCESS_MIN_DOCUMENTS: int = 200
     
-    # Rate Limiting
-    RATE_LIMIT_PER_MINUTE: int = 60
+    # Rate Limiting - token buckets per configured API key (X-API-Key or bearer token), else per client address
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_PER_MINUTE: int = 60  # 0 disables a window
     RATE_LIMIT_PER_HOUR: int = 1000
+    RATE_LIMIT_BACKEND: str = "memory"  # "sqlite" shares buckets between worker processes on one host
+    RATE_LIMIT_SQLITE_PATH: str = ".cache/ratelimit.db"
+    RATE_LIMIT_MAX_CLIENTS: int = 100_000  # Memory backend; least recently seen clients are dropped first
+    RATE_LIMIT_TRUST_FORWARDED: bool = False  # Key on X-Forwarded-For when behind a reverse proxy
+    RATE_LIMIT_API_KEYS: list = []  # Keys that get their own buckets; any other key is limited by address
+    RATE_LIMIT_EXEMPT_PATHS: list = ["/", "/health", "/health/ready", "/metrics", "/docs", "/redoc", "/openapi.json"]
     
     # CORS Settings
     ALLOWED_ORIGINS: list = ["*"]
@@ -49,7 +81,19 @@ class Settings(BaseSettings):
     LOG_FORMAT: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     
     # Workflow Configuration
-    WORKFLOW_TIMEOUT: int = 300  # 5 minutes
+    WORKFLOW_TIMEOUT: int = 300  # 5 minutes; per-request deadline every agent call is bounded by (0 disables)
+    WORKFLOW_DEADLINE_GRACE: float = 1.0  # Seconds past the deadline for agents to hand back partial results
+    TREND_SEARCH_TIMEOUT: float = 10.0  # Trend data is optional; slower searches are skipped
+    DEFAULT_WORKFLOW: str = "youtube"  # "youtube_parallel" drafts title and content concurrently
+    
+    # Bulk Job Settings - batches above BULK_SYNC_MAX_URLS run as background jobs
+    MAX_BULK_URLS: int = 500
+    BULK_SYNC_MAX_URLS: int = 10
+    JOB_STORE_PATH: str = ".cache/jobs.db"
+    JOB_WORKERS: int = 4  # Videos processed concurrently across all jobs
+    JOB_LEASE_SECONDS: float = 60.0  # A worker that stops renewing its leases for this long is presumed dead
+    JOB_EVENTS_HEARTBEAT: int = 15  # Seconds between keep-alives on idle event streams
+    MAX_STREAM_URLS: int = 10000  # JSON body limit for /workflow/process-stream; uploads are unbounded
     MAX_CONCURRENT_REQUESTS: int = 10
     
     # Content Generation Settings
@@ -59,6 +103,47 @@ class Settings(BaseSettings):
     # YouTube API Settings
     YOUTUBE_API_KEY: Optional[str] = None
     YOUTUBE_TRANSCRIPT_TIMEOUT: int = 30
+    TRANSCRIPT_FETCH_WORKERS: int = 4  # Threads reserved for blocking transcript downloads
+    TRANSCRIPT_HEDGE_DELAY: float = 2.0  # Seconds before racing the next caption track (manual, then generated)
+    
+    # Transcript Cleaning Settings
+    TRANSCRIPT_SINGLE_PASS_CHARS: int = 15000  # Longer transcripts are cleaned in chunks
+    TRANSCRIPT_CLEAN_CHUNK_CHARS: int = 6000
+    TRANSCRIPT_CLEAN_CHUNK_OVERLAP: int = 400  # Trailing context passed to the next chunk
+    TRANSCRIPT_CLEAN_CONCURRENCY: int = 4
+    
+    # Transcript Cache Settings
+    TRANSCRIPT_CACHE_ENABLED: bool = True
+    TRANSCRIPT_CACHE_PATH: str = ".cache/transcripts.db"
+    TRANSCRIPT_CACHE_TTL: int = 7 * 24 * 3600  # 1 week
+    TRANSCRIPT_CACHE_MAX_BYTES: int = 256 * 1024 * 1024  # Compressed size on disk
+    TRANSCRIPT_CACHE_MEMORY_ENTRIES: int = 128
+    
+    # LLM Response Cache Settings - identical prompts to the same model reuse the stored answer
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_PATH: str = ".cache/llm.db"
+    LLM_CACHE_TTL: int = 7 * 24 * 3600  # 1 week
+    LLM_CACHE_MAX_BYTES: int = 128 * 1024 * 1024  # Compressed size on disk
+    
+    # Workflow Result Cache Settings - finished posts per video, format, language and workflow version
+    RESULT_CACHE_ENABLED: bool = True
+    RESULT_CACHE_PATH: str = ".cache/results.db"
+    RESULT_CACHE_TTL: int = 3600  # 1 hour
+    RESULT_CACHE_MAX_BYTES: int = 128 * 1024 * 1024  # Compressed size on disk
+    RESULT_CACHE_MEMORY_ENTRIES: int = 64
+    IDEMPOTENCY_KEY_TTL: int = 24 * 3600  # How long an Idempotency-Key replays its first response
+    
+    # Circuit Breakers - an upstream failing too often is skipped until a probe call gets through again
+    CIRCUIT_BREAKER_ENABLED: bool = True
+    CIRCUIT_FAILURE_RATE: float = 0.5  # Share of failed calls in the window that opens a breaker
+    CIRCUIT_MIN_CALLS: int = 5  # Calls in the window before the failure rate is judged
+    CIRCUIT_WINDOW_SECONDS: float = 60.0
+    CIRCUIT_OPEN_SECONDS: float = 30.0  # Calls fail fast this long before a half-open probe is let through
+    CIRCUIT_HALF_OPEN_PROBES: int = 1
+    
+    # Health Check Settings
+    READINESS_CACHE_TTL: int = 30  # seconds between upstream probes
+    READINESS_PROBE_TIMEOUT: float = 2.0
     
     # Error Handling
     SHOW_DETAILED_ERRORS: bool = False
@@ -68,7 +153,7 @@ class Settings(BaseSettings):
     langchain_tracing_v2: Optional[str] = None
     secret_key: Optional[str] = None
     cors_origins: Optional[str] = None
-    
+
     class Config:
         env_file = ".env"
         case_sensitive = False
@@ -0,0 +1,12 @@
+"""
+Jobs package for YouTube Agent Workflow.
+Contains the persistent background job queue used for bulk requests.
+"""
+
+from .store import JobStore
+from .manager import JobManager
+
+__all__ = [
+    "JobStore",
+    "JobManager"
+]
@@ -0,0 +1,212 @@
+import asyncio
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+from src.config.settings import settings
+from src.jobs.store import JOB_ACTIVE_STATUSES, JobStore
+from src.llm.scheduler import llm_priority
+from src.workflows.registry import WorkflowRegistry
+from utils.helpers import add_linkedin_metadata
+from utils.logger import setup_logger
+from utils.validators import extract_youtube_video_id
+
+logger = setup_logger(__name__)
+
+class JobManager:
+    """Runs bulk jobs in the background, persisting progress so they survive restarts"""
+    
+    def __init__(
+        self,
+        store: JobStore,
+        registry: WorkflowRegistry,
+        max_workers: Optional[int] = None,
+        lease_seconds: Optional[float] = None
+    ):
+        self.store = store
+        self.registry = registry
+        self.max_workers = max_workers or settings.JOB_WORKERS
+        self.lease_seconds = lease_seconds or settings.JOB_LEASE_SECONDS
+        # Several processes can share one store; leases record which of them owns what
+        self.owner = uuid.uuid4().hex
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._event_signal: Optional[asyncio.Event] = None
+        self._heartbeat: Optional[asyncio.Task] = None
+    
+    async def start(self) -> List[str]:
+        """Resume unfinished jobs no live worker owns; returns their ids"""
+        self._semaphore = asyncio.Semaphore(max(1, self.max_workers))
+        self._event_signal = asyncio.Event()
+        
+        resumed = await self._adopt_orphaned_jobs()
+        self._heartbeat = asyncio.create_task(self._renew_leases())
+        return resumed
+    
+    async def stop(self) -> None:
+        """Cancel running jobs and release their leases so any worker can resume them"""
+        tasks = list(self._tasks.values())
+        if self._heartbeat:
+            tasks.append(self._heartbeat)
+            self._heartbeat = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+        await asyncio.to_thread(self.store.release_leases, self.owner)
+    
+    async def submit(self, urls: List[str], output_format: str = "linkedin", language: str = "en", linkedin: bool = False) -> str:
+        """Persist a new job and start processing it in the background"""
+        job_id = await asyncio.to_thread(self.store.create_job, urls, {
+            'output_format': output_format,
+            'language': language,
+            'linkedin': linkedin
+        }, self.owner, self._lease_expires())
+        await self._emit(job_id, "job_queued", {'total': len(urls)})
+        self._schedule(job_id)
+        logger.info(f"Queued job {job_id} with {len(urls)} URLs")
+        return job_id
+    
+    async def cancel(self, job_id: str) -> bool:
+        """Stop a job and mark its unfinished items cancelled"""
+        job = await asyncio.to_thread(self.store.get_job, job_id)
+        if job is None or job['status'] not in JOB_ACTIVE_STATUSES:
+            return False
+        task = self._tasks.pop(job_id, None)
+        if task:
+            task.cancel()
+        cancelled = await asyncio.to_thread(self.store.cancel_pending, job_id)
+        await self._emit(job_id, "job_cancelled", {'cancelled_items': cancelled})
+        return True
+    
+    async def wait(self, job_id: str) -> None:
+        """Wait for a job's background task to finish (used by tests and shutdown)"""
+        task = self._tasks.get(job_id)
+        if task:
+            await asyncio.gather(task, return_exceptions=True)
+    
+    async def wait_for_events(self, job_id: str, after_seq: int, timeout: float) -> List[Dict[str, Any]]:
+        """Events newer than after_seq, waiting up to timeout for one to arrive"""
+        signal = self._event_signal
+        events = await asyncio.to_thread(self.store.get_events, job_id, after_seq)
+        if events or signal is None:
+            return events
+        try:
+            await asyncio.wait_for(signal.wait(), timeout)
+        except asyncio.TimeoutError:
+            return []
+        return await asyncio.to_thread(self.store.get_events, job_id, after_seq)
+    
+    def _lease_expires(self) -> float:
+        return time.time() + self.lease_seconds
+    
+    async def _adopt_orphaned_jobs(self) -> List[str]:
+        """Requeue items whose worker's lease expired and take over jobs no live worker owns"""
+        requeued = await asyncio.to_thread(self.store.requeue_interrupted)
+        resumed = []
+        for job_id in await asyncio.to_thread(self.store.orphaned_jobs):
+            if not await asyncio.to_thread(self.store.claim_job, job_id, self.owner, self._lease_expires()):
+                continue  # Another worker claimed it first
+            await self._emit(job_id, "job_resumed", {'requeued_items': requeued})
+            self._schedule(job_id)
+            resumed.append(job_id)
+        if resumed:
+            logger.info(f"Resumed {len(resumed)} unfinished jobs ({requeued} interrupted items requeued)")
+        return resumed
+    
+    async def _renew_leases(self) -> None:
+        """Heartbeat: keep this worker's leases alive and pick up jobs from workers that died"""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                await asyncio.to_thread(self.store.renew_leases, self.owner, self._lease_expires())
+                await self._adopt_orphaned_jobs()
+            except Exception as e:
+                logger.error(f"Failed to renew job leases: {str(e)}")
+    
+    def _schedule(self, job_id: str) -> None:
+        task = asyncio.create_task(self._run_job(job_id))
+        self._tasks[job_id] = task
+        
+        def forget(_):
+            if self._tasks.get(job_id) is task:
+                del self._tasks[job_id]
+        task.add_done_callback(forget)
+    
+    async def _emit(self, job_id: str, event_type: str, data: Dict[str, Any]) -> None:
+        """Persist an event and wake up anyone streaming events"""
+        await asyncio.to_thread(self.store.add_event, job_id, event_type, data)
+        if self._event_signal is not None:
+            signal, self._event_signal = self._event_signal, asyncio.Event()
+            signal.set()
+    
+    async def _run_job(self, job_id: str) -> None:
+        try:
+            job = await asyncio.to_thread(self.store.get_job, job_id)
+            params = job['params']
+            pending = await asyncio.to_thread(self.store.pending_items, job_id)
+            await asyncio.to_thread(self.store.set_job_status, job_id, "running")
+            
+            # Items for the same video share one workflow run
+            groups: Dict[str, List[Dict[str, Any]]] = {}
+            for item in pending:
+                groups.setdefault(extract_youtube_video_id(item['url']) or item['url'], []).append(item)
+            
+            await asyncio.gather(*(self._run_items(job_id, items, params) for items in groups.values()))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Nothing is left working on the job, so don't leave it looking active
+            logger.error(f"Job {job_id} stopped unexpectedly: {str(e)}")
+            await asyncio.to_thread(self.store.set_job_status, job_id, "failed")
+            await self._emit(job_id, "job_error", {'error': str(e)})
+            return
+        
+        final = await asyncio.to_thread(self.store.get_job, job_id)
+        if final['status'] == "running":
+            await asyncio.to_thread(self.store.set_job_status, job_id, "completed")
+            await self._emit(job_id, "job_completed", {
+                'done': final['counts'].get('done', 0),
+                'failed': final['counts'].get('failed', 0)
+            })
+            logger.info(f"Job {job_id} completed: {final['counts']}")
+    
+    async def _run_items(self, job_id: str, items: List[Dict[str, Any]], params: Dict[str, Any]) -> None:
+        """Process one video and record the outcome for every item that asked for it"""
+        async with self._semaphore:
+            for item in items:
+                await asyncio.to_thread(
+                    self.store.mark_item_running, job_id, item['index'], self.owner, self._lease_expires()
+                )
+            await self._emit(job_id, "item_started", {'index': items[0]['index'], 'url': items[0]['url']})
+            
+            started = time.perf_counter()
+            result, error = None, None
+            try:
+                workflow = self.registry.get()
+                # Background jobs never hold up interactive requests waiting for LLM quota
+                with llm_priority("bulk"):
+                    result = await workflow.process_youtube_video(
+                        items[0]['url'],
+                        params['output_format'],
+                        params['language']
+                    )
+                if params.get('linkedin'):
+                    add_linkedin_metadata(result)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                error = f"Failed to process {items[0]['url']}: {str(e)}"
+                logger.error(error)
+            duration = time.perf_counter() - started
+            
+            for item in items:
+                await asyncio.to_thread(
+                    self.store.finish_item, job_id, item['index'], result=result, error=error, duration_seconds=duration
+                )
+                await self._emit(job_id, "item_failed" if error else "item_completed", {
+                    'index': item['index'],
+                    'url': item['url'],
+                    'error': error,
+                    'duration_seconds': round(duration, 3),
+                    'title': result['title'] if result else None
+                })
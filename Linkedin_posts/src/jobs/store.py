@@ -0,0 +1,312 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+from src.cache.store import compress, decompress
+from src.config.settings import settings
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Job lifecycle: queued -> running -> completed | cancelled | failed
+JOB_ACTIVE_STATUSES = ("queued", "running")
+# Item lifecycle: pending -> running -> done | failed | cancelled
+# Workers hold leases on the jobs and running items they own and renew them
+# while alive; anything whose lease has expired can be taken over by another worker
+
+class JobStore:
+    """SQLite persistence for bulk jobs, their items, results and progress events; blocking, so async callers use a thread"""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_settings(cls) -> "JobStore":
+        return cls(settings.JOB_STORE_PATH)
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Open the database lazily and create the schema on first use"""
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(
+                """CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    total INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    owner TEXT,
+                    lease_expires REAL
+                );
+                CREATE TABLE IF NOT EXISTS job_items (
+                    job_id TEXT NOT NULL,
+                    idx INTEGER NOT NULL,
+                    url TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    result BLOB,
+                    codec TEXT,
+                    error TEXT,
+                    duration_seconds REAL,
+                    updated_at REAL NOT NULL,
+                    owner TEXT,
+                    lease_expires REAL,
+                    PRIMARY KEY (job_id, idx)
+                );
+                CREATE TABLE IF NOT EXISTS job_events (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_id TEXT NOT NULL,
+                    type TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_job_events_job ON job_events (job_id, seq);"""
+            )
+            # Databases created before leases existed lack the owner columns
+            for table in ("jobs", "job_items"):
+                columns = {row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+                for column, kind in (("owner", "TEXT"), ("lease_expires", "REAL")):
+                    if column not in columns:
+                        self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {kind}")
+            self._conn.commit()
+        return self._conn
+    
+    def create_job(
+        self,
+        urls: List[str],
+        params: Dict[str, Any],
+        owner: Optional[str] = None,
+        lease_expires: Optional[float] = None
+    ) -> str:
+        """Create a queued job with one pending item per URL, optionally already leased to a worker"""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                """INSERT INTO jobs (id, status, params, total, created_at, updated_at, owner, lease_expires)
+                   VALUES (?, 'queued', ?, ?, ?, ?, ?, ?)""",
+                (job_id, json.dumps(params), len(urls), now, now, owner, lease_expires)
+            )
+            conn.executemany(
+                "INSERT INTO job_items (job_id, idx, url, status, updated_at) VALUES (?, ?, ?, 'pending', ?)",
+                [(job_id, index, url, now) for index, url in enumerate(urls)]
+            )
+            conn.commit()
+        return job_id
+    
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Job row with per-status item counts, or None"""
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT id, status, params, total, created_at, updated_at FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            counts = dict(conn.execute(
+                "SELECT status, COUNT(*) FROM job_items WHERE job_id = ? GROUP BY status", (job_id,)
+            ).fetchall())
+        return {
+            'job_id': row[0],
+            'status': row[1],
+            'params': json.loads(row[2]),
+            'total': row[3],
+            'created_at': row[4],
+            'updated_at': row[5],
+            'counts': counts
+        }
+    
+    def get_items(self, job_id: str, include_results: bool = True) -> List[Dict[str, Any]]:
+        """Items in input order, with decoded results for finished items"""
+        with self._lock:
+            rows = self._connection().execute(
+                """SELECT idx, url, status, result, codec, error, duration_seconds
+                   FROM job_items WHERE job_id = ? ORDER BY idx""",
+                (job_id,)
+            ).fetchall()
+        items = []
+        for index, url, status, payload, codec, error, duration in rows:
+            result = None
+            if include_results and payload is not None:
+                raw = decompress(payload, codec)
+                result = json.loads(raw) if raw is not None else None
+            items.append({
+                'index': index,
+                'url': url,
+                'status': status,
+                'error': error,
+                'duration_seconds': duration,
+                'result': result
+            })
+        return items
+    
+    def pending_items(self, job_id: str) -> List[Dict[str, Any]]:
+        """Items that still need processing"""
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT idx, url FROM job_items WHERE job_id = ? AND status = 'pending' ORDER BY idx", (job_id,)
+            ).fetchall()
+        return [{'index': index, 'url': url} for index, url in rows]
+    
+    def set_job_status(self, job_id: str, status: str) -> None:
+        with self._lock:
+            conn = self._connection()
+            conn.execute("UPDATE jobs SET status = ?, updated_at = ? WHERE id = ?", (status, time.time(), job_id))
+            conn.commit()
+    
+    def mark_item_running(self, job_id: str, index: int, owner: Optional[str] = None, lease_expires: Optional[float] = None) -> None:
+        self._update_item(job_id, index, status='running', owner=owner, lease_expires=lease_expires)
+    
+    def finish_item(
+        self,
+        job_id: str,
+        index: int,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+        duration_seconds: float = 0.0
+    ) -> None:
+        """Store an item's outcome; results are compressed since they include full transcripts"""
+        payload, codec = compress(json.dumps(result, default=str).encode("utf-8")) if result is not None else (None, None)
+        self._update_item(
+            job_id, index,
+            status='done' if error is None else 'failed',
+            result=payload,
+            codec=codec,
+            error=error,
+            duration_seconds=round(duration_seconds, 3)
+        )
+    
+    def cancel_pending(self, job_id: str) -> int:
+        """Mark unfinished items cancelled, returning how many were affected"""
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            cursor = conn.execute(
+                "UPDATE job_items SET status = 'cancelled', updated_at = ? WHERE job_id = ? AND status IN ('pending', 'running')",
+                (now, job_id)
+            )
+            conn.execute("UPDATE jobs SET status = 'cancelled', updated_at = ? WHERE id = ?", (now, job_id))
+            conn.commit()
+        return cursor.rowcount
+    
+    def active_jobs(self) -> List[str]:
+        """Ids of jobs that were queued or running, oldest first"""
+        placeholders = ", ".join("?" for _ in JOB_ACTIVE_STATUSES)
+        with self._lock:
+            rows = self._connection().execute(
+                f"SELECT id FROM jobs WHERE status IN ({placeholders}) ORDER BY created_at", JOB_ACTIVE_STATUSES
+            ).fetchall()
+        return [row[0] for row in rows]
+    
+    def orphaned_jobs(self) -> List[str]:
+        """Ids of active jobs no worker holds a live lease on, oldest first"""
+        placeholders = ", ".join("?" for _ in JOB_ACTIVE_STATUSES)
+        with self._lock:
+            rows = self._connection().execute(
+                f"""SELECT id FROM jobs WHERE status IN ({placeholders})
+                   AND (owner IS NULL OR lease_expires IS NULL OR lease_expires <= ?) ORDER BY created_at""",
+                (*JOB_ACTIVE_STATUSES, time.time())
+            ).fetchall()
+        return [row[0] for row in rows]
+    
+    def claim_job(self, job_id: str, owner: str, lease_expires: float) -> bool:
+        """Lease an orphaned job to owner; False if another worker got it first or it has finished"""
+        now = time.time()
+        placeholders = ", ".join("?" for _ in JOB_ACTIVE_STATUSES)
+        with self._lock:
+            conn = self._connection()
+            # One UPDATE so two workers racing for the same job can't both win
+            cursor = conn.execute(
+                f"""UPDATE jobs SET owner = ?, lease_expires = ?, updated_at = ?
+                   WHERE id = ? AND status IN ({placeholders})
+                   AND (owner IS NULL OR lease_expires IS NULL OR lease_expires <= ?)""",
+                (owner, lease_expires, now, job_id, *JOB_ACTIVE_STATUSES, now)
+            )
+            conn.commit()
+        return cursor.rowcount == 1
+    
+    def renew_leases(self, owner: str, lease_expires: float) -> None:
+        """Heartbeat: extend the leases on everything owner is still working on"""
+        placeholders = ", ".join("?" for _ in JOB_ACTIVE_STATUSES)
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                f"UPDATE jobs SET lease_expires = ? WHERE owner = ? AND status IN ({placeholders})",
+                (lease_expires, owner, *JOB_ACTIVE_STATUSES)
+            )
+            conn.execute(
+                "UPDATE job_items SET lease_expires = ? WHERE owner = ? AND status = 'running'", (lease_expires, owner)
+            )
+            conn.commit()
+    
+    def release_leases(self, owner: str) -> int:
+        """Hand back owner's jobs and running items on a clean shutdown, returning how many items were requeued"""
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            cursor = conn.execute(
+                """UPDATE job_items SET status = 'pending', owner = NULL, lease_expires = NULL, updated_at = ?
+                   WHERE owner = ? AND status = 'running'""",
+                (now, owner)
+            )
+            conn.execute("UPDATE jobs SET owner = NULL, lease_expires = NULL WHERE owner = ?", (owner,))
+            conn.commit()
+        return cursor.rowcount
+    
+    def requeue_interrupted(self) -> int:
+        """Return items whose worker stopped renewing its lease to pending"""
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            cursor = conn.execute(
+                """UPDATE job_items SET status = 'pending', owner = NULL, lease_expires = NULL, updated_at = ?
+                   WHERE status = 'running' AND (lease_expires IS NULL OR lease_expires <= ?)""",
+                (now, now)
+            )
+            conn.commit()
+        return cursor.rowcount
+    
+    def add_event(self, job_id: str, event_type: str, data: Dict[str, Any]) -> int:
+        """Append a progress event, returning its sequence number"""
+        with self._lock:
+            conn = self._connection()
+            cursor = conn.execute(
+                "INSERT INTO job_events (job_id, type, data, created_at) VALUES (?, ?, ?, ?)",
+                (job_id, event_type, json.dumps(data), time.time())
+            )
+            conn.commit()
+        return cursor.lastrowid
+    
+    def get_events(self, job_id: str, after_seq: int = 0) -> List[Dict[str, Any]]:
+        """Events for a job with sequence numbers greater than after_seq"""
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT seq, type, data, created_at FROM job_events WHERE job_id = ? AND seq > ? ORDER BY seq",
+                (job_id, after_seq)
+            ).fetchall()
+        return [
+            {'seq': seq, 'type': event_type, 'data': json.loads(data), 'created_at': created_at}
+            for seq, event_type, data, created_at in rows
+        ]
+    
+    def _update_item(self, job_id: str, index: int, **fields: Any) -> None:
+        fields['updated_at'] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                f"UPDATE job_items SET {assignments} WHERE job_id = ? AND idx = ?",
+                (*fields.values(), job_id, index)
+            )
+            conn.execute("UPDATE jobs SET updated_at = ? WHERE id = ?", (fields['updated_at'], job_id))
+            conn.commit()
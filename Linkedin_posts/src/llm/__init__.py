@@ -0,0 +1,15 @@
+"""
+LLM package for YouTube Agent Workflow.
+Contains the process-wide chat model factory shared by all agents and the scheduler in front of it.
+"""
+
+from .clients import LLMClientFactory, llm_clients
+from .scheduler import LLMScheduler, ScheduledTransport, llm_priority
+
+__all__ = [
+    "LLMClientFactory",
+    "llm_clients",
+    "LLMScheduler",
+    "ScheduledTransport",
+    "llm_priority"
+]
@@ -0,0 +1,132 @@
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+import httpx
+from langchain_core.runnables import Runnable
+from langchain_openai import ChatOpenAI
+from src.cache.llm_cache import llm_response_cache
+from src.config.settings import settings
+from src.llm.scheduler import LLMScheduler, ScheduledTransport
+from src.resilience.breaker import CircuitBreaker, circuit_breakers
+from src.resilience.transport import CircuitBreakerTransport
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+class LLMClientFactory:
+    """Builds chat models once per model name, all sharing one tuned HTTP connection pool"""
+    
+    def __init__(
+        self,
+        api_key: str,
+        base_url: Optional[str] = None,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 120.0,
+        scheduler: Optional[LLMScheduler] = None,
+        breaker: Optional[CircuitBreaker] = None
+    ):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.timeout = timeout
+        # Async calls (every agent's) go through the scheduler when one is configured
+        self.scheduler = scheduler
+        # ...and past a circuit breaker that answers them itself while OpenAI is failing
+        self.breaker = breaker
+        self._http: Optional[Tuple[httpx.Client, httpx.AsyncClient]] = None
+        self._models: Dict[str, ChatOpenAI] = {}
+        self._lock = threading.Lock()
+        self._build_seconds = 0.0
+    
+    @classmethod
+    def from_settings(cls) -> "LLMClientFactory":
+        return cls(
+            api_key=settings.OPENAI_API_KEY,
+            base_url=settings.OPENAI_BASE_URL,
+            max_connections=settings.LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.LLM_KEEPALIVE_EXPIRY,
+            timeout=settings.LLM_REQUEST_TIMEOUT,
+            scheduler=LLMScheduler.from_settings() if settings.LLM_SCHEDULER_ENABLED else None,
+            breaker=circuit_breakers.get("openai") if settings.CIRCUIT_BREAKER_ENABLED else None
+        )
+    
+    def get(self, model: Optional[str] = None, **overrides: Any) -> Runnable:
+        """Shared chat model for a model name; overrides such as temperature or max_tokens are bound per call"""
+        chat_model = self.chat_model(model or settings.OPENAI_MODEL)
+        return chat_model.bind(**overrides) if overrides else chat_model
+    
+    def chat_model(self, model: str) -> ChatOpenAI:
+        """The single ChatOpenAI instance for a model, built on first use"""
+        with self._lock:
+            chat_model = self._models.get(model)
+            if chat_model is None:
+                started = time.perf_counter()
+                http_client, http_async_client = self._http_clients()
+                chat_model = ChatOpenAI(
+                    model=model,
+                    temperature=settings.DEFAULT_TEMPERATURE,
+                    max_tokens=settings.DEFAULT_MAX_TOKENS,
+                    api_key=self.api_key,
+                    base_url=self.base_url,
+                    http_client=http_client,
+                    http_async_client=http_async_client,
+                    cache=llm_response_cache
+                )
+                self._models[model] = chat_model
+                self._build_seconds += time.perf_counter() - started
+                logger.info(f"Created shared LLM client for {model}")
+            return chat_model
+    
+    def _http_clients(self) -> Tuple[httpx.Client, httpx.AsyncClient]:
+        if self._http is None:
+            transport = None
+            if self.scheduler is not None or self.breaker is not None:
+                transport = httpx.AsyncHTTPTransport(limits=self.limits)
+                if self.scheduler is not None:
+                    transport = ScheduledTransport(transport, self.scheduler)
+                # Outermost, so calls into an open circuit fail without queuing for quota first
+                if self.breaker is not None:
+                    transport = CircuitBreakerTransport(transport, self.breaker)
+            self._http = (
+                httpx.Client(limits=self.limits, timeout=self.timeout),
+                httpx.AsyncClient(limits=self.limits, timeout=self.timeout, transport=transport)
+            )
+        return self._http
+    
+    def stats(self) -> Dict[str, Any]:
+        """Models built so far and open connections in the shared pool"""
+        connections = {'sync': 0, 'async': 0}
+        if self._http is not None:
+            for name, client in zip(('sync', 'async'), self._http):
+                # httpx keeps its connection pool on the transport, inside the breaker's and scheduler's wrappers if any
+                transport = getattr(client, "_transport", None)
+                while hasattr(transport, "transport"):
+                    transport = transport.transport
+                pool = getattr(transport, "_pool", None)
+                connections[name] = len(getattr(pool, "connections", []))
+        return {
+            'models': sorted(self._models),
+            'max_connections': self.limits.max_connections,
+            'max_keepalive_connections': self.limits.max_keepalive_connections,
+            'open_connections': connections,
+            'build_seconds': round(self._build_seconds, 4),
+            'scheduler': self.scheduler.stats() if self.scheduler is not None else None
+        }
+    
+    async def aclose(self) -> None:
+        """Close the shared pool; models are rebuilt on the next call"""
+        with self._lock:
+            http, self._http = self._http, None
+            self._models.clear()
+        if http is not None:
+            http[0].close()
+            await http[1].aclose()
+
+llm_clients = LLMClientFactory.from_settings()
@@ -0,0 +1,230 @@
+import asyncio
+import contextvars
+import heapq
+import itertools
+import json
+import random
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+import httpx
+from src.config.settings import settings
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Queue order: lower values are admitted first
+PRIORITIES = {"interactive": 0, "bulk": 1}
+
+# Priority of the LLM calls made by the current task; single-video requests keep the default
+_priority: contextvars.ContextVar[str] = contextvars.ContextVar("llm_priority", default="interactive")
+
+@contextmanager
+def llm_priority(level: str) -> Iterator[None]:
+    """Queue the LLM calls made inside the block at this priority ("interactive" or "bulk")"""
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+def estimate_tokens(request: httpx.Request) -> int:
+    """Tokens a chat request counts against the quota: about 4 characters per prompt token plus the completion allowance"""
+    try:
+        body = json.loads(request.content or b"{}")
+    except ValueError:
+        return 1
+    prompt_chars = sum(len(str(message.get("content") or "")) for message in body.get("messages", []))
+    completion = body.get("max_completion_tokens") or body.get("max_tokens") or 0
+    return max(1, prompt_chars // 4 + completion)
+
+def _retry_after(headers: httpx.Headers) -> Optional[float]:
+    """Server-requested delay from Retry-After (seconds) or retry-after-ms, if present"""
+    try:
+        if "retry-after-ms" in headers:
+            return float(headers["retry-after-ms"]) / 1000
+        if "retry-after" in headers:
+            return float(headers["retry-after"])
+    except ValueError:
+        pass
+    return None
+
+class LLMScheduler:
+    """Admits LLM calls within requests/min and tokens/min quotas, interactive calls before bulk ones"""
+    
+    def __init__(
+        self,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+        max_retries: int = 4,
+        backoff_base: float = 1.0,
+        backoff_max: float = 30.0,
+        window: float = 60.0
+    ):
+        # window is the period the quotas refer to; tests shrink it to keep runs short
+        self.window = window
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        # [capacity, available, updated_at] per enforced quota, refilled continuously like OpenAI's own limits
+        now = time.monotonic()
+        self._buckets = {
+            name: [float(capacity), float(capacity), now]
+            for name, capacity in (("requests", requests_per_minute), ("tokens", tokens_per_minute))
+            if capacity > 0
+        }
+        self._paused_until = 0.0
+        self._queue: list = []
+        self._sequence = itertools.count()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._signal: Optional[asyncio.Event] = None
+        self._stats = {
+            'admitted': 0,
+            'throttled': 0,
+            'retries': 0,
+            'gave_up': 0,
+            'wait_seconds': 0.0,
+            'max_wait_seconds': 0.0
+        }
+    
+    @classmethod
+    def from_settings(cls) -> "LLMScheduler":
+        return cls(
+            requests_per_minute=settings.LLM_REQUESTS_PER_MINUTE,
+            tokens_per_minute=settings.LLM_TOKENS_PER_MINUTE,
+            max_retries=settings.LLM_THROTTLE_RETRIES,
+            backoff_base=settings.LLM_BACKOFF_BASE,
+            backoff_max=settings.LLM_BACKOFF_MAX
+        )
+    
+    async def acquire(self, tokens: int, priority: str = "interactive") -> float:
+        """Wait for this call's turn within the quotas; returns the seconds spent queued"""
+        self._bind_loop()
+        cost = {"requests": 1, "tokens": tokens}
+        started = time.monotonic()
+        entry = (PRIORITIES.get(priority, 0), next(self._sequence), priority)
+        heapq.heappush(self._queue, entry)
+        try:
+            while True:
+                signal = self._signal
+                # Only the head of the queue may spend budget, so a big bulk call cannot be overtaken forever
+                # by small ones, and an interactive call never waits behind queued bulk calls
+                delay = self._take(cost, time.monotonic()) if self._queue[0] is entry else None
+                if delay == 0.0:
+                    break
+                try:
+                    await asyncio.wait_for(signal.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            if self._queue and self._queue[0] is entry:
+                heapq.heappop(self._queue)
+            elif entry in self._queue:
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+            self._notify()
+        
+        waited = time.monotonic() - started
+        self._stats['admitted'] += 1
+        self._stats['wait_seconds'] += waited
+        self._stats['max_wait_seconds'] = max(self._stats['max_wait_seconds'], waited)
+        return waited
+    
+    def throttled(self, attempt: int, retry_after: Optional[float]) -> float:
+        """Record a 429 and return how long the call should back off before retrying"""
+        self._stats['throttled'] += 1
+        self._stats['retries'] += 1
+        # The quota is shared, so everyone holds off for as long as the server asked
+        if retry_after:
+            self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+        # Full jitter keeps retried calls from arriving together, never sooner than the server allows
+        ceiling = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+        return max(retry_after or 0.0, random.uniform(0, ceiling))
+    
+    def gave_up(self) -> None:
+        self._stats['throttled'] += 1
+        self._stats['gave_up'] += 1
+    
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth by priority, admission counters and remaining quota"""
+        now = time.monotonic()
+        by_priority = {name: 0 for name in PRIORITIES}
+        for _, _, priority in self._queue:
+            by_priority[priority] = by_priority.get(priority, 0) + 1
+        admitted = self._stats['admitted']
+        return {
+            **self._stats,
+            'wait_seconds': round(self._stats['wait_seconds'], 3),
+            'max_wait_seconds': round(self._stats['max_wait_seconds'], 3),
+            'avg_wait_seconds': round(self._stats['wait_seconds'] / admitted, 3) if admitted else 0.0,
+            'queue_depth': len(self._queue),
+            'queue_depth_by_priority': by_priority,
+            'available': {
+                name: int(min(capacity, available + (now - updated) * capacity / self.window))
+                for name, (capacity, available, updated) in self._buckets.items()
+            },
+            'paused_seconds': round(max(0.0, self._paused_until - now), 3)
+        }
+    
+    def _take(self, cost: Dict[str, int], now: float) -> float:
+        """Seconds until every quota covers cost; when that is now, the cost is taken"""
+        if now < self._paused_until:
+            return self._paused_until - now
+        waits = []
+        for name, bucket in self._buckets.items():
+            capacity, available, updated = bucket
+            bucket[1] = min(capacity, available + (now - updated) * capacity / self.window)
+            bucket[2] = now
+            # A call larger than the whole quota goes out once the bucket is full
+            needed = min(cost[name], capacity)
+            if bucket[1] < needed:
+                waits.append((needed - bucket[1]) * self.window / capacity)
+        if waits:
+            return max(waits)
+        for name, bucket in self._buckets.items():
+            bucket[1] -= min(cost[name], bucket[0])
+        return 0.0
+    
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Waiters queued on a previous event loop can never run again
+            self._loop, self._queue, self._signal = loop, [], asyncio.Event()
+    
+    def _notify(self) -> None:
+        """Wake waiters so the new head of the queue re-checks the budget"""
+        signal, self._signal = self._signal, asyncio.Event()
+        signal.set()
+
+class ScheduledTransport(httpx.AsyncBaseTransport):
+    """httpx transport that queues every request with the scheduler and retries throttled ones"""
+    
+    def __init__(self, transport: httpx.AsyncBaseTransport, scheduler: LLMScheduler):
+        self.transport = transport
+        self.scheduler = scheduler
+    
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        tokens = estimate_tokens(request)
+        priority = _priority.get()
+        attempt = 0
+        while True:
+            await self.scheduler.acquire(tokens, priority)
+            response = await self.transport.handle_async_request(request)
+            if response.status_code != 429:
+                return response
+            
+            retry_after = _retry_after(response.headers)
+            if attempt >= self.scheduler.max_retries:
+                self.scheduler.gave_up()
+                # The OpenAI client would retry again on its own; the scheduler already has
+                response.headers["x-should-retry"] = "false"
+                return response
+            
+            await response.aclose()
+            delay = self.scheduler.throttled(attempt, retry_after)
+            logger.warning(f"LLM call throttled ({priority}, attempt {attempt + 1}); retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+            attempt += 1
+    
+    async def aclose(self) -> None:
+        await self.transport.aclose()
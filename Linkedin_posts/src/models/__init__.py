@@ -3,21 +3,47 @@ Models package for YouTube Agent Workflow.
 Contains Pydantic models for type safety and validation.
 """
 
-from .requests import YouTubeRequest, BulkYouTubeRequest
+from .requests import YouTubeRequest, BulkYouTubeRequest, StreamBulkYouTubeRequest, MultiFormatYouTubeRequest
 from .responses import (
     WorkflowResponse, 
     BulkWorkflowResponse, 
+    BulkItemResult,
+    FormatVariantResult,
+    MultiFormatWorkflowResponse,
+    JobSubmitResponse,
+    JobItemResponse,
+    JobStatusResponse,
     HealthResponse, 
+    ReadinessResponse,
     ToolsResponse
 )
+from .analysis import AnalysisResult, StructureAnalysis, SEOAnalysis, KeywordAnalysis, DocumentScore
 from .state import AgentState
+from .transcript import TranscriptSegments, TranscriptSlice, clean_segment_text
 
 __all__ = [
     "YouTubeRequest",
     "BulkYouTubeRequest", 
+    "StreamBulkYouTubeRequest",
+    "MultiFormatYouTubeRequest",
     "WorkflowResponse",
     "BulkWorkflowResponse",
+    "BulkItemResult",
+    "FormatVariantResult",
+    "MultiFormatWorkflowResponse",
+    "JobSubmitResponse",
+    "JobItemResponse",
+    "JobStatusResponse",
     "HealthResponse",
+    "ReadinessResponse",
     "ToolsResponse",
-    "AgentState"
+    "AnalysisResult",
+    "StructureAnalysis",
+    "SEOAnalysis",
+    "KeywordAnalysis",
+    "DocumentScore",
+    "AgentState",
+    "TranscriptSegments",
+    "TranscriptSlice",
+    "clean_segment_text"
 ]
@@ -0,0 +1,55 @@
+import json
+from functools import cached_property
+from pydantic import BaseModel
+from typing import Any, ClassVar, Dict, List, Optional
+
+class AnalysisResult(BaseModel):
+    """Output of a local analysis tool, kept as data; the labelled JSON text is built only when asked for"""
+    label: ClassVar[str] = "Analysis"
+    data: Dict[str, Any]
+    
+    @cached_property
+    def text(self) -> str:
+        """The tool's string form, for LLM prompts and BaseTool callers"""
+        return f"{self.label}: {json.dumps(self.data, indent=2)}"
+    
+    def __str__(self) -> str:
+        return self.text
+
+class StructureAnalysis(AnalysisResult):
+    """ContentStructureTool result for one platform"""
+    label: ClassVar[str] = "Structure Analysis"
+    
+    @property
+    def structure_score(self) -> int:
+        return self.data['structure_score']
+    
+    @property
+    def recommendations(self) -> List[str]:
+        return self.data['recommendations']
+
+class SEOAnalysis(AnalysisResult):
+    """AdvancedSEOTool result"""
+    label: ClassVar[str] = "Advanced SEO Analysis"
+    
+    @property
+    def seo_score(self) -> float:
+        return self.data['seo_score']
+    
+    @property
+    def recommendations(self) -> List[str]:
+        return self.data['recommendations']
+
+class KeywordAnalysis(AnalysisResult):
+    """KeywordExtractorTool result"""
+    label: ClassVar[str] = "Keyword Analysis"
+
+class DocumentScore(BaseModel):
+    """Readability and SEO scores of one document in a batch"""
+    index: int
+    word_count: int = 0
+    readability_score: float = 0.0
+    readability_grade: str = ""
+    seo_score: float = 0.0
+    analysis: Dict[str, Any] = {}  # Full AdvancedSEOTool analysis: metrics, keywords, structure, recommendations
+    error: Optional[str] = None
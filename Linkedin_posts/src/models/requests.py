@@ -1,11 +1,13 @@
 from pydantic import BaseModel, HttpUrl, validator
 from typing import List
+from src.config.settings import settings
 
 class YouTubeRequest(BaseModel):
     """Request model for single YouTube video processing"""
     url: HttpUrl
     language: str = "en"
     output_format: str = "linkedin"
+    bypass_cache: bool = False  # Generate fresh LLM answers instead of reusing cached ones
     
     @validator('output_format')
     def validate_output_format(cls, v):
@@ -22,6 +24,36 @@ class BulkYouTubeRequest(BaseModel):
     
     @validator('urls')
     def validate_urls_count(cls, v):
-        if len(v) > 10:
-            raise ValueError("Maximum 10 URLs allowed for bulk processing")
-        return v 
\ No newline at end of file
+        if len(v) > settings.MAX_BULK_URLS:
+            raise ValueError(f"Maximum {settings.MAX_BULK_URLS} URLs allowed for bulk processing")
+        return v
+
+class StreamBulkYouTubeRequest(BaseModel):
+    """Request model for streamed bulk processing, where results are returned as they complete"""
+    urls: List[str]
+    language: str = "en"
+    output_format: str = "linkedin"
+    
+    @validator('output_format')
+    def validate_output_format(cls, v):
+        return YouTubeRequest.validate_output_format(v)
+    
+    @validator('urls')
+    def validate_urls_count(cls, v):
+        if len(v) > settings.MAX_STREAM_URLS:
+            raise ValueError(f"Maximum {settings.MAX_STREAM_URLS} URLs allowed per streamed request; upload a file for more")
+        return v
+
+class MultiFormatYouTubeRequest(BaseModel):
+    """Request model for generating several platform variants of one video in a single run"""
+    url: HttpUrl
+    language: str = "en"
+    output_formats: List[str] = ["linkedin", "blog", "twitter"]
+    bypass_cache: bool = False  # Generate fresh LLM answers instead of reusing cached ones
+    
+    @validator('output_formats')
+    def validate_output_formats(cls, v):
+        if not v:
+            raise ValueError("At least one output format is required")
+        # Repeated formats would only produce identical variants
+        return [YouTubeRequest.validate_output_format(fmt) for fmt in dict.fromkeys(v)]
@@ -9,6 +9,36 @@ class WorkflowResponse(BaseModel):
     metadata: Dict[str, Any]
     seo_analysis: Optional[Dict[str, Any]] = None
 
+class FormatVariantResult(BaseModel):
+    """One platform variant of a multi-format request, with its own timing"""
+    output_format: str
+    success: bool
+    error: Optional[str] = None
+    title: str = ""
+    content: str = ""
+    seo_analysis: Optional[Dict[str, Any]] = None
+    metadata: Dict[str, Any] = {}
+    duration_seconds: float = 0.0
+
+class MultiFormatWorkflowResponse(BaseModel):
+    """Response model for a multi-format request; the transcript and analysis are shared by all variants"""
+    transcript: str
+    variants: Dict[str, FormatVariantResult]
+    metadata: Dict[str, Any]
+    success_count: int
+    error_count: int
+    timings: Dict[str, float]
+
+class BulkItemResult(BaseModel):
+    """Outcome and timings of one URL in a bulk request"""
+    url: str
+    video_id: Optional[str] = None
+    success: bool
+    error: Optional[str] = None
+    wait_seconds: float = 0.0
+    duration_seconds: float = 0.0
+    deduplicated: bool = False
+
 class BulkWorkflowResponse(BaseModel):
     """Response model for bulk workflow processing"""
     results: List[WorkflowResponse]
@@ -16,6 +46,39 @@ class BulkWorkflowResponse(BaseModel):
     success_count: int
     error_count: int
     errors: List[str] = []
+    items: List[BulkItemResult] = []
+    duration_seconds: float = 0.0
+
+class JobSubmitResponse(BaseModel):
+    """Response model for a newly queued bulk job"""
+    job_id: str
+    status: str
+    total: int
+    status_url: str
+    events_url: str
+
+class JobItemResponse(BaseModel):
+    """State of one URL within a bulk job"""
+    index: int
+    url: str
+    status: str
+    error: Optional[str] = None
+    duration_seconds: Optional[float] = None
+    result: Optional[WorkflowResponse] = None
+
+class JobStatusResponse(BaseModel):
+    """Response model for bulk job status, including partial results"""
+    job_id: str
+    status: str
+    total: int
+    pending: int
+    running: int
+    done: int
+    failed: int
+    cancelled: int
+    created_at: float
+    updated_at: float
+    items: List[JobItemResponse] = []
 
 class HealthResponse(BaseModel):
     """Response model for health check endpoint"""
@@ -23,8 +86,18 @@ class HealthResponse(BaseModel):
     version: str
     timestamp: str
     uptime: float
+    agents: List[str] = []
+    tools_loaded: Dict[str, int] = {}
+
+class ReadinessResponse(BaseModel):
+    """Response model for readiness check endpoint"""
+    status: str
+    timestamp: str
+    checks: Dict[str, Dict[str, Any]]
+    cached: bool
 
 class ToolsResponse(BaseModel):
     """Response model for tools information endpoint"""
-    available_tools: List[str]
-    tool_descriptions: Dict[str, str] 
\ No newline at end of file
+    transcript_agent_tools: List[Dict[str, str]]
+    title_agent_tools: List[Dict[str, str]]
+    content_agent_tools: List[Dict[str, str]] 
\ No newline at end of file
@@ -1,12 +1,18 @@
-from typing import TypedDict, Optional, Dict, Any
+import operator
+from typing import Annotated, TypedDict, Optional, Dict, Any
+from src.models.transcript import TranscriptSegments
 
 class AgentState(TypedDict):
     """State definition for the YouTube workflow agents"""
     youtube_url: str
     transcript: str
+    transcript_segments: Optional[TranscriptSegments]  # Timestamped source segments, if available
     title: str
     content: str
     metadata: Dict[str, Any]
     seo_analysis: Optional[Dict[str, Any]]
     output_format: str
-    error: str 
\ No newline at end of file
+    title_analysis: Optional[Dict[str, str]]  # Platform-independent title inputs, shared across output formats
+    error: str
+    deadline: Optional[float]  # time.monotonic() by which the request must finish; None for no limit
+    branch_outputs: Annotated[Dict[str, Any], operator.or_]  # Results of concurrent branches, merged by key 
\ No newline at end of file
@@ -0,0 +1,136 @@
+import re
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+# Precompiled once; the separator lets one regex pass clean every segment without
+# brackets matching across segment boundaries
+_SEPARATOR = '\x00'
+_BRACKETED = re.compile(r'\[[^\]\x00]*\]|\([^)\x00]*\)')
+
+def clean_segment_text(text: str) -> str:
+    """Remove bracketed/parenthetical artifacts and collapse whitespace in one segment"""
+    # str.split() collapses whitespace far faster than a \s+ regex substitution
+    return " ".join(_BRACKETED.sub('', text).split())
+
+class TranscriptSegments:
+    """Compact transcript store: segment texts, start times and durations in parallel lists"""
+    
+    __slots__ = ("texts", "starts", "durations", "_text")
+    
+    def __init__(self, texts: List[str], starts: List[float], durations: List[float]):
+        self.texts = texts
+        self.starts = starts
+        self.durations = durations
+        self._text: Optional[str] = None
+    
+    @classmethod
+    def from_parts(cls, parts: Iterable[Any]) -> "TranscriptSegments":
+        """Build from transcript API snippets (objects or dicts)"""
+        parts = list(parts)
+        
+        # Fast paths for the uniform lists the transcript API returns
+        if all(type(part) is dict for part in parts):
+            return cls(
+                [part['text'] for part in parts],
+                [float(part.get('start', 0.0)) for part in parts],
+                [float(part.get('duration', 0.0)) for part in parts]
+            )
+        if all(hasattr(part, 'text') and hasattr(part, 'start') for part in parts):
+            return cls(
+                [part.text for part in parts],
+                [float(part.start) for part in parts],
+                [float(getattr(part, 'duration', 0.0)) for part in parts]
+            )
+        
+        texts, starts, durations = [], [], []
+        for part in parts:
+            if hasattr(part, 'text'):
+                # Object format (FetchedTranscriptSnippet)
+                texts.append(part.text)
+                starts.append(float(getattr(part, 'start', 0.0)))
+                durations.append(float(getattr(part, 'duration', 0.0)))
+            elif isinstance(part, dict) and 'text' in part:
+                # Dictionary format
+                texts.append(part['text'])
+                starts.append(float(part.get('start', 0.0)))
+                durations.append(float(part.get('duration', 0.0)))
+            else:
+                texts.append(str(part))
+                starts.append(starts[-1] if starts else 0.0)
+                durations.append(0.0)
+        return cls(texts, starts, durations)
+    
+    @classmethod
+    def from_dict(cls, data: Union[Dict[str, List], List[Dict[str, Any]]]) -> "TranscriptSegments":
+        """Build from the to_dict() form (or a list of snippet dicts)"""
+        if isinstance(data, list):
+            return cls.from_parts(data)
+        return cls(list(data["texts"]), list(data["starts"]), list(data["durations"]))
+    
+    def to_dict(self) -> Dict[str, List]:
+        return {"texts": self.texts, "starts": self.starts, "durations": self.durations}
+    
+    def __len__(self) -> int:
+        return len(self.texts)
+    
+    @property
+    def total_duration(self) -> float:
+        return sum(self.durations)
+    
+    def text(self) -> str:
+        """Full transcript text, joined once and reused"""
+        if self._text is None:
+            self._text = " ".join(self.texts)
+        return self._text
+    
+    def clean(self) -> "TranscriptSegments":
+        """Clean every segment independently, dropping segments left empty"""
+        cleaned_texts = clean_segment_text(_SEPARATOR.join(self.texts)).split(_SEPARATOR)
+        
+        keep = [index for index, text in enumerate(cleaned_texts) if text and not text.isspace()]
+        return TranscriptSegments(
+            [cleaned_texts[index].strip() for index in keep],
+            [self.starts[index] for index in keep],
+            [self.durations[index] for index in keep]
+        )
+    
+    def slice_time(self, start_seconds: float, end_seconds: float) -> "TranscriptSlice":
+        """Segments starting within [start_seconds, end_seconds) - a view, nothing is copied"""
+        first = bisect_left(self.starts, start_seconds)
+        last = bisect_left(self.starts, end_seconds, lo=first)
+        return TranscriptSlice(self, first, last)
+    
+    def segment_at(self, seconds: float) -> int:
+        """Index of the segment playing at the given time"""
+        return max(0, bisect_right(self.starts, seconds) - 1)
+
+class TranscriptSlice:
+    """Read-only view over a contiguous range of segments"""
+    
+    __slots__ = ("segments", "first", "last")
+    
+    def __init__(self, segments: TranscriptSegments, first: int, last: int):
+        self.segments = segments
+        self.first = first
+        self.last = last
+    
+    def __len__(self) -> int:
+        return self.last - self.first
+    
+    def __iter__(self) -> Iterator[str]:
+        texts = self.segments.texts
+        for index in range(self.first, self.last):
+            yield texts[index]
+    
+    @property
+    def start(self) -> float:
+        return self.segments.starts[self.first] if len(self) else 0.0
+    
+    @property
+    def end(self) -> float:
+        if not len(self):
+            return 0.0
+        return self.segments.starts[self.last - 1] + self.segments.durations[self.last - 1]
+    
+    def text(self) -> str:
+        return " ".join(self)
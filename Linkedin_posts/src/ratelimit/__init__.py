@@ -0,0 +1,13 @@
+"""
+Rate limiting package for YouTube Agent Workflow.
+Contains per-client token buckets and the storage backends they can share.
+"""
+
+from .backends import MemoryBucketBackend, SQLiteBucketBackend
+from .limiter import RateLimiter
+
+__all__ = [
+    "MemoryBucketBackend",
+    "SQLiteBucketBackend",
+    "RateLimiter"
+]
@@ -0,0 +1,120 @@
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Sequence, Tuple
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# A bucket limit is (capacity, period seconds): capacity tokens, refilled evenly over the period
+Limit = Tuple[int, float]
+
+def consume(
+    levels: Sequence[Optional[Tuple[float, float]]],
+    limits: Sequence[Limit],
+    cost: float,
+    now: float
+) -> Tuple[List[float], float]:
+    """Refill each bucket for the time elapsed, then take cost tokens from all of them or none"""
+    # levels holds (tokens, updated_at) per limit, None for a bucket never used (full). Returns
+    # the new token counts and the seconds until the request would fit, 0.0 when it was taken
+    tokens = []
+    for level, (capacity, period) in zip(levels, limits):
+        if level is None:
+            tokens.append(float(capacity))
+        else:
+            tokens.append(min(float(capacity), level[0] + max(0.0, now - level[1]) * capacity / period))
+    waits = [
+        (cost - available) * period / capacity
+        for available, (capacity, period) in zip(tokens, limits)
+        if available < cost
+    ]
+    if waits:
+        return tokens, max(waits)
+    return [available - cost for available in tokens], 0.0
+
+class MemoryBucketBackend:
+    """Token buckets in this process's memory; with several workers each one limits on its own"""
+    
+    def __init__(self, max_clients: int = 100_000):
+        self.max_clients = max_clients
+        self._buckets: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def take(self, key: str, limits: Sequence[Limit], cost: float, now: float) -> Tuple[List[float], float]:
+        with self._lock:
+            levels = self._buckets.get(key) or [None] * len(limits)
+            tokens, retry_after = consume(levels, limits, cost, now)
+            # Least recently seen clients are dropped first; a dropped client simply starts full again
+            self._buckets[key] = [(available, now) for available in tokens]
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        return tokens, retry_after
+    
+    def close(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+class SQLiteBucketBackend:
+    """Token buckets in a SQLite file, shared by every worker process on the host"""
+    
+    # Idle rows are swept every this many requests; a bucket idle for a full period is full anyway
+    PRUNE_EVERY = 1000
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._takes = 0
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Open the database lazily and create the schema on first use"""
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Autocommit mode, so BEGIN IMMEDIATE below controls the transaction
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=5.0)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS rate_buckets (
+                    key TEXT NOT NULL,
+                    bucket INTEGER NOT NULL,
+                    tokens REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (key, bucket)
+                )"""
+            )
+        return self._conn
+    
+    def take(self, key: str, limits: Sequence[Limit], cost: float, now: float) -> Tuple[List[float], float]:
+        with self._lock:
+            conn = self._connection()
+            # The write lock is taken up front so two processes never spend the same tokens
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = dict((bucket, (tokens, updated_at)) for bucket, tokens, updated_at in conn.execute(
+                    "SELECT bucket, tokens, updated_at FROM rate_buckets WHERE key = ?", (key,)
+                ))
+                tokens, retry_after = consume([rows.get(bucket) for bucket in range(len(limits))], limits, cost, now)
+                conn.executemany(
+                    "INSERT OR REPLACE INTO rate_buckets (key, bucket, tokens, updated_at) VALUES (?, ?, ?, ?)",
+                    [(key, bucket, available, now) for bucket, available in enumerate(tokens)]
+                )
+                self._takes += 1
+                if self._takes % self.PRUNE_EVERY == 0:
+                    longest = max(period for _, period in limits)
+                    conn.execute("DELETE FROM rate_buckets WHERE updated_at < ?", (now - longest,))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return tokens, retry_after
+    
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,72 @@
+import hashlib
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, List
+from src.config.settings import settings
+from .backends import Limit, MemoryBucketBackend, SQLiteBucketBackend
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+class RateLimiter:
+    """Per-client token buckets, one per window; a request needs a token from every bucket"""
+    
+    def __init__(
+        self,
+        backend: Any,
+        per_minute: int = 0,
+        per_hour: int = 0,
+        clock: Callable[[], float] = time.time
+    ):
+        self.backend = backend
+        # Windows set to 0 are not enforced
+        self.limits: List[Limit] = [
+            (capacity, period) for capacity, period in ((per_minute, 60.0), (per_hour, 3600.0)) if capacity > 0
+        ]
+        self.clock = clock
+        self._stats = {"allowed": 0, "limited": 0}
+        self._stats_lock = threading.Lock()
+    
+    @classmethod
+    def from_settings(cls) -> "RateLimiter":
+        if settings.RATE_LIMIT_BACKEND == "sqlite":
+            backend = SQLiteBucketBackend(settings.RATE_LIMIT_SQLITE_PATH)
+        else:
+            backend = MemoryBucketBackend(settings.RATE_LIMIT_MAX_CLIENTS)
+        return cls(backend, settings.RATE_LIMIT_PER_MINUTE, settings.RATE_LIMIT_PER_HOUR)
+    
+    @staticmethod
+    def client_key(api_key: str = "", address: str = "") -> str:
+        """Bucket key for an API key (stored hashed) or, without one, a client address"""
+        if api_key:
+            return "key:" + hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:32]
+        return f"ip:{address or 'unknown'}"
+    
+    def check(self, client: str, cost: float = 1) -> Dict[str, Any]:
+        """Take cost tokens for a client; retry_after is whole seconds, as the Retry-After header wants"""
+        if not self.limits:
+            return {"allowed": True, "limit": 0, "remaining": 0, "retry_after": 0}
+        
+        tokens, wait = self.backend.take(client, self.limits, cost, self.clock())
+        allowed = wait == 0.0
+        with self._stats_lock:
+            self._stats["allowed" if allowed else "limited"] += 1
+        # Headers describe the shortest window configured
+        return {
+            "allowed": allowed,
+            "limit": self.limits[0][0],
+            "remaining": int(tokens[0]),
+            "retry_after": 0 if allowed else max(1, math.ceil(wait))
+        }
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                **self._stats,
+                "backend": type(self.backend).__name__,
+                "limits": {f"per_{int(period)}s": capacity for capacity, period in self.limits}
+            }
+    
+    def close(self) -> None:
+        self.backend.close()
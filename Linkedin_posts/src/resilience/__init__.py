@@ -0,0 +1,14 @@
+"""
+Resilience package for YouTube Agent Workflow.
+Contains the per-upstream circuit breakers that fail calls fast while an upstream is down.
+"""
+
+from .breaker import CircuitBreaker, CircuitBreakerRegistry, circuit_breakers
+from .transport import CircuitBreakerTransport
+
+__all__ = [
+    "CircuitBreaker",
+    "CircuitBreakerRegistry",
+    "circuit_breakers",
+    "CircuitBreakerTransport"
+]
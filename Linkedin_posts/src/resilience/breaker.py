@@ -0,0 +1,204 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, Tuple
+from src.config.settings import settings
+from utils.exceptions import CircuitOpenError
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Breaker states: closed -> open (failing fast) -> half_open (probing) -> closed | open
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+class CircuitBreaker:
+    """Fails calls to one upstream fast once its recent failure rate crosses a threshold, then probes it after a cool-down"""
+    
+    def __init__(
+        self,
+        name: str,
+        failure_rate: float = 0.5,
+        min_calls: int = 5,
+        window: float = 60.0,
+        open_seconds: float = 30.0,
+        half_open_probes: int = 1,
+        enabled: bool = True,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = max(1, min_calls)
+        self.window = window
+        self.open_seconds = open_seconds
+        self.half_open_probes = max(1, half_open_probes)
+        # A disabled breaker still counts outcomes but never opens
+        self.enabled = enabled
+        self.clock = clock
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        self._window_failures = 0
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+        self._stats = {"successes": 0, "failures": 0, "rejected": 0, "opened": 0}
+    
+    @classmethod
+    def from_settings(cls, name: str) -> "CircuitBreaker":
+        return cls(
+            name,
+            failure_rate=settings.CIRCUIT_FAILURE_RATE,
+            min_calls=settings.CIRCUIT_MIN_CALLS,
+            window=settings.CIRCUIT_WINDOW_SECONDS,
+            open_seconds=settings.CIRCUIT_OPEN_SECONDS,
+            half_open_probes=settings.CIRCUIT_HALF_OPEN_PROBES,
+            enabled=settings.CIRCUIT_BREAKER_ENABLED
+        )
+    
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state(self.clock())
+    
+    def available(self) -> bool:
+        """Whether a call would be let through now; unlike acquire, takes no half-open probe slot"""
+        with self._lock:
+            state = self._current_state(self.clock())
+            return state == CLOSED or (state == HALF_OPEN and self._probes < self.half_open_probes)
+    
+    def check(self) -> None:
+        """Raise CircuitOpenError while calls are failed fast, without admitting one"""
+        if not self.available():
+            self._reject()
+    
+    def acquire(self) -> None:
+        """Admit one call or raise CircuitOpenError; a call admitted while half-open is a probe"""
+        with self._lock:
+            state = self._current_state(self.clock())
+            if state == CLOSED:
+                return
+            if state == HALF_OPEN and self._probes < self.half_open_probes:
+                self._probes += 1
+                return
+        self._reject()
+    
+    def record_success(self) -> None:
+        self._record(True)
+    
+    def record_failure(self) -> None:
+        self._record(False)
+    
+    def release(self) -> None:
+        """End an admitted call without a verdict, e.g. when it was cancelled"""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probes = max(0, self._probes - 1)
+    
+    @contextmanager
+    def guard(self, is_failure: Callable[[Exception], bool] = lambda error: True) -> Iterator[None]:
+        """Run the block as one call: admitted or rejected up front, its outcome recorded on exit"""
+        self.acquire()
+        try:
+            yield
+        except Exception as e:
+            self._record(not is_failure(e))
+            raise
+        except BaseException:
+            # Cancellation says nothing about the upstream
+            self.release()
+            raise
+        self._record(True)
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            now = self.clock()
+            state = self._current_state(now)
+            self._trim(now)
+            calls = len(self._outcomes)
+            return {
+                **self._stats,
+                "state": state,
+                "enabled": self.enabled,
+                "window_calls": calls,
+                "failure_rate": round(self._window_failures / calls, 3) if calls else 0.0,
+                "retry_in": round(self._retry_in(now), 1)
+            }
+    
+    def _current_state(self, now: float) -> str:
+        """State at now, moving an open breaker whose cool-down has passed to half-open; call with the lock held"""
+        if self._state == OPEN and now - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probes = 0
+            logger.info(f"Circuit {self.name} half-open: probing the upstream")
+        return self._state
+    
+    def _retry_in(self, now: float) -> float:
+        return max(0.0, self._opened_at + self.open_seconds - now) if self._state == OPEN else 0.0
+    
+    def _reject(self) -> None:
+        with self._lock:
+            self._stats["rejected"] += 1
+            retry_in = self._retry_in(self.clock())
+        raise CircuitOpenError(f"{self.name} is unavailable (circuit open); retry in {retry_in:.0f}s")
+    
+    def _record(self, ok: bool) -> None:
+        with self._lock:
+            now = self.clock()
+            state = self._current_state(now)
+            self._stats["successes" if ok else "failures"] += 1
+            if not self.enabled:
+                return
+            if state == HALF_OPEN:
+                # The probe decides: a success closes the breaker, a failure opens it for another cool-down
+                self._probes = max(0, self._probes - 1)
+                if ok:
+                    self._close()
+                else:
+                    self._open(now)
+            elif state == CLOSED:
+                self._outcomes.append((now, ok))
+                self._window_failures += not ok
+                self._trim(now)
+                calls = len(self._outcomes)
+                if calls >= self.min_calls and self._window_failures / calls >= self.failure_rate:
+                    self._open(now)
+            # Calls admitted before the breaker opened may finish while it is open; they change nothing
+    
+    def _trim(self, now: float) -> None:
+        while self._outcomes and now - self._outcomes[0][0] > self.window:
+            _, ok = self._outcomes.popleft()
+            self._window_failures -= not ok
+    
+    def _open(self, now: float) -> None:
+        self._state = OPEN
+        self._opened_at = now
+        self._stats["opened"] += 1
+        logger.warning(f"Circuit {self.name} opened: failing calls fast for {self.open_seconds:.0f}s")
+    
+    def _close(self) -> None:
+        self._state = CLOSED
+        self._outcomes.clear()
+        self._window_failures = 0
+        logger.info(f"Circuit {self.name} closed: upstream recovered")
+
+class CircuitBreakerRegistry:
+    """One breaker per upstream name, built from settings on first use"""
+    
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, name: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                breaker = self._breakers[name] = CircuitBreaker.from_settings(name)
+            return breaker
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {name: breaker.stats() for name, breaker in sorted(breakers.items())}
+
+# Breakers shared by every agent and tool in the process
+circuit_breakers = CircuitBreakerRegistry()
@@ -0,0 +1,41 @@
+import httpx
+from src.resilience.breaker import CircuitBreaker
+from utils.exceptions import CircuitOpenError
+
+class CircuitBreakerTransport(httpx.AsyncBaseTransport):
+    """httpx transport that records every request's outcome with a breaker, and answers 503 itself while it is open"""
+    
+    def __init__(self, transport: httpx.AsyncBaseTransport, breaker: CircuitBreaker):
+        self.transport = transport
+        self.breaker = breaker
+    
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        try:
+            self.breaker.acquire()
+        except CircuitOpenError as e:
+            # Marked final, or the OpenAI client would back off and retry into the open circuit
+            return httpx.Response(
+                503,
+                headers={"x-should-retry": "false"},
+                json={"error": {"message": str(e), "type": "circuit_open"}},
+                request=request
+            )
+        
+        try:
+            response = await self.transport.handle_async_request(request)
+        except httpx.TransportError:
+            # Connection failures and timeouts
+            self.breaker.record_failure()
+            raise
+        except BaseException:
+            self.breaker.release()
+            raise
+        # Throttling (429) is the scheduler's business; only server errors count against the upstream
+        if response.status_code >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return response
+    
+    async def aclose(self) -> None:
+        await self.transport.aclose()
@@ -6,6 +6,7 @@ Contains specialized LangChain tools for each agent.
 from .youtube_tools import YouTubeTranscriptTool, YouTubeMetadataTool
 from .content_tools import ContentStructureTool, SEOAnalysisTool
 from .seo_tools import AdvancedSEOTool, KeywordExtractorTool
+from .scoring import score_document, score_documents
 
 __all__ = [
     "YouTubeTranscriptTool",
@@ -13,5 +14,7 @@ __all__ = [
     "ContentStructureTool",
     "SEOAnalysisTool",
     "AdvancedSEOTool",
-    "KeywordExtractorTool"
+    "KeywordExtractorTool",
+    "score_document",
+    "score_documents"
 ]
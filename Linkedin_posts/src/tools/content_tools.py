@@ -1,17 +1,29 @@
 from langchain_core.tools import BaseTool
+from src.models.analysis import SEOAnalysis, StructureAnalysis
+from .seo_tools import AdvancedSEOTool
 from utils.logger import setup_logger
-import json
+from utils.text_analysis import analyze_text
 import re
 from typing import Dict, List
 
 logger = setup_logger(__name__)
 
+# Compiled once instead of on every analysis
+_HASHTAG = re.compile(r'#\w+')
+_MENTION = re.compile(r'@\w+')
+_SYMBOL = re.compile(r'[^\w\s]')
+_DIGITS = re.compile(r'\d+')
+_HEADING = re.compile(r'^#{1,6}\s+(.+)$', re.MULTILINE)
+
+# Stateless, so SEOAnalysisTool reuses one analyzer instead of building one per call
+_seo_analyzer = AdvancedSEOTool()
+
 class ContentStructureTool(BaseTool):
     """Tool for analyzing and structuring content for different platforms"""
     name: str = "content_structure_analyzer"
     description: str = """Analyze content structure and provide formatting recommendations.
     Input: content|||platform. Output: Structure analysis and recommendations."""
-
+    
     def _run(self, content_platform_input: str) -> str:
         try:
             # Parse input
@@ -20,29 +32,27 @@ class ContentStructureTool(BaseTool):
                 return "Error: Input format should be 'content|||platform'"
             
             content, platform = parts[0], parts[1]
-            
-            # Analyze content structure
-            structure_analysis = self._analyze_content_structure(content, platform)
-            
-            logger.info(f"Completed content structure analysis for {platform}")
-            return f"Structure Analysis: {json.dumps(structure_analysis, indent=2)}"
-            
+            return self.analyze(content, platform).text
+        
         except Exception as e:
             error_msg = f"Error in content structure analysis: {str(e)}"
             logger.error(error_msg)
             return f"Error: {error_msg}"
     
+    def analyze(self, content: str, platform: str) -> StructureAnalysis:
+        """Structure analysis as data; callers render .text only where a prompt needs it"""
+        analysis = StructureAnalysis(data=self._analyze_content_structure(content, platform))
+        logger.info(f"Completed content structure analysis for {platform}")
+        return analysis
+    
     def _analyze_content_structure(self, content: str, platform: str) -> Dict:
         """Analyze content structure for specific platform"""
         
         # Basic metrics
-        words = content.split()
-        sentences = [s for s in content.split('.') if s.strip()]
-        paragraphs = [p for p in content.split('\n\n') if p.strip()]
-        
-        word_count = len(words)
-        sentence_count = len(sentences)
-        paragraph_count = len(paragraphs)
+        features = analyze_text(content)
+        word_count = features.word_count
+        sentence_count = features.sentence_count
+        paragraph_count = features.paragraph_count
         
         # Platform-specific analysis
         platform_analysis = self._get_platform_specific_analysis(content, platform)
@@ -70,8 +80,8 @@ class ContentStructureTool(BaseTool):
         
         if platform == "linkedin":
             return {
-                "hashtag_count": len(re.findall(r'#\w+', content)),
-                "emoji_count": len(re.findall(r'[^\w\s]', content)),
+                "hashtag_count": len(_HASHTAG.findall(content)),
+                "emoji_count": len(_SYMBOL.findall(content)),
                 "call_to_action": self._detect_call_to_action(content),
                 "engagement_hooks": self._detect_engagement_hooks(content),
                 "professional_tone": self._assess_professional_tone(content)
@@ -80,8 +90,8 @@ class ContentStructureTool(BaseTool):
             return {
                 "character_count": len(content),
                 "thread_potential": self._assess_thread_potential(content),
-                "hashtag_usage": len(re.findall(r'#\w+', content)),
-                "mention_count": len(re.findall(r'@\w+', content))
+                "hashtag_usage": len(_HASHTAG.findall(content)),
+                "mention_count": len(_MENTION.findall(content))
             }
         elif platform == "blog":
             return {
@@ -102,7 +112,7 @@ class ContentStructureTool(BaseTool):
         ]
         
         detected_ctas = []
-        content_lower = content.lower()
+        content_lower = analyze_text(content).lower
         for phrase in cta_phrases:
             if phrase in content_lower:
                 detected_ctas.append(phrase)
@@ -112,14 +122,14 @@ class ContentStructureTool(BaseTool):
     def _detect_engagement_hooks(self, content: str) -> List[str]:
         """Detect engagement hooks in content"""
         hooks = []
-        content_lower = content.lower()
+        content_lower = analyze_text(content).lower
         
         # Question hooks
         if '?' in content:
             hooks.append("question_asked")
         
         # Number hooks
-        if re.search(r'\d+', content):
+        if _DIGITS.search(content):
             hooks.append("numbered_list")
         
         # Story hooks
@@ -134,8 +144,9 @@ class ContentStructureTool(BaseTool):
         professional_words = ["industry", "business", "professional", "expert", "strategy"]
         casual_words = ["awesome", "cool", "amazing", "incredible", "mind-blowing"]
         
-        prof_count = sum(1 for word in professional_words if word in content.lower())
-        casual_count = sum(1 for word in casual_words if word in content.lower())
+        content_lower = analyze_text(content).lower
+        prof_count = sum(1 for word in professional_words if word in content_lower)
+        casual_count = sum(1 for word in casual_words if word in content_lower)
         
         if prof_count > casual_count:
             return "professional"
@@ -150,7 +161,7 @@ class ContentStructureTool(BaseTool):
     
     def _analyze_heading_structure(self, content: str) -> Dict:
         """Analyze heading structure for blog content"""
-        headings = re.findall(r'^#{1,6}\s+(.+)$', content, re.MULTILINE)
+        headings = _HEADING.findall(content)
         return {
             "heading_count": len(headings),
             "heading_levels": [len(h.split()[0]) for h in headings if h.startswith('#')]
@@ -166,7 +177,8 @@ class ContentStructureTool(BaseTool):
     
     def _assess_readability(self, content: str) -> str:
         """Assess content readability"""
-        avg_sentence_length = len(content.split()) / max(content.count('.'), 1)
+        features = analyze_text(content)
+        avg_sentence_length = features.word_count / max(features.period_count, 1)
         if avg_sentence_length < 15:
             return "easy"
         elif avg_sentence_length < 25:
@@ -233,19 +245,18 @@ class SEOAnalysisTool(BaseTool):
     name: str = "seo_analyzer"
     description: str = """Perform SEO analysis on content and provide optimization recommendations.
     Input: Content text. Output: SEO analysis and recommendations."""
-
+    
     def _run(self, content: str) -> str:
         try:
-            # Import SEO tools from existing seo_tools.py
-            from .seo_tools import AdvancedSEOTool
-            
-            seo_tool = AdvancedSEOTool()
-            analysis = seo_tool._run(content)
-            
-            logger.info("Completed SEO analysis")
-            return analysis
-            
+            return self.analyze(content).text
+        
         except Exception as e:
             error_msg = f"Error in SEO analysis: {str(e)}"
             logger.error(error_msg)
-            return f"Error: {error_msg}" 
\ No newline at end of file
+            return f"Error: {error_msg}"
+    
+    def analyze(self, content: str) -> SEOAnalysis:
+        """Delegate to the shared AdvancedSEOTool, returning its typed result"""
+        analysis = _seo_analyzer.analyze(content)
+        logger.info("Completed SEO analysis")
+        return analysis
@@ -0,0 +1,44 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence
+from src.config.settings import settings
+from src.models.analysis import DocumentScore
+from .seo_tools import AdvancedSEOTool
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Stateless, so one instance serves every call in this process (and in each pool worker)
+_seo_analyzer = AdvancedSEOTool()
+
+def score_document(content: str, index: int = 0) -> DocumentScore:
+    """Readability and SEO analysis of one document, as a typed result rather than the tool's JSON string"""
+    try:
+        analysis = _seo_analyzer._perform_comprehensive_seo_analysis(content)
+    except Exception as e:
+        return DocumentScore(index=index, error=f"Scoring failed: {str(e)}")
+    return DocumentScore(
+        index=index,
+        word_count=analysis['basic_metrics']['word_count'],
+        readability_score=analysis['readability']['score'],
+        readability_grade=analysis['readability']['grade'],
+        seo_score=analysis['seo_score'],
+        analysis=analysis
+    )
+
+def score_documents(
+    documents: Sequence[str],
+    workers: Optional[int] = None,
+    chunksize: Optional[int] = None
+) -> List[DocumentScore]:
+    """Score many documents in input order, spreading large batches over a process pool when workers > 1"""
+    workers = settings.SCORING_WORKERS if workers is None else workers
+    if workers <= 1 or len(documents) < settings.SCORING_PROCESS_MIN_DOCUMENTS:
+        return [score_document(content, index) for index, content in enumerate(documents)]
+    
+    # Scoring is pure CPU work, so threads would only take turns on the GIL. Workers are
+    # spawned rather than forked so they never inherit the server's threads or event loop
+    chunksize = chunksize or max(1, len(documents) // (workers * 4))
+    logger.info(f"Scoring {len(documents)} documents on {workers} processes (chunks of {chunksize})")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return list(pool.map(score_document, documents, range(len(documents)), chunksize=chunksize))
@@ -1,46 +1,60 @@
 from langchain_core.tools import BaseTool
-from utils.helpers import calculate_readability_score
+from src.models.analysis import KeywordAnalysis, SEOAnalysis
 from utils.logger import setup_logger
-import json
+from utils.text_analysis import analyze_text
+import heapq
 import re
+from operator import itemgetter
 from typing import Dict, List
 
 logger = setup_logger(__name__)
 
+# Markdown structure patterns, compiled once
+_H1 = re.compile(r'^#\s', re.MULTILINE)
+_H2 = re.compile(r'^##\s', re.MULTILINE)
+_H3 = re.compile(r'^###\s', re.MULTILINE)
+_BULLET_ITEM = re.compile(r'^\s*[-*+]\s', re.MULTILINE)
+_NUMBERED_ITEM = re.compile(r'^\s*\d+\.\s', re.MULTILINE)
+_INTERNAL_LINK = re.compile(r'\[.*?\]\((?!http)')
+_EXTERNAL_LINK = re.compile(r'\[.*?\]\(https?://')
+
 class AdvancedSEOTool(BaseTool):
     """Advanced SEO analysis tool with comprehensive metrics"""
     name: str = "advanced_seo_analyzer"
     description: str = """Perform comprehensive SEO analysis including keyword density,
     readability, meta tag suggestions, and content optimization recommendations.
     Input: Content text. Output: Detailed SEO analysis with actionable insights."""
-
+    
     def _run(self, content: str) -> str:
         try:
-            analysis = self._perform_comprehensive_seo_analysis(content)
-            logger.info("Completed advanced SEO analysis")
-            return f"Advanced SEO Analysis: {json.dumps(analysis, indent=2)}"
-            
+            return self.analyze(content).text
+        
         except Exception as e:
             error_msg = f"Error in advanced SEO analysis: {str(e)}"
             logger.error(error_msg)
             return f"Error: {error_msg}"
     
+    def analyze(self, content: str) -> SEOAnalysis:
+        """SEO analysis as data, for in-process callers that would otherwise parse the JSON text back"""
+        analysis = SEOAnalysis(data=self._perform_comprehensive_seo_analysis(content))
+        logger.info("Completed advanced SEO analysis")
+        return analysis
+    
     def _perform_comprehensive_seo_analysis(self, content: str) -> Dict:
         """Perform detailed SEO analysis"""
         
-        # Basic metrics
-        words = content.split()
-        sentences = [s for s in content.split('.') if s.strip()]
-        paragraphs = [p for p in content.split('\n\n') if p.strip()]
+        # Tokenized once; every analysis below reads from the same features
+        features = analyze_text(content)
         
-        word_count = len(words)
-        sentence_count = len(sentences)
-        paragraph_count = len(paragraphs)
+        # Basic metrics
+        word_count = features.word_count
+        sentence_count = features.sentence_count
+        paragraph_count = features.paragraph_count
         avg_sentence_length = word_count / max(sentence_count, 1)
         avg_paragraph_length = sentence_count / max(paragraph_count, 1)
         
         # Readability analysis
-        readability_score = calculate_readability_score(content)
+        readability_score = features.readability
         
         # Keyword analysis
         keyword_analysis = self._analyze_keywords(content)
@@ -80,7 +94,7 @@ class AdvancedSEOTool(BaseTool):
     
     def _analyze_keywords(self, content: str) -> Dict:
         """Analyze keyword usage and density"""
-        words = content.lower().split()
+        features = analyze_text(content)
         
         # Filter stop words
         stop_words = {
@@ -92,13 +106,9 @@ class AdvancedSEOTool(BaseTool):
         }
         
         # Count word frequencies
-        word_freq = {}
-        for word in words:
-            word = re.sub(r'[^\w]', '', word)
-            if len(word) > 2 and word not in stop_words:
-                word_freq[word] = word_freq.get(word, 0) + 1
+        word_freq = features.keyword_counts(stop_words)
         
-        total_words = len([w for w in words if len(w) > 2])
+        total_words = sum(1 for w in features.lower_tokens if len(w) > 2)
         
         # Calculate keyword density
         keyword_density = {}
@@ -125,17 +135,17 @@ class AdvancedSEOTool(BaseTool):
         """Analyze content structure for SEO"""
         
         # Count headings
-        h1_count = len(re.findall(r'^#\s', content, re.MULTILINE))
-        h2_count = len(re.findall(r'^##\s', content, re.MULTILINE))
-        h3_count = len(re.findall(r'^###\s', content, re.MULTILINE))
+        h1_count = len(_H1.findall(content))
+        h2_count = len(_H2.findall(content))
+        h3_count = len(_H3.findall(content))
         
         # Check for lists
-        bullet_lists = len(re.findall(r'^\s*[-*+]\s', content, re.MULTILINE))
-        numbered_lists = len(re.findall(r'^\s*\d+\.\s', content, re.MULTILINE))
+        bullet_lists = len(_BULLET_ITEM.findall(content))
+        numbered_lists = len(_NUMBERED_ITEM.findall(content))
         
         # Check for links (basic pattern)
-        internal_links = len(re.findall(r'\[.*?\]\((?!http)', content))
-        external_links = len(re.findall(r'\[.*?\]\(https?://', content))
+        internal_links = len(_INTERNAL_LINK.findall(content))
+        external_links = len(_EXTERNAL_LINK.findall(content))
         
         return {
             "headings": {
@@ -250,8 +260,7 @@ class AdvancedSEOTool(BaseTool):
         top_keywords = [kw['word'] for kw in keyword_analysis.get('top_keywords', [])[:5]]
         
         # Extract first sentence for meta description base
-        sentences = content.split('.')
-        first_sentence = sentences[0].strip() if sentences else ""
+        first_sentence = analyze_text(content).first_sentence
         
         return {
             "title_suggestions": [
@@ -270,51 +279,42 @@ class KeywordExtractorTool(BaseTool):
     description: str = """Extract relevant keywords and phrases from content for SEO optimization.
     Analyzes text to find the most important terms and their variations.
     Input: Content text. Output: Structured keyword analysis."""
-
+    
     def _run(self, content: str) -> str:
         try:
-            keywords = self._extract_keywords(content)
-            logger.info("Completed keyword extraction")
-            return f"Keyword Analysis: {json.dumps(keywords, indent=2)}"
-            
+            return self.analyze(content).text
+        
         except Exception as e:
             error_msg = f"Error extracting keywords: {str(e)}"
             logger.error(error_msg)
             return f"Error: {error_msg}"
     
+    def analyze(self, content: str) -> KeywordAnalysis:
+        """Keyword analysis as data"""
+        keywords = KeywordAnalysis(data=self._extract_keywords(content))
+        logger.info("Completed keyword extraction")
+        return keywords
+    
     def _extract_keywords(self, content: str) -> Dict:
         """Extract and categorize keywords"""
         
-        # Basic keyword extraction
-        words = content.lower().split()
-        
-        # Remove stop words and clean
+        # Stop words apply to single keywords only; phrases keep them
         stop_words = {
             'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 
             'with', 'by', 'from', 'is', 'are', 'was', 'were', 'be', 'been', 
             'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would'
         }
         
-        clean_words = []
-        for word in words:
-            word = re.sub(r'[^\w]', '', word)
-            if len(word) > 2 and word not in stop_words:
-                clean_words.append(word)
+        # 1-, 2- and 3-word counts from terms normalized once; every term has 3+ characters,
+        # so phrases always clear the old 7-character minimum
+        ngrams = analyze_text(content).ngram_table((1, 2, 3))
+        word_freq = {word: freq for word, freq in ngrams[1].items() if word not in stop_words}
+        # Two-word phrases come first, so they win frequency ties as before
+        phrase_freq = {**ngrams[2], **ngrams[3]}
         
-        # Count frequencies
-        word_freq = {}
-        for word in clean_words:
-            word_freq[word] = word_freq.get(word, 0) + 1
-        
-        # Extract phrases (2-3 words)
-        phrases = self._extract_phrases(content, 2) + self._extract_phrases(content, 3)
-        phrase_freq = {}
-        for phrase in phrases:
-            phrase_freq[phrase] = phrase_freq.get(phrase, 0) + 1
-        
-        # Categorize keywords
-        single_keywords = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)[:20]
-        phrase_keywords = sorted(phrase_freq.items(), key=lambda x: x[1], reverse=True)[:10]
+        # Categorize keywords; nlargest keeps first-seen order among equal frequencies, like a stable sort
+        single_keywords = heapq.nlargest(10, word_freq.items(), key=itemgetter(1))
+        phrase_keywords = heapq.nlargest(10, phrase_freq.items(), key=itemgetter(1))
         
         # Identify long-tail keywords
         long_tail = [phrase for phrase, freq in phrase_keywords if len(phrase.split()) >= 3 and freq >= 2]
@@ -322,7 +322,7 @@ class KeywordExtractorTool(BaseTool):
         return {
             "single_keywords": [
                 {"keyword": kw[0], "frequency": kw[1]} 
-                for kw in single_keywords[:10]
+                for kw in single_keywords
             ],
             "phrase_keywords": [
                 {"phrase": phrase[0], "frequency": phrase[1]} 
@@ -330,28 +330,9 @@ class KeywordExtractorTool(BaseTool):
             ],
             "long_tail_keywords": long_tail[:5],
             "total_unique_words": len(word_freq),
-            "keyword_density_analysis": self._analyze_keyword_density(word_freq, len(clean_words))
+            "keyword_density_analysis": self._analyze_keyword_density(word_freq, sum(word_freq.values()))
         }
     
-    def _extract_phrases(self, content: str, n: int) -> List[str]:
-        """Extract n-word phrases from content"""
-        words = content.lower().split()
-        phrases = []
-        
-        for i in range(len(words) - n + 1):
-            phrase_words = []
-            for j in range(n):
-                word = re.sub(r'[^\w]', '', words[i + j])
-                if len(word) > 2:
-                    phrase_words.append(word)
-            
-            if len(phrase_words) == n:
-                phrase = ' '.join(phrase_words)
-                if len(phrase) > 6:  # Minimum phrase length
-                    phrases.append(phrase)
-        
-        return phrases
-    
     def _analyze_keyword_density(self, word_freq: Dict, total_words: int) -> Dict:
         """Analyze keyword density"""
         density_analysis = {}
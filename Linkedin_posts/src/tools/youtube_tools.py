@@ -1,112 +1,192 @@
 from langchain_core.tools import BaseTool
-from youtube_transcript_api import YouTubeTranscriptApi
-import re
+from youtube_transcript_api import (
+    AgeRestricted,
+    InvalidVideoId,
+    NoTranscriptFound,
+    NotTranslatable,
+    TranscriptsDisabled,
+    TranslationLanguageNotAvailable,
+    VideoUnavailable,
+    VideoUnplayable,
+    YouTubeTranscriptApi
+)
+from concurrent.futures import ThreadPoolExecutor
+from requests import Session
+import asyncio
+from src.cache.transcript_cache import transcript_cache
+from src.config.settings import settings
+from src.models.transcript import TranscriptSegments
+from src.resilience.breaker import circuit_breakers
+from utils.exceptions import StrategyExhaustedError, TranscriptExtractionError
+from utils.hedging import HedgedStrategyRunner
 from utils.logger import setup_logger
 from utils.validators import extract_youtube_video_id
 from typing import Optional
 
 logger = setup_logger(__name__)
 
+# Dedicated, bounded pool so blocking transcript downloads never run on the event loop
+# and cannot exhaust the default executor shared with the rest of the app
+_transcript_executor = ThreadPoolExecutor(
+    max_workers=settings.TRANSCRIPT_FETCH_WORKERS,
+    thread_name_prefix="transcript-fetch"
+)
+
+# Races the transcript extraction methods and remembers which one works per video
+_strategy_runner = HedgedStrategyRunner(
+    hedge_delay=settings.TRANSCRIPT_HEDGE_DELAY,
+    max_workers=settings.TRANSCRIPT_FETCH_WORKERS * 3
+)
+
+# Fails downloads fast while YouTube is unreachable, instead of every request waiting out its timeouts
+_transcript_breaker = circuit_breakers.get("youtube_transcripts")
+
+# YouTube answered, the video just has no usable captions: these say nothing about an outage
+_VIDEO_ERRORS = (
+    AgeRestricted,
+    InvalidVideoId,
+    NoTranscriptFound,
+    NotTranslatable,
+    TranscriptsDisabled,
+    TranslationLanguageNotAvailable,
+    VideoUnavailable,
+    VideoUnplayable
+)
+
+def _youtube_unreachable(error: Exception) -> bool:
+    """Whether a failed download points at YouTube itself rather than at the video"""
+    errors = getattr(error, "errors", {}).values()
+    return not any(isinstance(e, _VIDEO_ERRORS) for e in errors)
+
+class _TimeoutSession(Session):
+    """requests Session applying a default timeout to every HTTP call"""
+    
+    def __init__(self, timeout: float):
+        super().__init__()
+        self.timeout = timeout
+    
+    def request(self, *args, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(*args, **kwargs)
+
 class YouTubeTranscriptTool(BaseTool):
     """Tool for extracting YouTube video transcripts"""
     name: str = "youtube_transcript_extractor"
     description: str = """Extract transcript from YouTube video URL.
     Input: YouTube video URL. Output: Clean transcript text."""
 
-    def _run(self, youtube_url: str) -> str:
+    def _run(self, youtube_url: str, language: str = "en") -> str:
         try:
-            video_id = extract_youtube_video_id(youtube_url)
-            if not video_id:
-                return "Error: Invalid YouTube URL"
-            
-            # Create API instance
-            api = YouTubeTranscriptApi()
-            
-            # Try to get transcript with different methods
-            try:
-                # Method 1: Try to get transcript directly
-                transcript_list = api.fetch(video_id)
-            except Exception as e1:
-                logger.warning(f"Direct transcript extraction failed: {e1}")
-                try:
-                    # Method 2: Try with language specification
-                    transcript_list = api.fetch(video_id, languages=['en'])
-                except Exception as e2:
-                    logger.warning(f"English transcript extraction failed: {e2}")
-                    try:
-                        # Method 3: Try to get available transcripts first
-                        available_transcripts = api.list(video_id)
-                        transcript = available_transcripts.find_transcript(['en'])
-                        transcript_list = transcript.fetch()
-                    except Exception as e3:
-                        logger.error(f"All transcript extraction methods failed: {e3}")
-                        return f"Error: Could not extract transcript. Video may not have captions or they may be disabled."
-            
-            # Combine transcript parts - handle both dict and object formats
-            full_transcript = ""
-            part_count = 0
-            total_duration = 0
-            
-            for part in transcript_list:
-                part_count += 1
-                # Handle both dictionary and object formats
-                if hasattr(part, 'text'):
-                    # Object format (FetchedTranscriptSnippet)
-                    full_transcript += part.text + " "
-                    if hasattr(part, 'duration'):
-                        total_duration += part.duration
-                elif isinstance(part, dict) and 'text' in part:
-                    # Dictionary format
-                    full_transcript += part['text'] + " "
-                    if 'duration' in part:
-                        total_duration += part['duration']
-                else:
-                    # Try to convert to string
-                    full_transcript += str(part) + " "
-            
-            # Log detailed extraction info for debugging
-            logger.info(f"Extracted {part_count} transcript parts")
-            logger.info(f"Total transcript duration: {total_duration:.2f} seconds ({total_duration/60:.2f} minutes)")
-            logger.info(f"Raw transcript length: {len(full_transcript)} characters")
-            logger.info(f"Raw transcript word count: {len(full_transcript.split())}")
-            
-            # Check for potential issues
-            if total_duration > 0:
-                expected_min_words = (total_duration / 60) * 120  # 120 words per minute minimum
-                actual_words = len(full_transcript.split())
-                if actual_words < expected_min_words:
-                    logger.warning(f"Transcript may be incomplete: {actual_words} words vs expected ~{expected_min_words:.0f} words")
-            
-            # Clean up transcript
-            cleaned_transcript = self._clean_transcript(full_transcript)
-            
-            if not cleaned_transcript.strip():
-                return "Error: Extracted transcript is empty"
-            
-            logger.info(f"Successfully extracted transcript for video {video_id} ({len(cleaned_transcript)} chars)")
-            return cleaned_transcript
-            
+            return self.fetch_segments(youtube_url, language).text()
+        except TranscriptExtractionError as e:
+            return f"Error: {e}"
         except Exception as e:
             error_msg = f"Error extracting transcript: {str(e)}"
             logger.error(error_msg)
             return f"Error: {error_msg}"
     
-    def _clean_transcript(self, transcript: str) -> str:
-        """Clean and format transcript text"""
-        if not transcript:
-            return ""
-            
-        # Remove extra whitespace
-        cleaned = re.sub(r'\s+', ' ', transcript)
+    def fetch_segments(self, youtube_url: str, language: str = "en") -> TranscriptSegments:
+        """Extract cleaned transcript segments, keeping their timestamps"""
+        video_id = extract_youtube_video_id(youtube_url)
+        if not video_id:
+            raise TranscriptExtractionError("Invalid YouTube URL")
+        
+        # Reuse segments downloaded by an earlier request for the same video
+        cached = transcript_cache.get_segments(video_id, language)
+        if cached is not None:
+            logger.info(f"Using cached transcript segments for video {video_id}")
+            segments = TranscriptSegments.from_dict(cached)
+        else:
+            segments = self._fetch_segments(video_id, language)
+            if segments is None:
+                raise TranscriptExtractionError("Could not extract transcript. Video may not have captions or they may be disabled.")
+            transcript_cache.set_segments(video_id, language, segments.to_dict())
+        
+        full_transcript = segments.text()
+        total_duration = segments.total_duration
+        word_count = len(full_transcript.split())
+        
+        # Log detailed extraction info for debugging
+        logger.info(f"Extracted {len(segments)} transcript parts")
+        logger.info(f"Total transcript duration: {total_duration:.2f} seconds ({total_duration/60:.2f} minutes)")
+        logger.info(f"Raw transcript length: {len(full_transcript)} characters")
+        logger.info(f"Raw transcript word count: {word_count}")
         
-        # Remove common transcript artifacts
-        cleaned = re.sub(r'\[.*?\]', '', cleaned)  # Remove bracketed text
-        cleaned = re.sub(r'\(.*?\)', '', cleaned)  # Remove parenthetical text
+        # Check for potential issues
+        if total_duration > 0:
+            expected_min_words = (total_duration / 60) * 120  # 120 words per minute minimum
+            if word_count < expected_min_words:
+                logger.warning(f"Transcript may be incomplete: {word_count} words vs expected ~{expected_min_words:.0f} words")
         
-        # Basic punctuation cleanup
-        cleaned = cleaned.strip()
+        # Clean up each segment
+        cleaned = segments.clean()
+        if not len(cleaned):
+            raise TranscriptExtractionError("Extracted transcript is empty")
         
+        logger.info(f"Successfully extracted transcript for video {video_id} ({len(cleaned.text())} chars)")
         return cleaned
+    
+    async def afetch_segments(self, youtube_url: str, language: str = "en", timeout: Optional[float] = None) -> TranscriptSegments:
+        """Extract cleaned transcript segments on the transcript pool without blocking the event loop"""
+        timeout = settings.YOUTUBE_TRANSCRIPT_TIMEOUT if timeout is None else timeout
+        loop = asyncio.get_running_loop()
+        # During an outage, fail before queuing for a fetch thread the stuck downloads hold
+        _transcript_breaker.check()
+        
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(_transcript_executor, self.fetch_segments, youtube_url, language),
+                timeout=timeout
+            )
+        except asyncio.TimeoutError:
+            raise TranscriptExtractionError(f"Transcript extraction timed out after {timeout}s")
+    
+    def _fetch_segments(self, video_id: str, language: str) -> Optional[TranscriptSegments]:
+        """Download raw transcript segments"""
+        # Only the requested language: the segments are cached under it, so an English
+        # fallback would later be served as this language's transcript
+        languages = [language]
+        
+        def new_api() -> YouTubeTranscriptApi:
+            # Separate client per strategy since they may run concurrently;
+            # each HTTP call is bounded by the transcript timeout
+            return YouTubeTranscriptApi(http_client=_TimeoutSession(settings.YOUTUBE_TRANSCRIPT_TIMEOUT))
+        
+        strategies = [
+            # Method 1: Captions uploaded by the creator, the most accurate when a video has them
+            ("manual", lambda: new_api().list(video_id).find_manually_created_transcript(languages).fetch()),
+            # Method 2: YouTube's automatic captions, which most videos without manual ones still have
+            ("generated", lambda: new_api().list(video_id).find_generated_transcript(languages).fetch())
+        ]
+        
+        # A slow or missing caption track is hedged by starting the next one instead of waiting for failure
+        try:
+            with _transcript_breaker.guard(is_failure=_youtube_unreachable):
+                strategy, transcript_list = _strategy_runner.run(strategies, key=video_id)
+        except StrategyExhaustedError as e:
+            logger.error(f"All transcript extraction methods failed: {e}")
+            return None
+        
+        logger.info(f"Transcript for video {video_id} extracted with '{strategy}' method")
+        
+        return TranscriptSegments.from_parts(transcript_list)
+    
+    async def _arun(self, youtube_url: str, timeout: Optional[float] = None, language: str = "en") -> str:
+        """Extract transcript on the transcript pool without blocking the event loop"""
+        # Cancelling the awaiting task or hitting the timeout stops waiting immediately;
+        # the worker thread itself is bounded by the session's HTTP timeout
+        timeout = settings.YOUTUBE_TRANSCRIPT_TIMEOUT if timeout is None else timeout
+        loop = asyncio.get_running_loop()
+        
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(_transcript_executor, self._run, youtube_url, language),
+                timeout=timeout
+            )
+        except asyncio.TimeoutError:
+            error_msg = f"Transcript extraction timed out after {timeout}s"
+            logger.error(error_msg)
+            return f"Error: {error_msg}"
 
 class YouTubeMetadataTool(BaseTool):
     """Tool for extracting YouTube video metadata"""
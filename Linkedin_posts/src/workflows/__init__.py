@@ -4,5 +4,7 @@ Contains LangGraph workflow orchestration and management.
 """
 
 from .youtube_workflow import YouTubeWorkflow
+from .parallel_workflow import ParallelYouTubeWorkflow
+from .registry import WorkflowRegistry
 
-__all__ = ["YouTubeWorkflow"]
+__all__ = ["YouTubeWorkflow", "ParallelYouTubeWorkflow", "WorkflowRegistry"]
@@ -0,0 +1,106 @@
+from typing import Any, Dict
+from langgraph.graph import StateGraph, END
+from src.agents.base_agents import BaseAgent
+from src.models.state import AgentState
+from src.workflows.youtube_workflow import YouTubeWorkflow
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+class ParallelYouTubeWorkflow(YouTubeWorkflow):
+    """Workflow variant that drafts title and content concurrently after transcript extraction"""
+    
+    def _build_workflow(self) -> StateGraph:
+        """Build the fan-out/fan-in LangGraph workflow"""
+        workflow = StateGraph(AgentState)
+        
+        workflow.add_node("transcript_agent", self.transcript_agent.process)
+        workflow.add_node("title_branch", self._title_branch)
+        workflow.add_node("content_branch", self._content_branch)
+        workflow.add_node("merge", self._merge)
+        
+        # Fan out after the transcript, fan back in once both branches finish
+        workflow.set_entry_point("transcript_agent")
+        workflow.add_edge("transcript_agent", "title_branch")
+        workflow.add_edge("transcript_agent", "content_branch")
+        workflow.add_edge(["title_branch", "content_branch"], "merge")
+        workflow.add_edge("merge", END)
+        
+        return workflow.compile()
+    
+    async def _title_branch(self, state: AgentState) -> Dict[str, Any]:
+        """Generate the title on a private copy of the state"""
+        result, history = await self._run_branch(self.title_agent, state)
+        return {'branch_outputs': {'title': {
+            'title': result['title'],
+            'error': result.get('error', ''),
+            'agent_history': history
+        }}}
+    
+    async def _content_branch(self, state: AgentState) -> Dict[str, Any]:
+        """Draft the content without waiting for the title"""
+        result, history = await self._run_branch(self.content_agent, state)
+        return {'branch_outputs': {'content': {
+            'content': result['content'],
+            'seo_analysis': result.get('seo_analysis'),
+            'error': result.get('error', ''),
+            'agent_history': history
+        }}}
+    
+    async def _run_branch(self, agent: BaseAgent, state: AgentState) -> tuple:
+        """Run an agent on a copy of the state so concurrent branches never share mutable metadata"""
+        history = list(state['metadata'].get('agent_history', []))
+        known = len(history)
+        branch_state = {**state, 'metadata': {**state['metadata'], 'agent_history': history}}
+        result = await agent.process(branch_state)
+        return result, result['metadata'].get('agent_history', [])[known:]
+    
+    def _merge(self, state: AgentState) -> Dict[str, Any]:
+        """Inject the generated title into the drafted content result"""
+        title_output = state['branch_outputs'].get('title', {})
+        content_output = state['branch_outputs'].get('content', {})
+        
+        metadata = {**state['metadata']}
+        metadata['agent_history'] = (
+            metadata.get('agent_history', [])
+            + title_output.get('agent_history', [])
+            + content_output.get('agent_history', [])
+        )
+        
+        # Report failures in pipeline order, as the sequential workflow would
+        error = state.get('error') or title_output.get('error') or content_output.get('error') or ""
+        title = title_output.get('title', state['title'])
+        content = self._with_headline(title, content_output.get('content', state['content']), state.get('output_format', 'linkedin'))
+        logger.info("Merged title and content branches")
+        
+        return {
+            'title': title,
+            'content': content,
+            'seo_analysis': content_output.get('seo_analysis'),
+            'metadata': metadata,
+            'error': error
+        }
+    
+    @staticmethod
+    def _with_headline(title: str, content: str, output_format: str) -> str:
+        """Put the title at the top of content drafted without it; threads and other formats are left as they are"""
+        if not title or not content or content.lstrip().startswith(title):
+            return content
+        if output_format == 'linkedin':
+            return f"{title}\n\n{content}"
+        if output_format == 'blog':
+            return f"# {title}\n\n{content}"
+        return content
+    
+    def get_workflow_info(self) -> Dict[str, Any]:
+        """Get information about the workflow"""
+        info = super().get_workflow_info()
+        info['topology'] = 'fan_out'
+        info['workflow_steps'] = [
+            'Extract YouTube transcript',
+            'Generate optimized title and draft structured content concurrently',
+            'Merge title into content',
+            'Apply platform formatting',
+            'Perform SEO analysis'
+        ]
+        return info
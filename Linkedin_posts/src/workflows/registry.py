@@ -0,0 +1,40 @@
+import time
+from typing import Dict, Optional
+from src.config.settings import settings
+from src.workflows.parallel_workflow import ParallelYouTubeWorkflow
+from src.workflows.youtube_workflow import YouTubeWorkflow
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+class WorkflowRegistry:
+    """Application-scoped holder for workflow instances shared across requests"""
+    
+    # Variants that can be built on demand by name
+    FACTORIES = {
+        "youtube": YouTubeWorkflow,
+        "youtube_parallel": ParallelYouTubeWorkflow
+    }
+    
+    def __init__(self):
+        self.started_at = time.time()
+        self._workflows: Dict[str, YouTubeWorkflow] = {}
+    
+    def register(self, name: str, workflow: YouTubeWorkflow) -> None:
+        """Register a workflow instance under a name"""
+        self._workflows[name] = workflow
+        logger.info(f"Registered workflow '{name}'")
+    
+    def get(self, name: Optional[str] = None) -> YouTubeWorkflow:
+        """Get a registered workflow (DEFAULT_WORKFLOW if unnamed), building known variants on first use"""
+        name = name or settings.DEFAULT_WORKFLOW
+        if name not in self._workflows:
+            if name not in self.FACTORIES:
+                raise KeyError(f"Workflow '{name}' is not registered")
+            self.register(name, self.FACTORIES[name]())
+        return self._workflows[name]
+    
+    @property
+    def uptime(self) -> float:
+        """Seconds since the registry was created"""
+        return time.time() - self.started_at
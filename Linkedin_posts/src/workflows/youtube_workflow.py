@@ -1,19 +1,33 @@
+import asyncio
+import time
 from langgraph.graph import StateGraph, END
 from src.models.state import AgentState
 from src.agents.transcript_agent import TranscriptAgent
 from src.agents.title_agent import TitleAgent
-from src.agents.content_agent import ContentAgent
+from src.agents.content_agent import ContentAgent, CONTENT_DRAFT_TAG, CONTENT_ENHANCE_TAG
+from prompts import PROMPTS_VERSION
+from src.cache.llm_cache import llm_response_cache
+from src.cache.result_cache import WorkflowResultCache
 from src.config.settings import settings
+from src.llm.scheduler import llm_priority
 from utils.logger import setup_logger
+from utils.deadline import deadline_after, expired, time_left
 from utils.exceptions import WorkflowException
-from typing import Dict, Any
+from utils.validators import extract_youtube_video_id, validate_youtube_url
+from typing import AsyncIterable, AsyncIterator, Dict, Any, Iterable, List, Optional, Union
 from fastapi import HTTPException
 
 logger = setup_logger(__name__)
 
+# Streamed LLM calls, by tag, and the phase name clients see
+CONTENT_STREAM_TAGS = {CONTENT_DRAFT_TAG: "draft", CONTENT_ENHANCE_TAG: "enhance"}
+
 class YouTubeWorkflow:
     """Main workflow orchestrating all agents"""
     
+    # Part of result cache keys: bump when a change alters what the workflow produces
+    WORKFLOW_VERSION = "2.0.0"
+    
     def __init__(self):
         # Initialize agents
         self.transcript_agent = TranscriptAgent()
@@ -44,91 +58,397 @@ class YouTubeWorkflow:
         self, 
         youtube_url: str, 
         output_format: str = "linkedin",
-        language: str = "en"
+        language: str = "en",
+        bypass_cache: bool = False,
+        timeout: Optional[float] = None
     ) -> Dict[str, Any]:
-        """Process YouTube video through complete workflow"""
+        """Process YouTube video through complete workflow; bypass_cache forces fresh LLM answers"""
         
         logger.info(f"Starting workflow for: {youtube_url}")
         
-        # Initialize state
-        initial_state = AgentState(
-            youtube_url=youtube_url,
-            transcript="",
-            title="",
-            content="",
-            metadata={
-                'workflow_started': True,
-                'input_format': output_format,
-                'language': language
-            },
-            seo_analysis=None,
-            output_format=output_format,
-            error=""
-        )
+        # Initialize state; timeout defaults to WORKFLOW_TIMEOUT
+        initial_state = self._initial_state(youtube_url, output_format, language, timeout)
+        deadline = initial_state['deadline']
         
         try:
             # Run the workflow
-            result = await self.workflow.ainvoke(initial_state)
+            with llm_response_cache.track(bypass=bypass_cache) as llm_cache_usage:
+                result = await self._run_until_deadline(initial_state)
             
             # Check for errors
+            if result.get('error') and expired(deadline):
+                return self._partial_response(result, llm_cache_usage)
             if result.get('error'):
                 logger.error(f"Workflow failed: {result['error']}")
                 raise HTTPException(status_code=400, detail=result['error'])
             
-            # Prepare response
-            response = {
-                'transcript': result['transcript'],
-                'title': result['title'],
-                'content': result['content'],
-                'metadata': result['metadata'],
-                'seo_analysis': result.get('seo_analysis'),
-                'workflow_success': True
-            }
-            
-            logger.info("Workflow completed successfully")
+            logger.info(f"Workflow completed successfully (LLM cache hits: {llm_cache_usage['hits']})")
+            response = self._build_response(result, llm_cache_usage)
+            if expired(deadline):
+                # Finished, but some optional steps were skipped for lack of time
+                response['metadata']['deadline_exceeded'] = True
             return response
-            
+        
+        except HTTPException:
+            raise
+        except Exception as e:
+            error_msg = f"Workflow execution failed: {str(e)}"
+            logger.error(error_msg)
+            raise HTTPException(status_code=500, detail=error_msg)
+    
+    async def _run_until_deadline(self, state: AgentState) -> Dict[str, Any]:
+        """Run the graph, cancelling whatever is still in flight shortly after the deadline; returns the last state reached"""
+        latest = state
+        try:
+            async with asyncio.timeout(self._cutoff(state)) as cutoff:
+                async for latest in self.workflow.astream(state, stream_mode="values"):
+                    pass
+        except TimeoutError:
+            if not cutoff.expired():
+                raise
+            logger.warning("Workflow cancelled at its deadline")
+            latest = {**latest, 'error': latest.get('error') or "Workflow deadline exceeded"}
+        return latest
+    
+    def _cutoff(self, state: AgentState) -> Optional[float]:
+        """Seconds before a run is cancelled outright; agents get a grace period to return partial results first"""
+        budget = time_left(state['deadline'])
+        return None if budget is None else budget + settings.WORKFLOW_DEADLINE_GRACE
+    
+    async def stream_youtube_video(
+        self,
+        youtube_url: str,
+        output_format: str = "linkedin",
+        language: str = "en",
+        bypass_cache: bool = False
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Run the workflow, yielding stage events and content tokens as they happen, then the result"""
+        
+        logger.info(f"Starting streamed workflow for: {youtube_url}")
+        started = time.perf_counter()
+        stage_started: Dict[str, float] = {}
+        previous: Dict[str, Any] = {}
+        final_state: Dict[str, Any] = {}
+        
+        initial_state = self._initial_state(youtube_url, output_format, language)
+        
+        try:
+            with llm_response_cache.track(bypass=bypass_cache) as llm_cache_usage:
+                stream = self.workflow.astream(initial_state, stream_mode=["tasks", "messages", "values"])
+                async for mode, chunk in stream:
+                    now = time.perf_counter()
+                    if mode == "values":
+                        previous = final_state = chunk
+                    elif mode == "messages":
+                        message, run_info = chunk
+                        phase = next((tag for tag in run_info.get('tags') or [] if tag in CONTENT_STREAM_TAGS), None)
+                        if phase and message.content:
+                            yield {'event': 'token', 'data': {'phase': CONTENT_STREAM_TAGS[phase], 'text': message.content}}
+                    elif 'result' not in chunk:
+                        stage_started[chunk['id']] = now
+                        yield {'event': 'stage_started', 'data': {
+                            'stage': chunk['name'],
+                            'elapsed_seconds': round(now - started, 3)
+                        }}
+                    else:
+                        yield {'event': 'stage_completed', 'data': {
+                            'stage': chunk['name'],
+                            'duration_seconds': round(now - stage_started.pop(chunk['id'], now), 3),
+                            'elapsed_seconds': round(now - started, 3),
+                            **_stage_artifacts(chunk.get('result') or {}, previous)
+                        }}
+        except Exception as e:
+            error_msg = f"Workflow execution failed: {str(e)}"
+            logger.error(error_msg)
+            yield {'event': 'error', 'data': {'error': error_msg}}
+            return
+        
+        # Every agent call is bounded by the deadline in the state, so the stream itself needs no cutoff
+        if final_state.get('error') and expired(initial_state['deadline']) and final_state.get('transcript'):
+            yield {'event': 'result', 'data': self._partial_response(final_state, llm_cache_usage)}
+            return
+        if final_state.get('error'):
+            logger.error(f"Workflow failed: {final_state['error']}")
+            yield {'event': 'error', 'data': {'error': final_state['error']}}
+            return
+        
+        logger.info(f"Streamed workflow completed in {time.perf_counter() - started:.2f}s")
+        yield {'event': 'result', 'data': self._build_response(final_state, llm_cache_usage)}
+    
+    async def process_youtube_video_formats(
+        self,
+        youtube_url: str,
+        output_formats: List[str],
+        language: str = "en",
+        bypass_cache: bool = False
+    ) -> Dict[str, Any]:
+        """Produce several platform variants of one video, extracting and analyzing the transcript only once"""
+        
+        formats = list(dict.fromkeys(output_formats))
+        logger.info(f"Starting multi-format workflow for: {youtube_url} ({', '.join(formats)})")
+        started = time.perf_counter()
+        
+        try:
+            with llm_response_cache.track(bypass=bypass_cache) as llm_cache_usage:
+                state = await self.transcript_agent.process(self._initial_state(youtube_url, formats[0], language))
+                if state.get('error'):
+                    logger.error(f"Workflow failed: {state['error']}")
+                    raise HTTPException(status_code=400, detail=state['error'])
+                transcript_done = time.perf_counter()
+                
+                # Themes and trends feed every title; only the title and content are per platform
+                state['title_analysis'] = await self.title_agent.analyze(state['transcript'], state['deadline'])
+                analysis_done = time.perf_counter()
+                
+                variants = await asyncio.gather(*(self._generate_variant(state, fmt) for fmt in formats))
         except HTTPException:
             raise
         except Exception as e:
             error_msg = f"Workflow execution failed: {str(e)}"
             logger.error(error_msg)
             raise HTTPException(status_code=500, detail=error_msg)
+        
+        finished = time.perf_counter()
+        metadata = {key: value for key, value in state['metadata'].items() if key != 'input_format'}
+        metadata['output_formats'] = formats
+        metadata['llm_cache'] = dict(llm_cache_usage)
+        
+        logger.info(f"Multi-format workflow completed in {finished - started:.2f}s")
+        return {
+            'transcript': state['transcript'],
+            'variants': dict(zip(formats, variants)),
+            'metadata': metadata,
+            'success_count': sum(1 for variant in variants if variant['success']),
+            'error_count': sum(1 for variant in variants if not variant['success']),
+            'timings': {
+                'transcript_seconds': round(transcript_done - started, 3),
+                'shared_analysis_seconds': round(analysis_done - transcript_done, 3),
+                'generation_seconds': round(finished - analysis_done, 3),
+                'total_seconds': round(finished - started, 3)
+            }
+        }
+    
+    async def _generate_variant(self, state: AgentState, output_format: str) -> Dict[str, Any]:
+        """Write the title and content for one platform on a private copy of the shared state"""
+        started = time.perf_counter()
+        metadata = {
+            **state['metadata'],
+            'input_format': output_format,
+            'agent_history': list(state['metadata'].get('agent_history', []))
+        }
+        variant = {**state, 'output_format': output_format, 'metadata': metadata}
+        try:
+            variant = await self.title_agent.process(variant)
+            variant = await self.content_agent.process(variant)
+            error = variant.get('error') or None
+        except Exception as e:
+            error = f"Failed to generate {output_format}: {str(e)}"
+        if error:
+            logger.error(error)
+        
+        return {
+            'output_format': output_format,
+            'success': error is None,
+            'error': error,
+            'title': variant['title'] if error is None else "",
+            'content': variant['content'] if error is None else "",
+            'seo_analysis': variant.get('seo_analysis') if error is None else None,
+            'metadata': variant['metadata'],
+            'duration_seconds': round(time.perf_counter() - started, 3)
+        }
+    
+    def _initial_state(self, youtube_url: str, output_format: str, language: str, timeout: Optional[float] = None) -> AgentState:
+        return AgentState(
+            youtube_url=youtube_url,
+            transcript="",
+            transcript_segments=None,
+            title="",
+            content="",
+            metadata={
+                'workflow_started': True,
+                'input_format': output_format,
+                'language': language
+            },
+            seo_analysis=None,
+            output_format=output_format,
+            title_analysis=None,
+            error="",
+            deadline=deadline_after(settings.WORKFLOW_TIMEOUT if timeout is None else timeout),
+            branch_outputs={}
+        )
+    
+    def _build_response(self, result: Dict[str, Any], llm_cache_usage: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        if llm_cache_usage is not None:
+            result['metadata']['llm_cache'] = dict(llm_cache_usage)
+        return {
+            'transcript': result['transcript'],
+            'title': result['title'],
+            'content': result['content'],
+            'metadata': result['metadata'],
+            'seo_analysis': result.get('seo_analysis'),
+            'workflow_success': True
+        }
+    
+    def _partial_response(self, result: Dict[str, Any], llm_cache_usage: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Whatever a run that ran out of time produced; 504 when not even the transcript was ready"""
+        if not result.get('transcript'):
+            logger.error(f"Workflow timed out: {result['error']}")
+            raise HTTPException(status_code=504, detail=f"Deadline exceeded: {result['error']}")
+        
+        logger.warning(f"Workflow timed out, returning partial result: {result['error']}")
+        response = self._build_response(result, llm_cache_usage)
+        response['metadata'].update({'deadline_exceeded': True, 'partial': True, 'partial_reason': result['error']})
+        response['workflow_success'] = False
+        return response
     
     async def process_multiple_videos(
         self, 
         youtube_urls: list[str], 
-        output_format: str = "linkedin"
+        output_format: str = "linkedin",
+        language: str = "en",
+        max_concurrency: Optional[int] = None
     ) -> Dict[str, Any]:
-        """Process multiple YouTube videos"""
+        """Process multiple YouTube videos concurrently, each distinct video once"""
+        
+        started = time.perf_counter()
+        semaphore = asyncio.Semaphore(max(1, max_concurrency or settings.MAX_CONCURRENT_REQUESTS))
+        
+        async def run_one(url: str) -> Dict[str, Any]:
+            queued_at = time.perf_counter()
+            async with semaphore:
+                begun = time.perf_counter()
+                try:
+                    # Batch work queues behind interactive requests for LLM quota
+                    with llm_priority("bulk"):
+                        result = await self.process_youtube_video(url, output_format, language)
+                    logger.info(f"Successfully processed: {url}")
+                    error = None
+                except Exception as e:
+                    result = None
+                    error = f"Failed to process {url}: {str(e)}"
+                    logger.error(error)
+                return {
+                    'result': result,
+                    'error': error,
+                    'wait_seconds': round(begun - queued_at, 3),
+                    'duration_seconds': round(time.perf_counter() - begun, 3)
+                }
+        
+        # The same video under different URL forms is only processed once per batch
+        keys = [extract_youtube_video_id(url) or url for url in youtube_urls]
+        first_url = {}
+        for key, url in zip(keys, youtube_urls):
+            first_url.setdefault(key, url)
+        outcomes = dict(zip(first_url, await asyncio.gather(*(run_one(url) for url in first_url.values()))))
         
         results = []
         errors = []
-        success_count = 0
-        
-        for url in youtube_urls:
-            try:
-                result = await self.process_youtube_video(url, output_format)
-                results.append(result)
-                success_count += 1
-                logger.info(f"Successfully processed: {url}")
-            except Exception as e:
-                error_msg = f"Failed to process {url}: {str(e)}"
-                errors.append(error_msg)
-                logger.error(error_msg)
+        items = []
+        seen = set()
+        for key, url in zip(keys, youtube_urls):
+            outcome = outcomes[key]
+            if outcome['result'] is not None:
+                results.append(outcome['result'])
+            else:
+                errors.append(outcome['error'])
+            items.append({
+                'url': url,
+                'video_id': key if key != url else None,
+                'success': outcome['result'] is not None,
+                'error': outcome['error'],
+                'wait_seconds': outcome['wait_seconds'],
+                'duration_seconds': outcome['duration_seconds'],
+                'deduplicated': key in seen
+            })
+            seen.add(key)
         
         return {
             'results': results,
             'total_processed': len(youtube_urls),
-            'success_count': success_count,
+            'success_count': len(results),
             'error_count': len(errors),
-            'errors': errors
+            'errors': errors,
+            'items': items,
+            'duration_seconds': round(time.perf_counter() - started, 3)
+        }
+    
+    async def stream_multiple_videos(
+        self,
+        youtube_urls: Union[Iterable[str], AsyncIterable[str]],
+        output_format: str = "linkedin",
+        language: str = "en",
+        max_concurrency: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield one record per URL as soon as it finishes, with at most max_concurrency in flight"""
+        
+        limit = max(1, max_concurrency or settings.MAX_CONCURRENT_REQUESTS)
+        urls = _iterate(youtube_urls)
+        in_flight = set()
+        index = 0
+        exhausted = False
+        
+        # URLs are pulled only when a slot frees up and the caller has taken the previous
+        # record, so a slow consumer pauses intake instead of results piling up in memory
+        try:
+            while True:
+                while not exhausted and len(in_flight) < limit:
+                    try:
+                        url = await urls.__anext__()
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+                    in_flight.add(asyncio.create_task(self._process_record(index, url, output_format, language)))
+                    index += 1
+                
+                if not in_flight:
+                    return
+                done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            # The consumer went away: stop work nobody will read
+            for task in in_flight:
+                task.cancel()
+    
+    async def _process_record(self, index: int, url: str, output_format: str, language: str) -> Dict[str, Any]:
+        """Process one streamed URL into a self-contained record"""
+        started = time.perf_counter()
+        result, error = None, None
+        if not validate_youtube_url(url):
+            error = f"Invalid YouTube URL: {url}"
+        else:
+            try:
+                with llm_priority("bulk"):
+                    result = await self.process_youtube_video(url, output_format, language)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                error = f"Failed to process {url}: {getattr(e, 'detail', None) or str(e)}"
+                logger.error(error)
+        return {
+            'index': index,
+            'url': url,
+            'video_id': extract_youtube_video_id(url),
+            'success': error is None,
+            'error': error,
+            'duration_seconds': round(time.perf_counter() - started, 3),
+            'result': result
         }
     
+    def result_cache_key(self, youtube_url: str, output_format: str, language: str) -> str:
+        """Result cache key; every URL form of the same video maps to the same entry"""
+        return WorkflowResultCache.key(
+            extract_youtube_video_id(youtube_url) or youtube_url,
+            output_format,
+            language,
+            f"{self.WORKFLOW_VERSION}+prompts{PROMPTS_VERSION}"
+        )
+    
     def get_workflow_info(self) -> Dict[str, Any]:
         """Get information about the workflow"""
         return {
-            'workflow_version': '2.0.0',
+            'workflow_version': self.WORKFLOW_VERSION,
+            'topology': 'sequential',
             'agents': [
                 {
                     'name': 'TranscriptAgent',
@@ -156,3 +476,33 @@ class YouTubeWorkflow:
                 'Perform SEO analysis'
             ]
         }
+
+async def _iterate(items: Union[Iterable[str], AsyncIterable[str]]) -> AsyncIterator[str]:
+    """Walk a plain or async iterable lazily"""
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+def _stage_artifacts(update: Dict[str, Any], previous: Dict[str, Any]) -> Dict[str, Any]:
+    """Summarize what a finished node produced, without echoing large fields"""
+    fields = dict(update)
+    for output in (update.get('branch_outputs') or {}).values():
+        fields.update(output)
+    
+    artifacts = {}
+    if fields.get('transcript') and fields['transcript'] != previous.get('transcript'):
+        artifacts['transcript_length'] = len(fields['transcript'])
+        if fields.get('transcript_segments') is not None:
+            artifacts['segment_count'] = len(fields['transcript_segments'])
+    if fields.get('title') and fields['title'] != previous.get('title'):
+        artifacts['title'] = fields['title']
+    if fields.get('content') and fields['content'] != previous.get('content'):
+        artifacts['content_length'] = len(fields['content'])
+    if fields.get('seo_analysis'):
+        artifacts['seo_score'] = fields['seo_analysis'].get('seo_score')
+    if fields.get('error') and fields['error'] != previous.get('error'):
+        artifacts['error'] = fields['error']
+    return artifacts
@@ -0,0 +1,56 @@
+"""Offline chat model with configurable latency for exercising LLM-bound code paths"""
+
+import asyncio
+import time
+from typing import Any, AsyncIterator, Callable, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+class SlowFakeChatModel(BaseChatModel):
+    """Chat model that sleeps for `delay` seconds and answers with respond(prompt)"""
+    
+    delay: float = 0.0
+    # Optional (prompt, response) -> seconds, for latency that scales with token counts
+    latency: Optional[Callable[[str, str], float]] = None
+    respond: Callable[[str], str] = lambda prompt: prompt
+    fail_when: Optional[Callable[[str], bool]] = None
+    calls: List[str] = []
+    
+    @property
+    def _llm_type(self) -> str:
+        return "slow-fake-chat"
+    
+    def _prepare(self, messages: List[BaseMessage]) -> tuple:
+        prompt = "\n".join(str(message.content) for message in messages)
+        self.calls.append(prompt)
+        if self.fail_when and self.fail_when(prompt):
+            raise RuntimeError("Injected LLM failure")
+        response = self.respond(prompt)
+        delay = self.latency(prompt, response) if self.latency else self.delay
+        return response, delay
+    
+    def _result(self, response: str) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=response))])
+    
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        response, delay = self._prepare(messages)
+        time.sleep(delay)
+        return self._result(response)
+    
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        response, delay = self._prepare(messages)
+        await asyncio.sleep(delay)
+        return self._result(response)
+    
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        """Stream the response word by word, spreading the delay across the chunks"""
+        response, delay = self._prepare(messages)
+        words = response.split(" ")
+        for index, word in enumerate(words):
+            await asyncio.sleep(delay / len(words))
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=word if index == 0 else " " + word))
+            if run_manager:
+                await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
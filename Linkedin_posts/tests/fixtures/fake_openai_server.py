@@ -0,0 +1,66 @@
+"""Local OpenAI-compatible chat completions server that enforces request and token quotas like the real API"""
+
+import asyncio
+import json
+import time
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+class FakeOpenAIServer:
+    """Answers /v1/chat/completions, or 429 with Retry-After once a quota is spent; quotas refill over window seconds"""
+    
+    def __init__(self, requests_per_window: int = 0, tokens_per_window: int = 0, window: float = 60.0, delay: float = 0.0):
+        self.window = window
+        self.delay = delay
+        self.quotas = {name: capacity for name, capacity in (("requests", requests_per_window), ("tokens", tokens_per_window)) if capacity}
+        self._available = {name: float(capacity) for name, capacity in self.quotas.items()}
+        self._updated = time.monotonic()
+        self.accepted = 0
+        self.rejected = 0
+        self.app = FastAPI()
+        self.app.post("/v1/chat/completions")(self._complete)
+    
+    def transport(self) -> httpx.ASGITransport:
+        return httpx.ASGITransport(app=self.app)
+    
+    def _spend(self, cost: dict) -> float:
+        """Take cost from every quota, or return the seconds until it would fit"""
+        now = time.monotonic()
+        for name, capacity in self.quotas.items():
+            self._available[name] = min(capacity, self._available[name] + (now - self._updated) * capacity / self.window)
+        self._updated = now
+        waits = [
+            (cost[name] - self._available[name]) * self.window / capacity
+            for name, capacity in self.quotas.items() if self._available[name] < cost[name]
+        ]
+        if waits:
+            return max(waits)
+        for name in self.quotas:
+            self._available[name] -= cost[name]
+        return 0.0
+    
+    async def _complete(self, request: Request):
+        body = json.loads(await request.body())
+        prompt_chars = sum(len(str(message.get("content") or "")) for message in body["messages"])
+        completion = body.get("max_completion_tokens") or body.get("max_tokens") or 0
+        wait = self._spend({"requests": 1, "tokens": prompt_chars // 4 + completion})
+        if wait:
+            self.rejected += 1
+            return JSONResponse(
+                status_code=429,
+                headers={"retry-after": f"{wait:.3f}"},
+                content={"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}}
+            )
+        
+        self.accepted += 1
+        await asyncio.sleep(self.delay)
+        return {
+            "id": f"chatcmpl-{self.accepted}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body["model"],
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": "ok"}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_chars // 4, "completion_tokens": 1, "total_tokens": prompt_chars // 4 + 1}
+        }
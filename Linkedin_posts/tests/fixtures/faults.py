@@ -0,0 +1,57 @@
+"""Switchable upstream outages, for showing how the circuit breakers behave while an upstream is down"""
+
+import time
+from tests.fixtures.stub_transcript_api import SAMPLE_SEGMENTS
+
+class Outage:
+    """Fault switch shared by the stubs of one upstream: while down, every call stalls for `stall` seconds, then fails"""
+    
+    def __init__(self, stall: float = 0.0):
+        self.down = False
+        self.stall = stall
+        self.calls = 0
+    
+    def hit(self) -> None:
+        self.calls += 1
+        if self.down:
+            time.sleep(self.stall)
+            raise ConnectionError("Injected upstream outage")
+
+class FaultySearchTool:
+    """Blocking stand-in for DuckDuckGoSearchRun on an outage switch"""
+    
+    name = "web_search"
+    
+    def __init__(self, outage: Outage):
+        self.outage = outage
+    
+    def run(self, query: str) -> str:
+        self.outage.hit()
+        return f"Trending: {query}"
+
+def make_faulty_transcript_api(outage: Outage):
+    """YouTubeTranscriptApi stand-in whose every extraction method goes through the outage switch"""
+    
+    def fetch() -> list:
+        outage.hit()
+        return list(SAMPLE_SEGMENTS)
+
+    class FaultyTranscript:
+        def fetch(self):
+            return fetch()
+
+    class FaultyTranscriptList:
+        def find_manually_created_transcript(self, languages):
+            return FaultyTranscript()
+        
+        def find_generated_transcript(self, languages):
+            return FaultyTranscript()
+
+    class FaultyTranscriptApi:
+        def __init__(self, http_client=None, proxy_config=None):
+            self.http_client = http_client
+        
+        def list(self, video_id):
+            return FaultyTranscriptList()
+    
+    return FaultyTranscriptApi
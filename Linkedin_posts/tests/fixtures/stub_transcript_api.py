@@ -0,0 +1,48 @@
+"""Local stand-in for YouTubeTranscriptApi with configurable latency and failures per method"""
+
+import random
+import time
+
+SAMPLE_SEGMENTS = [
+    {"text": "welcome to this tutorial about ai agents", "start": 0.0, "duration": 3.0},
+    {"text": "we will build a multi-agent workflow", "start": 3.0, "duration": 2.5}
+]
+
+def make_stub_api(manual=(0.0, False), generated=(0.0, False), jitter=0.0, available=("en",)):
+    """Build a stub API class; each caption track is configured as (latency_seconds, fails) and finds only the available languages"""
+    requested = []
+    
+    def behave(latency, fails, languages):
+        requested.append(list(languages))
+        time.sleep(latency + random.uniform(0, jitter))
+        if fails:
+            raise RuntimeError("Subtitles are disabled for this video")
+        if not set(languages) & set(available):
+            raise RuntimeError(f"No transcripts were found for any of the requested language codes: {languages}")
+        return list(SAMPLE_SEGMENTS)
+    
+    class StubTranscript:
+        def __init__(self, behaviour, languages):
+            self.behaviour = behaviour
+            self.languages = languages
+        
+        def fetch(self):
+            return behave(*self.behaviour, self.languages)
+    
+    class StubTranscriptList:
+        def find_manually_created_transcript(self, languages):
+            return StubTranscript(manual, languages)
+        
+        def find_generated_transcript(self, languages):
+            return StubTranscript(generated, languages)
+    
+    class StubTranscriptApi:
+        def __init__(self, http_client=None, proxy_config=None):
+            self.http_client = http_client
+        
+        def list(self, video_id):
+            return StubTranscriptList()
+    
+    # Language lists asked for by each call, for tests to inspect
+    StubTranscriptApi.requested = requested
+    return StubTranscriptApi
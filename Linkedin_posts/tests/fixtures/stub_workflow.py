@@ -0,0 +1,47 @@
+"""Workflows wired to fake LLMs and stub upstreams, for topology tests and benchmarks"""
+
+import asyncio
+import time
+from src.models.transcript import TranscriptSegments
+from tests.fixtures.fake_llm import SlowFakeChatModel
+from tests.fixtures.stub_transcript_api import SAMPLE_SEGMENTS
+from utils.helpers import create_metadata
+
+class StubSearchTool:
+    """Blocking stand-in for DuckDuckGoSearchRun"""
+    
+    name = "web_search"
+    
+    def __init__(self, delay: float):
+        self.delay = delay
+    
+    def run(self, query: str) -> str:
+        time.sleep(self.delay)
+        return f"Trending: {query}"
+
+def make_stubbed_workflow(workflow_cls, llm_delay: float = 0.0, search_delay: float = 0.0):
+    """Build a workflow whose agents call fake LLMs; every LLM call takes llm_delay seconds"""
+    workflow = workflow_cls()
+    
+    async def extract_transcript(state):
+        # One LLM round trip, as transcript cleaning would take
+        await asyncio.sleep(llm_delay)
+        segments = TranscriptSegments.from_parts(SAMPLE_SEGMENTS)
+        state['transcript'] = segments.text()
+        state['transcript_segments'] = segments
+        state['metadata'] = {
+            **state['metadata'],
+            **create_metadata("stub", len(state['transcript']), len(state['transcript']), "{}")
+        }
+        workflow.transcript_agent._add_agent_metadata(state, transcript_extracted=True)
+        return state
+    
+    workflow.transcript_agent.process = extract_transcript
+    workflow.title_agent.llm = SlowFakeChatModel(delay=llm_delay, respond=lambda prompt: "Building Multi-Agent Workflows")
+    workflow.title_agent.tools[1] = StubSearchTool(search_delay)
+    workflow.content_agent.llm = SlowFakeChatModel(delay=llm_delay, respond=lambda prompt: "Agents work best with clear roles.")
+    workflow.content_agent.summary_llm = SlowFakeChatModel(delay=llm_delay, respond=lambda prompt: "Chapter summary")
+    
+    # Nodes bind agent methods when the graph is compiled
+    workflow.workflow = workflow._build_workflow()
+    return workflow
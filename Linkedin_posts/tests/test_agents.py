@@ -1,9 +1,21 @@
 import pytest
 import asyncio
+import time
+from src.agents import transcript_agent
 from src.agents.transcript_agent import TranscriptAgent
 from src.agents.title_agent import TitleAgent
 from src.agents.content_agent import ContentAgent
+from src.cache.transcript_cache import TranscriptCache
+from src.config.settings import settings
 from src.models.state import AgentState
+from src.models.transcript import TranscriptSegments
+from src.tools import youtube_tools
+from tests.fixtures.fake_llm import SlowFakeChatModel
+from tests.fixtures.stub_transcript_api import make_stub_api
+from utils.chapters import detect_chapters
+from utils.deadline import deadline_after
+from utils.hedging import HedgedStrategyRunner
+from utils.helpers import chunk_text
 
 @pytest.fixture
 def sample_state():
@@ -38,6 +50,93 @@ class TestTranscriptAgent:
     
     # Note: Full transcript extraction test would require valid YouTube URL
     # This is a structure test to verify agent setup
+    
+    async def test_long_transcript_cleaned_in_parallel_chunks(self, monkeypatch):
+        monkeypatch.setattr(settings, "TRANSCRIPT_SINGLE_PASS_CHARS", 1000)
+        monkeypatch.setattr(settings, "TRANSCRIPT_CLEAN_CHUNK_CHARS", 500)
+        monkeypatch.setattr(settings, "TRANSCRIPT_CLEAN_CONCURRENCY", 16)
+        segments = TranscriptSegments.from_parts(
+            {"text": f"segment {i} talks about agents", "start": float(i), "duration": 1.0} for i in range(200)
+        )
+        raw = segments.text()
+        agent = TranscriptAgent()
+        agent.llm = SlowFakeChatModel(delay=0.2, respond=_cleaned_section)
+        
+        started = time.perf_counter()
+        cleaned = await agent._clean_transcript(raw, segments)
+        elapsed = time.perf_counter() - started
+        
+        chunks = chunk_text(segments.texts, 500, settings.TRANSCRIPT_CLEAN_CHUNK_OVERLAP)
+        assert len(agent.llm.calls) == len(chunks) > 10
+        assert elapsed < 0.2 * 3  # Concurrent: close to one chunk, not one per chunk
+        assert cleaned == "\n\n".join(body.upper() for _, body in chunks)
+        assert "SEGMENT 199 TALKS ABOUT AGENTS" in cleaned
+    
+    async def test_failed_chunk_falls_back_to_simple_cleaning(self, monkeypatch):
+        monkeypatch.setattr(settings, "TRANSCRIPT_SINGLE_PASS_CHARS", 50)
+        monkeypatch.setattr(settings, "TRANSCRIPT_CLEAN_CHUNK_CHARS", 35)
+        raw = "First we set up the project. Um then we add the agents. Finally we deploy it all."
+        agent = TranscriptAgent()
+        agent.llm = SlowFakeChatModel(
+            respond=_cleaned_section,
+            fail_when=lambda prompt: "add the agents" in _cleaned_section(prompt).lower()
+        )
+        
+        cleaned = await agent._clean_transcript(raw)
+        
+        assert cleaned.startswith("FIRST WE SET UP THE PROJECT.")
+        assert "then we add the agents." in cleaned
+        assert "Um" not in cleaned
+    
+    async def test_cleaning_cut_short_by_the_deadline_uses_simple_cleaning(self):
+        raw = "Um so first we set up the project. Then we add the agents."
+        agent = TranscriptAgent()
+        agent.llm = SlowFakeChatModel(delay=30.0)
+        
+        started = time.perf_counter()
+        cleaned = await agent._clean_transcript(raw, deadline=deadline_after(0.1))
+        
+        assert time.perf_counter() - started < 1.0  # The hung LLM call was cancelled, not waited out
+        assert cleaned == agent._simple_clean_transcript(raw)
+    
+    async def test_transcript_download_is_bounded_by_the_deadline(self, sample_state, monkeypatch, tmp_path):
+        slow = (2.0, False)
+        monkeypatch.setattr(youtube_tools, "YouTubeTranscriptApi", make_stub_api(manual=slow, generated=slow))
+        monkeypatch.setattr(youtube_tools, "_strategy_runner", HedgedStrategyRunner(hedge_delay=None, max_workers=1))
+        cache = TranscriptCache(str(tmp_path / "t.db"), ttl_seconds=60, max_bytes=1024, max_memory_entries=1, enabled=False)
+        monkeypatch.setattr(youtube_tools, "transcript_cache", cache)
+        monkeypatch.setattr(transcript_agent, "transcript_cache", cache)
+        state = {**sample_state, 'youtube_url': "https://www.youtube.com/watch?v=dQw4w9WgXcQ", 'deadline': deadline_after(0.2)}
+        
+        started = time.perf_counter()
+        result = await TranscriptAgent().process(state)
+        
+        assert time.perf_counter() - started < 1.0
+        assert "timed out" in result['error']
+        assert result['transcript'] == ""
+
+def _cleaned_section(prompt: str) -> str:
+    """Fake cleaning that upper-cases just the section being cleaned"""
+    return prompt.split("Transcript Section:")[1].split("Please:")[0].strip().upper()
+
+class TestTranscriptChunking:
+    
+    def test_chunks_keep_every_unit_in_order(self):
+        units = [f"sentence number {i}." for i in range(100)]
+        chunks = chunk_text(units, 120, overlap_chars=30)
+        
+        assert all(len(body) <= 120 for _, body in chunks)
+        assert " ".join(body for _, body in chunks) == " ".join(units)
+        assert chunks[0][0] == ""
+        assert all(chunks[i - 1][1].endswith(context) for i, (context, _) in enumerate(chunks) if i)
+    
+    def test_unpunctuated_text_is_split_on_words(self):
+        text = " ".join(["word"] * 500)
+        chunks = chunk_text([text], 100)
+        
+        assert len(chunks) > 1
+        assert all(len(body) <= 100 for _, body in chunks)
+        assert " ".join(body for _, body in chunks) == text
 
 @pytest.mark.asyncio  
 class TestTitleAgent:
@@ -63,4 +162,79 @@ class TestContentAgent:
         agent = ContentAgent()
         assert len(agent.tools) == 2
         assert agent.tools[0].name == "content_structurer"
-        assert agent.tools[1].name == "seo_analyzer"
\ No newline at end of file
+        assert agent.tools[1].name == "seo_analyzer"
+    
+    async def test_long_transcript_summarized_by_chapter_in_parallel(self, monkeypatch):
+        monkeypatch.setattr(settings, "CONTENT_CHAPTER_CHARS", 2000)
+        monkeypatch.setattr(settings, "CONTENT_SUMMARY_CONCURRENCY", 8)
+        segments = _three_topic_segments()
+        agent = ContentAgent()
+        agent.summary_llm = SlowFakeChatModel(delay=0.2, respond=lambda prompt: "chapter summary")
+        
+        started = time.perf_counter()
+        summaries = await agent._summarize_chapters(segments.text(), segments, "Building agents")
+        elapsed = time.perf_counter() - started
+        
+        assert len(summaries) == len(agent.summary_llm.calls) >= 3
+        assert elapsed < 0.2 * 2
+        assert summaries[0].startswith(f"Chapter 1 of {len(summaries)} (0:00-")
+        assert all(summary.endswith("chapter summary") for summary in summaries)
+    
+    async def test_final_post_is_written_from_chapter_summaries(self):
+        agent = ContentAgent()
+        agent.llm = SlowFakeChatModel(respond=lambda prompt: "Final post")
+        summaries = ["Chapter 1 of 2:\nagents plan", "Chapter 2 of 2:\ntools execute"]
+        transcript = "raw transcript words " * 5000
+        
+        content = await agent._generate_base_content(transcript, "Title", "linkedin", summaries)
+        
+        assert content == "Final post"
+        assert "Chapter 2 of 2:\ntools execute" in agent.llm.calls[0]
+        assert "raw transcript words" not in agent.llm.calls[0]
+    
+    async def test_tool_results_stay_typed_until_the_prompt(self, sample_state):
+        agent = ContentAgent()
+        agent.llm = SlowFakeChatModel(respond=lambda prompt: "Agents plan tasks and call tools. #AI")
+        sample_state.update(transcript="Agents plan tasks and call tools.", title="Agents")
+        
+        state = await agent.process(sample_state)
+        
+        structure = agent.tools[0].analyze("Agents plan tasks and call tools. #AI", "linkedin")
+        assert state['error'] == ""
+        assert state['seo_analysis'] == agent.tools[1].analyze("Agents plan tasks and call tools. #AI").data
+        # Only the enhancement prompt sees the rendered structure analysis
+        assert structure.text in agent.llm.calls[1]
+        assert state['metadata']['agent_history'][-1]['structure_analysis'].startswith("Structure Analysis: {")
+
+def _three_topic_segments() -> TranscriptSegments:
+    topics = [
+        "agents plan with tools memory and retrieval",
+        "gpu training needs batches gradients and optimizers",
+        "pricing depends on customers revenue and market growth"
+    ]
+    parts = []
+    for topic_index, topic in enumerate(topics):
+        for _ in range(60):
+            # A long pause before each new topic
+            start = len(parts) * 3.0 + topic_index * 5.0
+            parts.append({"text": topic, "start": start, "duration": 3.0})
+    return TranscriptSegments.from_parts(parts)
+
+class TestChapterDetection:
+    
+    def test_chapters_cover_all_units_in_order(self):
+        units = [f"sentence {i} about topic {i // 20}." for i in range(200)]
+        chapters = detect_chapters(units, 1000)
+        
+        assert chapters[0][0] == 0 and chapters[-1][1] == len(units)
+        assert all(previous[1] == current[0] for previous, current in zip(chapters, chapters[1:]))
+    
+    def test_cuts_land_on_topic_shifts(self):
+        segments = _three_topic_segments()
+        chapters = detect_chapters(segments.texts, 2500, segments.starts, segments.durations)
+        
+        assert [first for first, _ in chapters[1:]] == [60, 120]
+    
+    def test_short_input_is_one_chapter(self):
+        assert detect_chapters(["just one short sentence."], 1000) == [(0, 1)]
+        assert detect_chapters([], 1000) == []
@@ -0,0 +1,273 @@
+import asyncio
+import json
+import time
+import pytest
+from fastapi.testclient import TestClient
+from api.main import app
+from api.routes import health, workflow as workflow_routes
+from src.cache.result_cache import WorkflowResultCache
+from src.config.settings import settings
+from src.workflows.youtube_workflow import YouTubeWorkflow
+from tests.fixtures.stub_workflow import make_stubbed_workflow
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "JOB_STORE_PATH", str(tmp_path / "jobs.db"))
+    monkeypatch.setattr(workflow_routes, "result_cache", WorkflowResultCache(
+        str(tmp_path / "results.db"), ttl_seconds=3600, max_bytes=1024 * 1024, max_memory_entries=8, idempotency_ttl_seconds=3600
+    ))
+    with TestClient(app) as client:
+        yield client
+
+class TestHealthEndpoints:
+    
+    def test_health_uses_shared_workflow(self, client):
+        workflow = app.state.registry.get()
+        
+        response = client.get("/health")
+        assert response.status_code == 200
+        assert response.json()["tools_loaded"]["transcript_tools"] == 2
+        
+        client.get("/health")
+        assert app.state.registry.get() is workflow
+    
+    def test_readiness_results_are_cached(self, client, monkeypatch):
+        probe_calls = []
+        
+        async def fake_probe(client, name, url):
+            probe_calls.append(name)
+            return name, {"reachable": True, "status_code": 200, "latency_ms": 1.0}
+        
+        monkeypatch.setattr(health, "_probe_upstream", fake_probe)
+        monkeypatch.setitem(health._readiness_cache, "checks", None)
+        
+        first = client.get("/health/ready").json()
+        second = client.get("/health/ready").json()
+        
+        assert first["status"] == "ready"
+        assert first["cached"] is False
+        assert second["cached"] is True
+        assert len(probe_calls) == len(health.UPSTREAM_PROBES)
+    
+    def test_tools_endpoint(self, client):
+        response = client.get("/tools")
+        assert response.status_code == 200
+        assert len(response.json()["title_agent_tools"]) == 2
+    
+    def test_metrics_report_circuit_breakers(self, client):
+        app.state.registry.get()
+        
+        breakers = client.get("/metrics").json()["circuit_breakers"]
+        
+        assert {"openai", "trend_search", "youtube_transcripts"} <= set(breakers)
+        assert breakers["trend_search"]["state"] == "closed"
+        assert breakers["trend_search"]["enabled"] == settings.CIRCUIT_BREAKER_ENABLED
+
+class TestStreamingEndpoints:
+    
+    URLS = [f"https://www.youtube.com/watch?v=video{index:06d}" for index in range(25)]
+    
+    @pytest.fixture
+    def stream_client(self, client, monkeypatch):
+        workflow = app.state.registry.get()
+        
+        async def process(url, output_format="linkedin", language="en"):
+            return {'title': url[-11:], 'content': output_format, 'metadata': {'language': language}}
+        
+        monkeypatch.setattr(workflow, "process_youtube_video", process)
+        return client
+    
+    def test_json_request_streams_ndjson(self, stream_client):
+        with stream_client.stream("POST", "/workflow/process-stream", json={"urls": self.URLS, "output_format": "blog"}) as response:
+            assert response.headers["content-type"].startswith("application/x-ndjson")
+            records = [json.loads(line) for line in response.iter_lines() if line]
+        
+        results = [record for record in records if record['type'] == 'result']
+        assert sorted(record['url'] for record in results) == self.URLS
+        assert results[0]['result']['content'] == "blog"
+        assert records[-1] == {**records[-1], 'type': 'summary', 'success_count': 25, 'error_count': 0}
+    
+    def test_uploaded_file_streams_each_line(self, stream_client):
+        body = "url\n" + "\n".join(self.URLS[:5]) + "\n\n# skipped\nnot-a-url"
+        response = stream_client.post(
+            "/workflow/process-stream/upload",
+            files={"file": ("urls.csv", body.encode(), "text/csv")},
+            data={"language": "es"}
+        )
+        records = [json.loads(line) for line in response.text.splitlines()]
+        
+        assert response.status_code == 200
+        assert len(records) == 7
+        assert records[-1]['error_count'] == 1
+        assert all(record['result']['metadata']['language'] == "es" for record in records[:-1] if record['success'])
+    
+    def test_rejects_unknown_format(self, stream_client):
+        response = stream_client.post(
+            "/workflow/process-stream/upload",
+            files={"file": ("urls.txt", self.URLS[0].encode(), "text/plain")},
+            data={"output_format": "tiktok"}
+        )
+        assert response.status_code == 422
+
+class TestLinkedInPostStream:
+    
+    URL = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+    
+    def parse(self, body):
+        events = []
+        for frame in body.strip().split("\n\n"):
+            fields = dict(line.split(": ", 1) for line in frame.splitlines())
+            events.append((fields['event'], json.loads(fields['data'])))
+        return events
+    
+    def test_streams_stages_then_linkedin_result(self, client, monkeypatch):
+        stub = make_stubbed_workflow(YouTubeWorkflow)
+        monkeypatch.setattr(app.state.registry, "get", lambda name=None: stub)
+        
+        response = client.post("/workflow/linkedin-post/stream", json={"url": self.URL})
+        events = self.parse(response.text)
+        
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert events[0][0] == "started"
+        assert [data['stage'] for name, data in events if name == "stage_completed"] == ["transcript_agent", "title_agent", "content_agent"]
+        assert events[-1][0] == "result"
+        assert events[-1][1]['metadata']['linkedin_optimized'] is True
+    
+    def test_get_variant_validates_url(self, client):
+        assert client.get("/workflow/linkedin-post/stream", params={"url": "https://example.com"}).status_code == 400
+    
+    def test_first_frame_is_sent_before_any_work(self):
+        stub = make_stubbed_workflow(YouTubeWorkflow, llm_delay=0.3)
+        
+        async def first_frame():
+            frames = workflow_routes._linkedin_post_events(stub, self.URL, "en")
+            started = time.perf_counter()
+            frame = await frames.__anext__()
+            elapsed = time.perf_counter() - started
+            await frames.aclose()
+            return frame, elapsed
+        
+        frame, elapsed = asyncio.run(first_frame())
+        
+        assert frame.startswith("event: started")
+        assert elapsed < 0.1
+
+class TestMultiFormatEndpoint:
+    
+    URL = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+    
+    def test_returns_every_variant_in_one_response(self, client, monkeypatch):
+        stub = make_stubbed_workflow(YouTubeWorkflow)
+        monkeypatch.setattr(app.state.registry, "get", lambda name=None: stub)
+        
+        response = client.post("/workflow/process-formats", json={"url": self.URL, "output_formats": ["linkedin", "twitter"]})
+        body = response.json()
+        
+        assert response.status_code == 200
+        assert list(body['variants']) == ["linkedin", "twitter"]
+        assert all(variant['success'] and variant['duration_seconds'] >= 0 for variant in body['variants'].values())
+        assert body['metadata']['output_formats'] == ["linkedin", "twitter"]
+    
+    def test_rejects_unknown_or_empty_formats(self, client):
+        assert client.post("/workflow/process-formats", json={"url": self.URL, "output_formats": ["tiktok"]}).status_code == 422
+        assert client.post("/workflow/process-formats", json={"url": self.URL, "output_formats": []}).status_code == 422
+
+class TestResultCaching:
+    
+    @pytest.fixture
+    def calls(self, client, monkeypatch):
+        calls = []
+        workflow = app.state.registry.get()
+        
+        async def process(url, output_format="linkedin", language="en", bypass_cache=False):
+            calls.append(url)
+            return {'transcript': "transcript", 'title': "Agents", 'content': "Agents work best with clear roles. #AI", 'metadata': {}, 'seo_analysis': None}
+        
+        monkeypatch.setattr(workflow, "process_youtube_video", process)
+        return calls
+    
+    def test_post_and_preview_share_one_generation(self, client, calls):
+        post = client.post("/workflow/linkedin-post", json={"url": "https://youtu.be/dQw4w9WgXcQ"})
+        preview = client.get("/workflow/linkedin-preview", params={"url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ"})
+        
+        assert post.status_code == preview.status_code == 200
+        assert len(calls) == 1
+        assert post.json()['metadata']['result_cache']['status'] == "miss"
+        assert preview.json()['original_title'] == "Agents"
+    
+    def test_idempotency_key_replays_and_conflicts(self, client, calls):
+        headers = {"Idempotency-Key": "retry-7"}
+        first = client.post("/workflow/process-video", json={"url": "https://youtu.be/dQw4w9WgXcQ"}, headers=headers)
+        retry = client.post("/workflow/process-video", json={"url": "https://youtu.be/dQw4w9WgXcQ", "bypass_cache": True}, headers=headers)
+        other = client.post("/workflow/process-video", json={"url": "https://youtu.be/dQw4w9WgXcQ", "output_format": "blog"}, headers=headers)
+        
+        assert len(calls) == 1
+        assert retry.json()['metadata']['result_cache']['status'] == "replayed"
+        assert retry.json()['content'] == first.json()['content']
+        assert other.status_code == 422
+
+class TestRateLimiting:
+    
+    @pytest.fixture
+    def limited_client(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "RATE_LIMIT_PER_MINUTE", 3)
+        monkeypatch.setattr(settings, "RATE_LIMIT_BACKEND", "memory")
+        monkeypatch.setattr(settings, "JOB_STORE_PATH", str(tmp_path / "jobs.db"))
+        monkeypatch.setattr(workflow_routes, "result_cache", WorkflowResultCache(
+            str(tmp_path / "results.db"), ttl_seconds=3600, max_bytes=1024 * 1024, max_memory_entries=8, idempotency_ttl_seconds=3600
+        ))
+        with TestClient(app) as client:
+            yield client
+    
+    def test_empty_bucket_answers_429_with_retry_after(self, limited_client):
+        responses = [limited_client.get("/workflow/supported-platforms") for _ in range(4)]
+        
+        assert [r.status_code for r in responses] == [200, 200, 200, 429]
+        assert responses[0].headers["X-RateLimit-Remaining"] == "2"
+        assert int(responses[-1].headers["Retry-After"]) == 20
+        assert "Rate limit exceeded" in responses[-1].json()["detail"]
+    
+    def test_api_keys_are_limited_separately_from_addresses(self, limited_client, monkeypatch):
+        monkeypatch.setattr(settings, "RATE_LIMIT_API_KEYS", ["team-a", "team-b"])
+        for _ in range(3):
+            limited_client.get("/workflow/supported-platforms")
+        
+        assert limited_client.get("/workflow/supported-platforms").status_code == 429
+        assert limited_client.get("/workflow/supported-platforms", headers={"X-API-Key": "team-a"}).status_code == 200
+        assert limited_client.get("/workflow/supported-platforms", headers={"Authorization": "Bearer team-b"}).status_code == 200
+    
+    def test_rotating_unknown_api_keys_does_not_reset_the_limit(self, limited_client, monkeypatch):
+        monkeypatch.setattr(settings, "RATE_LIMIT_API_KEYS", ["team-a"])
+        statuses = [
+            limited_client.get("/workflow/supported-platforms", headers={"X-API-Key": f"forged-{attempt}"}).status_code
+            for attempt in range(4)
+        ]
+        
+        assert statuses == [200, 200, 200, 429]
+        assert limited_client.get("/workflow/supported-platforms", headers={"Authorization": "Bearer forged-9"}).status_code == 429
+    
+    def test_health_and_metrics_are_exempt(self, limited_client):
+        for _ in range(3):
+            limited_client.get("/workflow/supported-platforms")
+        
+        assert limited_client.get("/health").status_code == 200
+        metrics = limited_client.get("/metrics").json()["rate_limiter"]
+        assert metrics["allowed"] == 3
+        assert metrics["limits"] == {"per_60s": 3, "per_3600s": settings.RATE_LIMIT_PER_HOUR}
+    
+    def test_limited_requests_never_reach_the_workflow(self, limited_client, monkeypatch):
+        calls = []
+        workflow = app.state.registry.get()
+        
+        async def process(url, output_format="linkedin", language="en", bypass_cache=False):
+            calls.append(url)
+            return {'transcript': "t", 'title': "Agents", 'content': "Agents. #AI", 'metadata': {}, 'seo_analysis': None}
+        
+        monkeypatch.setattr(workflow, "process_youtube_video", process)
+        statuses = [
+            limited_client.post("/workflow/process-video", json={"url": "https://youtu.be/dQw4w9WgXcQ", "bypass_cache": True}).status_code
+            for _ in range(5)
+        ]
+        
+        assert statuses == [200, 200, 200, 429, 429]
+        assert len(calls) == 3
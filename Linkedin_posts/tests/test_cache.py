@@ -0,0 +1,249 @@
+import asyncio
+import pytest
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import PromptTemplate
+from src.cache.llm_cache import LLMResponseCache
+from src.cache.result_cache import WorkflowResultCache
+from src.cache.store import SQLiteBlobStore
+from src.cache.transcript_cache import TranscriptCache
+from src.workflows.youtube_workflow import YouTubeWorkflow
+from tests.fixtures.fake_llm import SlowFakeChatModel
+from tests.fixtures.stub_workflow import make_stubbed_workflow
+from utils.exceptions import IdempotencyConflictError
+
+SEGMENTS = {
+    "texts": ["welcome to the video", "today we talk about agents"],
+    "starts": [0.0, 2.5],
+    "durations": [2.5, 3.0]
+}
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "transcripts.db")
+
+def make_cache(path, **overrides):
+    options = {"ttl_seconds": 3600, "max_bytes": 10 * 1024 * 1024, "max_memory_entries": 8}
+    options.update(overrides)
+    return TranscriptCache(path, **options)
+
+class TestTranscriptCache:
+    
+    def test_memory_then_disk_hits(self, cache_path):
+        cache = make_cache(cache_path)
+        assert cache.get_segments("abc123def45", "en") is None
+        
+        cache.set_segments("abc123def45", "en", SEGMENTS)
+        assert cache.get_segments("abc123def45", "en") == SEGMENTS
+        
+        # A fresh instance only has the on-disk copy
+        restarted = make_cache(cache_path)
+        assert restarted.get_segments("abc123def45", "en") == SEGMENTS
+        assert restarted.get_segments("abc123def45", "en") == SEGMENTS
+        
+        stats = restarted.stats()["segments"]
+        assert stats["disk_hits"] == 1
+        assert stats["memory_hits"] == 1
+        assert cache.stats()["segments"]["misses"] == 1
+    
+    def test_cleaned_text_keyed_by_language_and_cleaner_version(self, cache_path):
+        cache = make_cache(cache_path)
+        cache.set_cleaned("abc123def45", "en", "1:gpt-4", {"text": "clean", "raw_length": 10})
+        
+        assert cache.get_cleaned("abc123def45", "en", "1:gpt-4")["text"] == "clean"
+        assert cache.get_cleaned("abc123def45", "es", "1:gpt-4") is None
+        assert cache.get_cleaned("abc123def45", "en", "2:gpt-4") is None
+    
+    def test_expired_entries_are_misses(self, cache_path):
+        cache = make_cache(cache_path, ttl_seconds=0)
+        cache.set_segments("abc123def45", "en", SEGMENTS)
+        
+        # The same instance, so the memory tier is checked too
+        assert cache.get_segments("abc123def45", "en") is None
+        assert make_cache(cache_path).get_segments("abc123def45", "en") is None
+    
+    def test_disabled_cache_never_stores(self, cache_path):
+        cache = make_cache(cache_path, enabled=False)
+        cache.set_segments("abc123def45", "en", SEGMENTS)
+        assert cache.get_segments("abc123def45", "en") is None
+
+class TestSQLiteBlobStore:
+    
+    def test_size_eviction_drops_least_recently_used(self, tmp_path):
+        store = SQLiteBlobStore(str(tmp_path / "blobs.db"), "blobs", ttl_seconds=3600, max_bytes=600)
+        payload = bytes(range(256))  # Incompressible enough to keep ~256 bytes per entry
+        
+        store.set("first", payload)
+        store.set("second", payload)
+        store.get("first")
+        store.set("third", payload)
+        
+        assert store.get("second") is None
+        assert store.get("first") == payload
+        assert store.get("third") == payload
+        assert store.size_bytes() <= 600
+
+class TestLLMResponseCache:
+    
+    @pytest.fixture
+    def llm_cache(self, tmp_path):
+        return LLMResponseCache(str(tmp_path / "llm.db"), ttl_seconds=3600, max_bytes=1024 * 1024)
+    
+    def make_chain(self, llm_cache, **overrides):
+        model = SlowFakeChatModel(respond=lambda prompt: f"answer to {prompt}", calls=[], cache=llm_cache)
+        llm = model.bind(**overrides) if overrides else model
+        return model, PromptTemplate.from_template("Title for {topic}") | llm | StrOutputParser()
+    
+    @pytest.mark.asyncio
+    async def test_identical_prompts_hit_and_report_usage(self, llm_cache):
+        model, chain = self.make_chain(llm_cache)
+        
+        with llm_cache.track() as usage:
+            first = await chain.ainvoke({"topic": "agents"})
+            second = await chain.ainvoke({"topic": "agents"})
+            await chain.ainvoke({"topic": "retrieval"})
+        
+        assert first == second == "answer to Title for agents"
+        assert len(model.calls) == 2
+        assert usage == {"hits": 1, "misses": 2, "bypassed": False}
+        assert llm_cache.stats()["hit_rate"] == round(1 / 3, 3)
+    
+    @pytest.mark.asyncio
+    async def test_call_parameters_are_part_of_the_key(self, llm_cache):
+        model, chain = self.make_chain(llm_cache)
+        _, warm_chain = self.make_chain(llm_cache, temperature=0.9)
+        
+        await chain.ainvoke({"topic": "agents"})
+        await warm_chain.ainvoke({"topic": "agents"})
+        
+        assert llm_cache.stats()["hits"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_bypass_refreshes_the_stored_answer(self, llm_cache):
+        model, chain = self.make_chain(llm_cache)
+        await chain.ainvoke({"topic": "agents"})
+        
+        with llm_cache.track(bypass=True) as usage:
+            await chain.ainvoke({"topic": "agents"})
+        await chain.ainvoke({"topic": "agents"})
+        
+        assert len(model.calls) == 2
+        assert usage["hits"] == 0 and usage["bypassed"] is True
+        assert llm_cache.stats()["hits"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_expired_entries_miss(self, tmp_path):
+        expiring = LLMResponseCache(str(tmp_path / "llm.db"), ttl_seconds=0, max_bytes=1024 * 1024)
+        model, chain = self.make_chain(expiring)
+        
+        await chain.ainvoke({"topic": "agents"})
+        await chain.ainvoke({"topic": "agents"})
+        
+        assert len(model.calls) == 2
+    
+    @pytest.mark.asyncio
+    async def test_workflow_reports_hits_in_metadata(self, llm_cache):
+        workflow = make_stubbed_workflow(YouTubeWorkflow)
+        for llm in (workflow.title_agent.llm, workflow.content_agent.llm):
+            llm.cache = llm_cache
+        url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+        
+        first = await workflow.process_youtube_video(url)
+        second = await workflow.process_youtube_video(url)
+        fresh = await workflow.process_youtube_video(url, bypass_cache=True)
+        
+        assert first['metadata']['llm_cache']['hits'] == 0
+        assert second['metadata']['llm_cache']['hits'] == first['metadata']['llm_cache']['misses']
+        assert second['content'] == first['content']
+        assert fresh['metadata']['llm_cache'] == {**first['metadata']['llm_cache'], 'bypassed': True}
+
+def make_result(content="A post about agents"):
+    return {'transcript': "transcript", 'title': "Title", 'content': content, 'metadata': {}, 'seo_analysis': None}
+
+@pytest.mark.asyncio
+class TestWorkflowResultCache:
+    
+    @pytest.fixture
+    def results(self, tmp_path):
+        return WorkflowResultCache(str(tmp_path / "results.db"), ttl_seconds=3600, max_bytes=1024 * 1024, max_memory_entries=8, idempotency_ttl_seconds=3600)
+    
+    def fixed(self, result):
+        async def generate():
+            return result
+        return generate
+    
+    async def test_concurrent_requests_share_one_generation(self, results):
+        calls = []
+        
+        async def generate():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return make_result()
+        
+        key = WorkflowResultCache.key("abc123def45", "linkedin", "en", "2.0.0")
+        outcomes = await asyncio.gather(*(results.get_or_generate(key, generate) for _ in range(5)))
+        again = await results.get_or_generate(key, generate)
+        
+        assert len(calls) == 1
+        statuses = sorted(outcome['metadata']['result_cache']['status'] for outcome in outcomes)
+        assert statuses == ["coalesced"] * 4 + ["miss"]
+        assert again['metadata']['result_cache']['status'] == "hit"
+        assert results.stats()['in_flight'] == 0
+    
+    async def test_results_are_private_copies(self, results):
+        key = WorkflowResultCache.key("abc123def45", "linkedin", "en", "2.0.0")
+        first = await results.get_or_generate(key, self.fixed(make_result()))
+        first['metadata']['linkedin_optimized'] = True
+        
+        second = await results.get_or_generate(key, self.fixed(make_result()))
+        
+        assert 'linkedin_optimized' not in second['metadata']
+    
+    async def test_bypass_and_expiry_regenerate(self, tmp_path):
+        results = WorkflowResultCache(str(tmp_path / "results.db"), ttl_seconds=0, max_bytes=1024 * 1024, max_memory_entries=8, idempotency_ttl_seconds=3600)
+        key = WorkflowResultCache.key("abc123def45", "linkedin", "en", "2.0.0")
+        
+        await results.get_or_generate(key, self.fixed(make_result("old")))
+        expired = await results.get_or_generate(key, self.fixed(make_result("new")))
+        fresh = await results.get_or_generate(key, self.fixed(make_result("fresh")), bypass=True)
+        
+        assert expired['content'] == "new"
+        assert fresh['metadata']['result_cache']['status'] == "bypassed"
+    
+    async def test_idempotency_key_replays_and_rejects_other_requests(self, results):
+        key = WorkflowResultCache.key("abc123def45", "linkedin", "en", "2.0.0")
+        other = WorkflowResultCache.key("abc123def45", "blog", "en", "2.0.0")
+        
+        first = await results.get_or_generate(key, self.fixed(make_result("first")), idempotency_key="retry-1")
+        replay = await results.get_or_generate(key, self.fixed(make_result("second")), bypass=True, idempotency_key="retry-1")
+        
+        assert replay['content'] == first['content'] == "first"
+        assert replay['metadata']['result_cache']['status'] == "replayed"
+        with pytest.raises(IdempotencyConflictError):
+            await results.get_or_generate(other, self.fixed(make_result()), idempotency_key="retry-1")
+    
+    async def test_results_cut_short_by_a_deadline_are_not_stored(self, results):
+        key = WorkflowResultCache.key("abc123def45", "linkedin", "en", "2.0.0")
+        partial = make_result("")
+        partial['metadata']['deadline_exceeded'] = True
+        
+        first = await results.get_or_generate(key, self.fixed(partial))
+        second = await results.get_or_generate(key, self.fixed(make_result()))
+        
+        assert first['content'] == ""
+        assert second['metadata']['result_cache']['status'] == "miss"
+        assert second['content'] == "A post about agents"
+    
+    async def test_cancelled_caller_does_not_cancel_generation(self, results):
+        key = WorkflowResultCache.key("abc123def45", "linkedin", "en", "2.0.0")
+        
+        async def generate():
+            await asyncio.sleep(0.05)
+            return make_result()
+        
+        leader = asyncio.create_task(results.get_or_generate(key, generate))
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(results.get_or_generate(key, generate))
+        await asyncio.sleep(0)
+        leader.cancel()
+        
+        assert (await follower)['metadata']['result_cache']['status'] == "coalesced"
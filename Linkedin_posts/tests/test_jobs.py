@@ -0,0 +1,271 @@
+import asyncio
+import json
+import sqlite3
+import time
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from api.main import app
+from src.config.settings import settings
+from src.jobs.manager import JobManager
+from src.jobs.store import JobStore
+
+URLS = [f"https://www.youtube.com/watch?v=video{index:06d}" for index in range(6)]
+
+class FakeWorkflow:
+    """Records calls; URLs containing 'broken' fail like a video without transcripts"""
+    
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.peak = 0
+    
+    async def process_youtube_video(self, youtube_url, output_format="linkedin", language="en"):
+        self.calls.append(youtube_url)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        if "broken" in youtube_url:
+            raise HTTPException(status_code=400, detail="Transcripts are disabled")
+        return {
+            'transcript': "transcript " * 100,
+            'title': f"Title for {youtube_url[-11:]}",
+            'content': "Agents work best with clear roles. #AI",
+            'metadata': {'language': language},
+            'seo_analysis': None
+        }
+
+class FakeRegistry:
+    def __init__(self, workflow):
+        self.workflow = workflow
+    
+    def get(self, name=None):
+        return self.workflow
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(str(tmp_path / "jobs.db"))
+
+class TestJobStore:
+    
+    def test_results_round_trip_in_input_order(self, store):
+        job_id = store.create_job(URLS[:3], {'output_format': 'linkedin'})
+        store.finish_item(job_id, 2, result={'title': 'Third'}, duration_seconds=1.5)
+        store.finish_item(job_id, 0, error="Failed to process")
+        
+        items = store.get_items(job_id)
+        
+        assert [item['status'] for item in items] == ['failed', 'pending', 'done']
+        assert items[2]['result'] == {'title': 'Third'}
+        assert store.get_job(job_id)['counts'] == {'done': 1, 'failed': 1, 'pending': 1}
+    
+    def test_interrupted_items_are_requeued(self, store):
+        job_id = store.create_job(URLS[:2], {})
+        store.mark_item_running(job_id, 0)
+        
+        assert store.requeue_interrupted() == 1
+        assert [item['index'] for item in store.pending_items(job_id)] == [0, 1]
+    
+    def test_items_with_live_leases_are_not_requeued(self, store):
+        job_id = store.create_job(URLS[:2], {})
+        store.mark_item_running(job_id, 0, owner="alive", lease_expires=time.time() + 60)
+        store.mark_item_running(job_id, 1, owner="dead", lease_expires=time.time() - 1)
+        
+        assert store.requeue_interrupted() == 1
+        assert [item['index'] for item in store.pending_items(job_id)] == [1]
+    
+    def test_only_one_worker_claims_an_orphaned_job(self, store):
+        job_id = store.create_job(URLS[:1], {}, owner="dead", lease_expires=time.time() - 1)
+        
+        assert store.orphaned_jobs() == [job_id]
+        assert store.claim_job(job_id, "first", time.time() + 60) is True
+        assert store.claim_job(job_id, "second", time.time() + 60) is False
+        assert store.orphaned_jobs() == []
+    
+    def test_events_after_sequence(self, store):
+        job_id = store.create_job(URLS[:1], {})
+        first = store.add_event(job_id, "job_queued", {'total': 1})
+        store.add_event(job_id, "item_started", {'index': 0})
+        
+        assert [event['type'] for event in store.get_events(job_id, first)] == ["item_started"]
+    
+    def test_active_jobs_are_queued_or_running(self, store, monkeypatch):
+        queued, running, done = (store.create_job(URLS[:1], {}) for _ in range(3))
+        store.set_job_status(running, "running")
+        store.set_job_status(done, "completed")
+        
+        assert set(store.active_jobs()) == {queued, running}
+        # A single active status still makes a valid IN clause
+        monkeypatch.setattr("src.jobs.store.JOB_ACTIVE_STATUSES", ("running",))
+        assert store.active_jobs() == [running]
+
+@pytest.mark.asyncio
+class TestJobManager:
+    
+    async def test_job_processes_items_concurrently_with_cap(self, store):
+        workflow = FakeWorkflow(delay=0.02)
+        manager = JobManager(store, FakeRegistry(workflow), max_workers=2)
+        await manager.start()
+        urls = URLS[:4] + ["https://www.youtube.com/watch?v=broken00000", "https://youtu.be/video000000"]
+        
+        job_id = await manager.submit(urls, language="fr", linkedin=True)
+        await manager.wait(job_id)
+        
+        job = store.get_job(job_id)
+        items = store.get_items(job_id)
+        assert job['status'] == "completed"
+        assert workflow.peak == 2
+        assert len(workflow.calls) == 5  # The youtu.be duplicate reuses video000000's result
+        assert [item['status'] for item in items] == ['done'] * 4 + ['failed', 'done']
+        assert items[5]['result']['title'] == items[0]['result']['title']
+        assert items[0]['result']['metadata']['linkedin_optimized'] is True
+        assert items[0]['result']['metadata']['language'] == "fr"
+        assert "Transcripts are disabled" in items[4]['error']
+        
+        events = [event['type'] for event in store.get_events(job_id)]
+        assert events[0] == "job_queued" and events[-1] == "job_completed"
+        assert events.count("item_completed") == 5
+    
+    async def test_unfinished_job_resumes_after_restart(self, store, tmp_path):
+        workflow = FakeWorkflow(delay=0.05)
+        manager = JobManager(store, FakeRegistry(workflow), max_workers=1)
+        await manager.start()
+        job_id = await manager.submit(URLS[:4])
+        
+        # Stop the worker part-way through, as a crash or deploy would
+        while store.get_job(job_id)['counts'].get('done', 0) < 1:
+            await asyncio.sleep(0.01)
+        await manager.stop()
+        finished_before = [item['url'] for item in store.get_items(job_id) if item['status'] == 'done']
+        assert store.get_job(job_id)['status'] == "running"
+        
+        restarted_workflow = FakeWorkflow()
+        restarted = JobManager(JobStore(store.path), FakeRegistry(restarted_workflow), max_workers=1)
+        assert await restarted.start() == [job_id]
+        await restarted.wait(job_id)
+        
+        assert restarted.store.get_job(job_id)['status'] == "completed"
+        assert all(item['status'] == 'done' for item in restarted.store.get_items(job_id))
+        assert not set(finished_before) & set(restarted_workflow.calls)
+        assert len(finished_before) + len(restarted_workflow.calls) == 4
+    
+    async def test_workers_sharing_a_store_leave_each_others_jobs_alone(self, store):
+        workflow = FakeWorkflow(delay=0.05)
+        first = JobManager(store, FakeRegistry(workflow), max_workers=1, lease_seconds=0.3)
+        await first.start()
+        job_id = await first.submit(URLS[:4])
+        while store.get_job(job_id)['counts'].get('running', 0) < 1:
+            await asyncio.sleep(0.01)
+        
+        # A second process starting up, then running through several heartbeats
+        other_workflow = FakeWorkflow()
+        second = JobManager(JobStore(store.path), FakeRegistry(other_workflow), max_workers=1, lease_seconds=0.3)
+        assert await second.start() == []
+        await first.wait(job_id)
+        await second.stop()
+        await first.stop()
+        
+        assert store.get_job(job_id)['status'] == "completed"
+        assert other_workflow.calls == []
+        assert sorted(workflow.calls) == URLS[:4]
+    
+    async def test_jobs_of_a_worker_that_died_are_taken_over(self, store):
+        workflow = FakeWorkflow(delay=0.05)
+        crashed = JobManager(store, FakeRegistry(workflow), max_workers=1, lease_seconds=0.3)
+        await crashed.start()
+        job_id = await crashed.submit(URLS[:4])
+        while store.get_job(job_id)['counts'].get('done', 0) < 1:
+            await asyncio.sleep(0.01)
+        # Die without releasing leases, as a killed process would
+        for task in [crashed._heartbeat, *crashed._tasks.values()]:
+            task.cancel()
+        await asyncio.sleep(0)
+        
+        survivor_workflow = FakeWorkflow()
+        survivor = JobManager(JobStore(store.path), FakeRegistry(survivor_workflow), max_workers=1, lease_seconds=0.3)
+        assert await survivor.start() == []  # The dead worker's lease hasn't run out yet
+        for _ in range(100):
+            if store.get_job(job_id)['status'] == "completed":
+                break
+            await asyncio.sleep(0.02)
+        await survivor.stop()
+        
+        assert store.get_job(job_id)['status'] == "completed"
+        assert len(set(workflow.calls) | set(survivor_workflow.calls)) == 4
+        assert store.get_events(job_id)[-1]['type'] == "job_completed"
+    
+    async def test_cancel_stops_pending_items(self, store):
+        workflow = FakeWorkflow(delay=0.05)
+        manager = JobManager(store, FakeRegistry(workflow), max_workers=1)
+        await manager.start()
+        job_id = await manager.submit(URLS)
+        await asyncio.sleep(0.01)
+        
+        assert await manager.cancel(job_id) is True
+        await asyncio.sleep(0.1)
+        
+        assert store.get_job(job_id)['status'] == "cancelled"
+        assert len(workflow.calls) == 1
+        assert await manager.cancel(job_id) is False
+    
+    async def test_job_that_stops_unexpectedly_is_marked_failed(self, store, monkeypatch):
+        manager = JobManager(store, FakeRegistry(FakeWorkflow()), max_workers=1)
+        await manager.start()
+        
+        def broken(job_id):
+            raise sqlite3.OperationalError("disk I/O error")
+        
+        monkeypatch.setattr(store, "pending_items", broken)
+        job_id = await manager.submit(URLS[:2])
+        await manager.wait(job_id)
+        
+        assert store.get_job(job_id)['status'] == "failed"
+        assert store.get_events(job_id)[-1]['type'] == "job_error"
+        assert store.active_jobs() == []
+
+class TestJobEndpoints:
+    
+    @pytest.fixture
+    def client(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "JOB_STORE_PATH", str(tmp_path / "jobs.db"))
+        with TestClient(app) as client:
+            monkeypatch.setattr(app.state.job_manager, "registry", FakeRegistry(FakeWorkflow(delay=0.01)))
+            yield client
+    
+    def test_large_bulk_request_becomes_job(self, client):
+        urls = [f"https://www.youtube.com/watch?v=video{index:06d}" for index in range(settings.BULK_SYNC_MAX_URLS + 5)]
+        
+        response = client.post("/workflow/linkedin-bulk", json={"urls": urls})
+        assert response.status_code == 202
+        job = response.json()
+        
+        with client.stream("GET", job['events_url']) as stream:
+            events = [line.split(": ", 1)[1] for line in stream.iter_lines() if line.startswith("event: ")]
+        assert events[0] == "job_queued"
+        assert events[-1] == "job_completed"
+        
+        status = client.get(job['status_url']).json()
+        assert status['status'] == "completed"
+        assert status['done'] == len(urls)
+        assert [item['url'] for item in status['items']] == urls
+        assert status['items'][0]['result']['metadata']['linkedin_optimized'] is True
+    
+    def test_events_resume_from_last_event_id(self, client):
+        job = client.post("/jobs", json={"urls": URLS[:2]}).json()
+        with client.stream("GET", job['events_url']) as stream:
+            ids = [int(line[4:]) for line in stream.iter_lines() if line.startswith("id: ")]
+        
+        with client.stream("GET", job['events_url'], headers={"Last-Event-ID": str(ids[-2])}) as stream:
+            replayed = [line for line in stream.iter_lines() if line.startswith("data: ")]
+        
+        assert len(replayed) == 1
+        assert "done" in json.loads(replayed[0][6:])
+    
+    def test_unknown_job_and_url_limit(self, client):
+        assert client.get("/jobs/missing").status_code == 404
+        too_many = [URLS[0]] * (settings.MAX_BULK_URLS + 1)
+        assert client.post("/jobs", json={"urls": too_many}).status_code == 422
@@ -0,0 +1,185 @@
+import asyncio
+import time
+import httpx
+import openai
+import pytest
+from langchain_core.runnables import RunnableBinding
+from langchain_openai import ChatOpenAI
+from src.config.settings import settings
+from src.llm import scheduler as llm_scheduler
+from src.llm.clients import LLMClientFactory, llm_clients
+from src.llm.scheduler import LLMScheduler, ScheduledTransport, llm_priority
+from src.workflows.youtube_workflow import YouTubeWorkflow
+from tests.fixtures.fake_openai_server import FakeOpenAIServer
+
+@pytest.fixture
+def factory():
+    return LLMClientFactory(api_key="sk-test", max_connections=5, max_keepalive_connections=5)
+
+class TestLLMClientFactory:
+    
+    def test_one_model_instance_per_name(self, factory):
+        assert factory.get("gpt-4") is factory.get("gpt-4")
+        assert factory.get("gpt-4") is not factory.get("gpt-4o-mini")
+        assert factory.stats()['models'] == ["gpt-4", "gpt-4o-mini"]
+    
+    def test_overrides_bind_without_new_clients(self, factory):
+        summary = factory.get("gpt-4o-mini", temperature=0.3, max_tokens=600)
+        
+        assert isinstance(summary, RunnableBinding)
+        assert summary.bound is factory.chat_model("gpt-4o-mini")
+        assert summary.kwargs == {'temperature': 0.3, 'max_tokens': 600}
+    
+    def test_models_share_one_connection_pool(self, factory):
+        first = factory.chat_model("gpt-4")
+        second = factory.chat_model("gpt-4o-mini")
+        
+        assert first.root_async_client._client is second.root_async_client._client
+        assert first.root_client._client is second.root_client._client
+        assert first.root_async_client._client._transport._pool._max_connections == 5
+    
+    @pytest.mark.asyncio
+    async def test_aclose_rebuilds_on_next_use(self, factory):
+        before = factory.chat_model("gpt-4")
+        
+        await factory.aclose()
+        
+        assert factory.stats()['models'] == []
+        assert factory.chat_model("gpt-4") is not before
+    
+    def test_workflows_reuse_the_process_wide_client(self):
+        first, second = YouTubeWorkflow(), YouTubeWorkflow()
+        
+        shared = llm_clients.get(settings.OPENAI_MODEL)
+        assert first.transcript_agent.llm is shared
+        assert first.title_agent.llm is second.content_agent.llm
+        assert first.content_agent.summary_llm.bound is llm_clients.chat_model(settings.CONTENT_SUMMARY_MODEL)
+
+def chat_model(transport: httpx.AsyncBaseTransport, **overrides) -> ChatOpenAI:
+    """ChatOpenAI talking to the fake server through the given transport"""
+    return ChatOpenAI(
+        model="gpt-4o-mini",
+        api_key="sk-test",
+        base_url="http://fake-openai/v1",
+        max_tokens=50,
+        cache=False,
+        http_async_client=httpx.AsyncClient(transport=transport),
+        **overrides
+    )
+
+@pytest.mark.asyncio
+class TestLLMScheduler:
+    
+    async def test_burst_within_quota_is_never_throttled(self):
+        # The scheduler's budget sits a little under the server's, as it should in production
+        server = FakeOpenAIServer(requests_per_window=5, window=0.5)
+        scheduler = LLMScheduler(requests_per_minute=4, window=0.5)
+        llm = chat_model(ScheduledTransport(server.transport(), scheduler))
+        
+        started = time.perf_counter()
+        answers = await asyncio.gather(*(llm.ainvoke(f"question {index}") for index in range(12)))
+        elapsed = time.perf_counter() - started
+        
+        assert [answer.content for answer in answers] == ["ok"] * 12
+        assert (server.accepted, server.rejected) == (12, 0)
+        # 4 at once, then one every 0.125 s
+        assert elapsed >= 0.9
+        assert scheduler.stats()['admitted'] == 12
+    
+    async def test_same_burst_without_scheduler_fails(self):
+        server = FakeOpenAIServer(requests_per_window=5, window=0.5)
+        llm = chat_model(server.transport(), max_retries=0)
+        
+        outcomes = await asyncio.gather(*(llm.ainvoke(f"question {index}") for index in range(12)), return_exceptions=True)
+        
+        # Only the first 5 fit the quota; the other 7 become failed workflows
+        assert sum(isinstance(outcome, openai.RateLimitError) for outcome in outcomes) == 7
+    
+    async def test_token_quota_spaces_out_large_prompts(self):
+        # Each call counts 25 prompt + 50 completion tokens against 160 tokens per 0.4 s
+        server = FakeOpenAIServer(tokens_per_window=200, window=0.4)
+        scheduler = LLMScheduler(tokens_per_minute=160, window=0.4)
+        llm = chat_model(ScheduledTransport(server.transport(), scheduler))
+        
+        await asyncio.gather(*(llm.ainvoke("x" * 100) for _ in range(6)))
+        
+        assert (server.accepted, server.rejected) == (6, 0)
+        assert scheduler.stats()['max_wait_seconds'] >= 0.3
+    
+    async def test_throttled_calls_retry_with_jittered_backoff(self):
+        # No local budget: every limit is discovered from 429s
+        server = FakeOpenAIServer(requests_per_window=3, window=0.3)
+        scheduler = LLMScheduler(max_retries=10, backoff_base=0.02, backoff_max=0.2)
+        llm = chat_model(ScheduledTransport(server.transport(), scheduler))
+        
+        answers = await asyncio.gather(*(llm.ainvoke(f"question {index}") for index in range(8)))
+        
+        stats = scheduler.stats()
+        assert len(answers) == server.accepted == 8
+        assert stats['throttled'] == stats['retries'] == server.rejected > 0
+        assert stats['gave_up'] == 0
+    
+    async def test_gives_up_without_the_client_retrying_again(self):
+        server = FakeOpenAIServer(requests_per_window=1, window=5.0)
+        scheduler = LLMScheduler(max_retries=0)
+        llm = chat_model(ScheduledTransport(server.transport(), scheduler))
+        
+        outcomes = await asyncio.gather(*(llm.ainvoke(f"question {index}") for index in range(3)), return_exceptions=True)
+        
+        assert sum(isinstance(outcome, openai.RateLimitError) for outcome in outcomes) == 2
+        # x-should-retry stops the OpenAI client's own retries
+        assert server.rejected == scheduler.stats()['gave_up'] == 2
+    
+    async def test_interactive_calls_go_before_queued_bulk_calls(self):
+        scheduler = LLMScheduler(requests_per_minute=1, window=0.05)
+        order = []
+        
+        async def call(name, priority):
+            await scheduler.acquire(1, priority)
+            order.append(name)
+        
+        bulk = [asyncio.create_task(call(f"bulk-{index}", "bulk")) for index in range(4)]
+        await asyncio.sleep(0.01)
+        assert scheduler.stats()['queue_depth_by_priority'] == {"interactive": 0, "bulk": 3}
+        
+        interactive = asyncio.create_task(call("interactive", "interactive"))
+        await asyncio.gather(interactive, *bulk)
+        
+        assert order == ["bulk-0", "interactive", "bulk-1", "bulk-2", "bulk-3"]
+        assert scheduler.stats()['queue_depth'] == 0
+    
+    async def test_cancelled_waiters_leave_the_queue(self):
+        scheduler = LLMScheduler(requests_per_minute=1, window=10.0)
+        await scheduler.acquire(1)
+        waiter = asyncio.create_task(scheduler.acquire(1))
+        await asyncio.sleep(0.01)
+        
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        
+        assert scheduler.stats()['queue_depth'] == 0
+    
+    async def test_bulk_batches_run_at_bulk_priority(self, monkeypatch):
+        workflow = YouTubeWorkflow()
+        seen = []
+        
+        async def process(url, output_format="linkedin", language="en", bypass_cache=False):
+            seen.append(llm_scheduler._priority.get())
+            return {'title': url}
+        
+        monkeypatch.setattr(workflow, "process_youtube_video", process)
+        await workflow.process_multiple_videos(["https://youtu.be/aaaaaaaaaaa", "https://youtu.be/bbbbbbbbbbb"])
+        
+        assert seen == ["bulk", "bulk"]
+        assert llm_scheduler._priority.get() == "interactive"
+        with llm_priority("bulk"):
+            assert llm_scheduler._priority.get() == "bulk"
+    
+    async def test_factory_sends_async_calls_through_the_scheduler(self):
+        factory = LLMClientFactory(api_key="sk-test", max_connections=5, scheduler=LLMScheduler(requests_per_minute=100))
+        transport = factory.chat_model("gpt-4").root_async_client._client._transport
+        
+        assert isinstance(transport, ScheduledTransport)
+        assert transport.transport._pool._max_connections == 5
+        assert factory.stats()['scheduler']['available'] == {"requests": 100}
+        await factory.aclose()
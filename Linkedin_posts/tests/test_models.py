@@ -0,0 +1,46 @@
+from src.models.transcript import TranscriptSegments
+from tests.fixtures.stub_transcript_api import SAMPLE_SEGMENTS
+
+def make_segments(count: int) -> TranscriptSegments:
+    return TranscriptSegments(
+        [f"segment {i} [music] (laughs)  text" for i in range(count)],
+        [i * 3.0 for i in range(count)],
+        [3.0] * count
+    )
+
+class TestTranscriptSegments:
+    
+    def test_from_parts_handles_dicts_and_objects(self):
+        class Snippet:
+            text, start, duration = "object snippet", 9.0, 1.5
+        
+        segments = TranscriptSegments.from_parts(SAMPLE_SEGMENTS + [Snippet()])
+        assert len(segments) == 3
+        assert segments.starts == [0.0, 3.0, 9.0]
+        assert segments.total_duration == 7.0
+        assert segments.text().endswith("object snippet")
+    
+    def test_clean_removes_artifacts_per_segment(self):
+        segments = TranscriptSegments(["hello [music] world", "(applause)", "  bye  "], [0.0, 1.0, 2.0], [1.0, 1.0, 1.0])
+        cleaned = segments.clean()
+        
+        assert cleaned.texts == ["hello world", "bye"]
+        assert cleaned.starts == [0.0, 2.0]
+        assert cleaned.text() == "hello world bye"
+    
+    def test_slice_time_is_a_view(self):
+        segments = make_segments(100).clean()
+        view = segments.slice_time(30.0, 60.0)
+        
+        assert len(view) == 10
+        assert view.segments is segments
+        assert view.start == 30.0
+        assert view.end == 60.0
+        assert view.text().startswith("segment 10 text")
+        assert len(segments.slice_time(1000.0, 2000.0)) == 0
+    
+    def test_dict_round_trip(self):
+        segments = make_segments(5)
+        restored = TranscriptSegments.from_dict(segments.to_dict())
+        assert restored.text() == segments.text()
+        assert TranscriptSegments.from_dict(SAMPLE_SEGMENTS).texts[0] == SAMPLE_SEGMENTS[0]["text"]
@@ -0,0 +1,85 @@
+import pytest
+from src.ratelimit import MemoryBucketBackend, RateLimiter, SQLiteBucketBackend
+
+class FakeClock:
+    
+    def __init__(self):
+        self.now = 1_000_000.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+class TestRateLimiter:
+    
+    def test_burst_up_to_capacity_then_retry_after(self, clock):
+        limiter = RateLimiter(MemoryBucketBackend(), per_minute=3, clock=clock)
+        
+        decisions = [limiter.check("ip:1.2.3.4") for _ in range(4)]
+        
+        assert [d['allowed'] for d in decisions] == [True, True, True, False]
+        assert [d['remaining'] for d in decisions] == [2, 1, 0, 0]
+        # One token comes back every 20 seconds
+        assert decisions[-1]['retry_after'] == 20
+    
+    def test_tokens_refill_over_time(self, clock):
+        limiter = RateLimiter(MemoryBucketBackend(), per_minute=3, clock=clock)
+        for _ in range(3):
+            limiter.check("ip:1.2.3.4")
+        
+        clock.now += 19
+        assert not limiter.check("ip:1.2.3.4")['allowed']
+        clock.now += 1
+        assert limiter.check("ip:1.2.3.4")['allowed']
+        assert not limiter.check("ip:1.2.3.4")['allowed']
+    
+    def test_hour_window_binds_after_minute_refills(self, clock):
+        limiter = RateLimiter(MemoryBucketBackend(), per_minute=10, per_hour=12, clock=clock)
+        assert all(limiter.check("key:a")['allowed'] for _ in range(10))
+        
+        clock.now += 60
+        assert limiter.check("key:a")['allowed'] and limiter.check("key:a")['allowed']
+        decision = limiter.check("key:a")
+        
+        assert not decision['allowed']
+        # 3600 / 12 seconds per hourly token, less the 60 seconds already refilled
+        assert decision['retry_after'] == 240
+    
+    def test_clients_have_separate_buckets(self, clock):
+        limiter = RateLimiter(MemoryBucketBackend(), per_minute=1, clock=clock)
+        assert limiter.check(RateLimiter.client_key("secret-1"))['allowed']
+        assert not limiter.check(RateLimiter.client_key("secret-1"))['allowed']
+        assert limiter.check(RateLimiter.client_key("secret-2"))['allowed']
+        assert limiter.check(RateLimiter.client_key(address="10.0.0.1"))['allowed']
+        assert "secret" not in RateLimiter.client_key("secret-1")
+        assert limiter.stats()['limited'] == 1
+    
+    def test_disabled_windows_allow_everything(self, clock):
+        limiter = RateLimiter(MemoryBucketBackend(), per_minute=0, per_hour=0, clock=clock)
+        assert all(limiter.check("ip:1.2.3.4")['allowed'] for _ in range(100))
+    
+    def test_memory_backend_drops_least_recent_clients(self, clock):
+        backend = MemoryBucketBackend(max_clients=2)
+        limiter = RateLimiter(backend, per_minute=1, clock=clock)
+        for client in ("a", "b", "c"):
+            limiter.check(client)
+        
+        assert len(backend._buckets) == 2
+        assert limiter.check("a")['allowed']
+    
+    def test_sqlite_backend_shares_buckets_between_limiters(self, tmp_path, clock):
+        # Two limiters on one file stand in for two worker processes
+        path = str(tmp_path / "ratelimit.db")
+        first = RateLimiter(SQLiteBucketBackend(path), per_minute=4, clock=clock)
+        second = RateLimiter(SQLiteBucketBackend(path), per_minute=4, clock=clock)
+        
+        allowed = [limiter.check("key:shared")['allowed'] for limiter in (first, second) * 3]
+        
+        assert allowed == [True, True, True, True, False, False]
+        clock.now += 15
+        assert second.check("key:shared")['allowed']
+        first.close()
+        second.close()
@@ -0,0 +1,277 @@
+import asyncio
+import time
+import httpx
+import pytest
+from src.agents import transcript_agent
+from src.agents.title_agent import TitleAgent
+from src.agents.transcript_agent import TranscriptAgent
+from src.cache.transcript_cache import TranscriptCache
+from src.config.settings import settings
+from src.resilience import CircuitBreaker, CircuitBreakerTransport
+from src.tools import youtube_tools
+from src.workflows.youtube_workflow import YouTubeWorkflow
+from tests.fixtures.fake_llm import SlowFakeChatModel
+from tests.fixtures.faults import FaultySearchTool, Outage, make_faulty_transcript_api
+from tests.fixtures.stub_workflow import StubSearchTool, make_stubbed_workflow
+from utils.deadline import deadline_after
+from utils.exceptions import CircuitOpenError
+from utils.hedging import HedgedStrategyRunner
+
+URL = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+
+class FakeClock:
+    
+    def __init__(self):
+        self.now = 1_000.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+def make_breaker(clock, **overrides) -> CircuitBreaker:
+    options = {'failure_rate': 0.5, 'min_calls': 4, 'window': 60.0, 'open_seconds': 30.0, 'clock': clock}
+    return CircuitBreaker("upstream", **{**options, **overrides})
+
+def fail(breaker: CircuitBreaker, times: int = 1) -> None:
+    for _ in range(times):
+        with pytest.raises(ConnectionError):
+            with breaker.guard():
+                raise ConnectionError("down")
+
+class TestCircuitBreaker:
+    
+    def test_opens_once_the_failure_rate_crosses_the_threshold(self, clock):
+        breaker = make_breaker(clock)
+        breaker.record_success()
+        fail(breaker, 2)
+        assert breaker.state == "closed"  # 2 of 3 failed, but too few calls to judge
+        
+        fail(breaker)
+        
+        assert breaker.state == "open"
+        with pytest.raises(CircuitOpenError):
+            breaker.acquire()
+        assert breaker.stats()['rejected'] == 1
+        assert breaker.stats()['retry_in'] == 30.0
+    
+    def test_stays_closed_below_the_threshold(self, clock):
+        breaker = make_breaker(clock)
+        for _ in range(10):
+            breaker.record_success()
+            breaker.record_success()
+            fail(breaker)
+        
+        assert breaker.state == "closed"
+        assert breaker.stats()['failure_rate'] == pytest.approx(0.333, abs=0.001)
+    
+    def test_failures_outside_the_window_are_forgotten(self, clock):
+        breaker = make_breaker(clock)
+        fail(breaker, 3)
+        clock.now += 61
+        
+        fail(breaker)
+        
+        assert breaker.state == "closed"
+        assert breaker.stats()['window_calls'] == 1
+    
+    def test_half_open_probe_success_closes(self, clock):
+        breaker = make_breaker(clock, min_calls=1)
+        fail(breaker)
+        clock.now += 30
+        
+        assert breaker.state == "half_open"
+        breaker.acquire()
+        # Only one probe at a time; everything else still fails fast
+        assert not breaker.available()
+        with pytest.raises(CircuitOpenError):
+            breaker.acquire()
+        breaker.record_success()
+        
+        assert breaker.state == "closed"
+        assert breaker.stats()['window_calls'] == 0
+    
+    def test_half_open_probe_failure_reopens(self, clock):
+        breaker = make_breaker(clock, min_calls=1)
+        fail(breaker)
+        clock.now += 30
+        
+        fail(breaker)
+        
+        assert breaker.state == "open"
+        assert breaker.stats()['opened'] == 2
+        assert breaker.stats()['retry_in'] == 30.0
+    
+    def test_cancelled_probe_frees_its_slot(self, clock):
+        breaker = make_breaker(clock, min_calls=1)
+        fail(breaker)
+        clock.now += 30
+        
+        with pytest.raises(asyncio.CancelledError):
+            with breaker.guard():
+                raise asyncio.CancelledError()
+        
+        assert breaker.state == "half_open"
+        assert breaker.available()
+    
+    def test_errors_the_upstream_is_not_blamed_for(self, clock):
+        breaker = make_breaker(clock, min_calls=1)
+        
+        with pytest.raises(LookupError):
+            with breaker.guard(is_failure=lambda error: not isinstance(error, LookupError)):
+                raise LookupError("no captions for this video")
+        
+        assert breaker.state == "closed"
+        assert breaker.stats()['successes'] == 1
+    
+    def test_disabled_breaker_never_opens(self, clock):
+        breaker = make_breaker(clock, min_calls=1, enabled=False)
+        
+        fail(breaker, 5)
+        
+        assert breaker.state == "closed"
+        assert breaker.stats()['failures'] == 5
+
+@pytest.mark.asyncio
+class TestCircuitBreakerTransport:
+    
+    def client(self, breaker, status_code=500):
+        calls = []
+        
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(status_code, json={})
+        
+        transport = CircuitBreakerTransport(httpx.MockTransport(handler), breaker)
+        return httpx.AsyncClient(transport=transport, base_url="http://fake-openai"), calls
+    
+    async def test_server_errors_open_the_circuit_and_it_answers_itself(self, clock):
+        breaker = make_breaker(clock, min_calls=2)
+        client, calls = self.client(breaker)
+        
+        statuses = [(await client.post("/v1/chat/completions")).status_code for _ in range(2)]
+        rejected = await client.post("/v1/chat/completions")
+        
+        assert statuses == [500, 500]
+        assert len(calls) == 2
+        assert rejected.status_code == 503
+        assert rejected.headers["x-should-retry"] == "false"
+        assert rejected.json()["error"]["type"] == "circuit_open"
+    
+    async def test_throttling_is_not_an_outage(self, clock):
+        breaker = make_breaker(clock, min_calls=2)
+        client, calls = self.client(breaker, status_code=429)
+        
+        for _ in range(5):
+            await client.post("/v1/chat/completions")
+        
+        assert len(calls) == 5
+        assert breaker.state == "closed"
+
+@pytest.mark.asyncio
+class TestOutages:
+    """Fault injection: the same upstream outage with and without breakers"""
+    
+    async def run_requests(self, workflow, count: int) -> list:
+        latencies = []
+        for _ in range(count):
+            started = time.perf_counter()
+            result = await workflow.process_youtube_video(URL, timeout=5)
+            latencies.append(time.perf_counter() - started)
+            assert result['title'] == "Building Multi-Agent Workflows"
+        return latencies
+    
+    async def test_trend_outage_is_skipped_once_the_breaker_opens(self):
+        latencies = {}
+        for enabled in (False, True):
+            outage = Outage(stall=0.2)
+            outage.down = True
+            workflow = make_stubbed_workflow(YouTubeWorkflow)
+            workflow.title_agent.tools[1] = FaultySearchTool(outage)
+            workflow.title_agent.trend_breaker = CircuitBreaker("trend_search", min_calls=3, enabled=enabled)
+            
+            latencies[enabled] = await self.run_requests(workflow, 10)
+            calls = outage.calls
+        
+        # Without a breaker every request waits out the stalled search
+        assert min(latencies[False]) >= 0.2
+        # With one, only the calls it takes to open the breaker do
+        assert calls == 3
+        assert max(latencies[True][3:]) < 0.1
+        assert sum(latencies[True]) < sum(latencies[False]) / 2
+    
+    async def test_request_deadlines_are_not_blamed_on_the_trend_search(self):
+        agent = TitleAgent()
+        agent.trend_breaker = CircuitBreaker("trend_search", min_calls=1)
+        
+        # A healthy search cut short by the request's own deadline, and one with no time left to start
+        for deadline in (deadline_after(0.05), time.monotonic()):
+            assert await agent._get_trending_topics(StubSearchTool(0.3), deadline) == "No trend data available"
+        
+        assert agent.trend_breaker.state == "closed"
+        assert agent.trend_breaker.stats()['failures'] == 0
+    
+    async def test_a_search_slower_than_its_own_cap_still_counts(self, monkeypatch):
+        monkeypatch.setattr(settings, "TREND_SEARCH_TIMEOUT", 0.05)
+        agent = TitleAgent()
+        agent.trend_breaker = CircuitBreaker("trend_search", min_calls=1)
+        
+        await agent._get_trending_topics(StubSearchTool(0.3), deadline_after(5))
+        
+        assert agent.trend_breaker.state == "open"
+    
+    @pytest.fixture
+    def faulty_youtube(self, monkeypatch, tmp_path):
+        outage = Outage(stall=0.1)
+        breaker = CircuitBreaker("youtube_transcripts", min_calls=2, open_seconds=0.3)
+        cache = TranscriptCache(str(tmp_path / "t.db"), ttl_seconds=60, max_bytes=1024, max_memory_entries=1, enabled=False)
+        monkeypatch.setattr(youtube_tools, "YouTubeTranscriptApi", make_faulty_transcript_api(outage))
+        monkeypatch.setattr(youtube_tools, "_strategy_runner", HedgedStrategyRunner(hedge_delay=None, max_workers=1))
+        monkeypatch.setattr(youtube_tools, "_transcript_breaker", breaker)
+        monkeypatch.setattr(youtube_tools, "transcript_cache", cache)
+        monkeypatch.setattr(transcript_agent, "transcript_cache", cache)
+        return outage, breaker
+    
+    def make_agent(self) -> TranscriptAgent:
+        agent = TranscriptAgent()
+        agent.llm = SlowFakeChatModel(respond=lambda prompt: "Cleaned transcript")
+        agent.llm_breaker = CircuitBreaker("openai")
+        return agent
+    
+    async def test_transcript_outage_fails_fast_then_recovers(self, faulty_youtube):
+        outage, breaker = faulty_youtube
+        outage.down = True
+        agent = self.make_agent()
+        
+        outcomes = []
+        for _ in range(4):
+            started = time.perf_counter()
+            state = await agent.process({'youtube_url': URL, 'transcript': "", 'metadata': {}, 'error': ""})
+            outcomes.append((state['error'], time.perf_counter() - started))
+        
+        # Both caption tracks stall and fail for each request until the breaker opens
+        assert all(duration >= 0.2 for _, duration in outcomes[:2])
+        assert all("circuit open" in error and duration < 0.05 for error, duration in outcomes[2:])
+        assert outage.calls == 4
+        
+        outage.down = False
+        await asyncio.sleep(0.3)
+        state = await agent.process({'youtube_url': URL, 'transcript': "", 'metadata': {}, 'error': ""})
+        
+        assert state['error'] == ""
+        assert state['transcript'] == "Cleaned transcript"
+        assert breaker.state == "closed"
+    
+    async def test_openai_outage_falls_back_to_the_regex_cleaner(self, faulty_youtube):
+        agent = self.make_agent()
+        agent.llm_breaker = CircuitBreaker("openai", min_calls=1)
+        agent.llm_breaker.record_failure()
+        
+        state = await agent.process({'youtube_url': URL, 'transcript': "", 'metadata': {}, 'error': ""})
+        
+        assert state['error'] == ""
+        assert state['transcript'] == agent._simple_clean_transcript(state['transcript_segments'].text())
+        assert state['metadata']['agent_history'][-1]['simple_cleaning'] is True
+        assert agent.llm.calls == []
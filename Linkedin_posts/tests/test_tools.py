@@ -1,8 +1,22 @@
 import pytest
+import asyncio
+import json
+import os
+import time
+from src.cache.transcript_cache import TranscriptCache
+from src.config.settings import settings
+from src.models.analysis import SEOAnalysis, StructureAnalysis
+from src.resilience import CircuitBreaker
+from src.tools import youtube_tools
 from src.tools.youtube_tools import YouTubeTranscriptTool, YouTubeMetadataTool
 from src.tools.content_tools import ContentStructureTool, SEOAnalysisTool
+from src.tools.scoring import score_document, score_documents
 from src.tools.seo_tools import AdvancedSEOTool, KeywordExtractorTool
 from tests.fixtures.sample_data import SAMPLE_TRANSCRIPT, SAMPLE_YOUTUBE_URLS
+from tests.fixtures.stub_transcript_api import make_stub_api
+from utils.hedging import HedgedStrategyRunner
+from utils.helpers import calculate_readability_score, count_syllables
+from utils.text_analysis import TextFeatures, analyze_text
 
 class TestYouTubeTools:
     
@@ -17,6 +31,97 @@ class TestYouTubeTools:
         assert "metadata" in tool.description.lower()
     
     # Note: Actual YouTube API tests would require valid videos with transcripts
+    
+    @pytest.mark.asyncio
+    async def test_async_transcript_does_not_block_event_loop(self, monkeypatch):
+        def slow_fetch(self, youtube_url, language="en"):
+            time.sleep(0.5)  # Simulates a blocking transcript download
+            return "transcript text"
+        
+        monkeypatch.setattr(YouTubeTranscriptTool, "_run", slow_fetch)
+        tool = YouTubeTranscriptTool()
+        
+        # Measure how late a concurrent coroutine wakes up while downloads run
+        max_lag = 0.0
+        async def other_request():
+            nonlocal max_lag
+            for _ in range(20):
+                start = time.perf_counter()
+                await asyncio.sleep(0.02)
+                max_lag = max(max_lag, time.perf_counter() - start - 0.02)
+        
+        results = await asyncio.gather(
+            tool._arun(SAMPLE_YOUTUBE_URLS[0]),
+            tool._arun(SAMPLE_YOUTUBE_URLS[1]),
+            other_request()
+        )
+        
+        assert results[0] == "transcript text"
+        assert max_lag < 0.1
+    
+    @pytest.mark.asyncio
+    async def test_async_transcript_timeout(self, monkeypatch):
+        def hung_fetch(self, youtube_url, language="en"):
+            time.sleep(1)
+            return "transcript text"
+        
+        monkeypatch.setattr(YouTubeTranscriptTool, "_run", hung_fetch)
+        monkeypatch.setattr(settings, "YOUTUBE_TRANSCRIPT_TIMEOUT", 0.1)
+        
+        start = time.perf_counter()
+        result = await YouTubeTranscriptTool()._arun(SAMPLE_YOUTUBE_URLS[0])
+        
+        assert result.startswith("Error")
+        assert "timed out" in result
+        assert time.perf_counter() - start < 0.5
+    
+    def test_slow_failing_method_is_hedged(self, tmp_path, monkeypatch):
+        stub = make_stub_api(manual=(0.5, True), generated=(0.05, False))
+        monkeypatch.setattr(youtube_tools, "YouTubeTranscriptApi", stub)
+        monkeypatch.setattr(youtube_tools, "_strategy_runner", HedgedStrategyRunner(hedge_delay=0.1, max_workers=3))
+        monkeypatch.setattr(youtube_tools, "transcript_cache", TranscriptCache(
+            str(tmp_path / "t.db"), ttl_seconds=60, max_bytes=1024, max_memory_entries=1, enabled=False
+        ))
+        tool = YouTubeTranscriptTool()
+        
+        start = time.perf_counter()
+        assert "multi-agent workflow" in tool._run(SAMPLE_YOUTUBE_URLS[0])
+        assert time.perf_counter() - start < 0.4
+        assert youtube_tools._strategy_runner.preferred_strategy("dQw4w9WgXcQ") == "generated"
+    
+    @pytest.mark.parametrize("available", [("en",), ("en", "es")])
+    def test_requested_language_never_falls_back_to_english(self, available, tmp_path, monkeypatch):
+        stub = make_stub_api(available=available)
+        cache = TranscriptCache(str(tmp_path / "t.db"), ttl_seconds=60, max_bytes=1024 * 1024, max_memory_entries=8)
+        monkeypatch.setattr(youtube_tools, "YouTubeTranscriptApi", stub)
+        monkeypatch.setattr(youtube_tools, "_strategy_runner", HedgedStrategyRunner(hedge_delay=None, max_workers=1))
+        monkeypatch.setattr(youtube_tools, "_transcript_breaker", CircuitBreaker("youtube_transcripts"))
+        monkeypatch.setattr(youtube_tools, "transcript_cache", cache)
+        
+        result = YouTubeTranscriptTool()._run(SAMPLE_YOUTUBE_URLS[0], language="es")
+        
+        # Every caption track was asked for in Spanish only
+        assert stub.requested and all(languages == ["es"] for languages in stub.requested)
+        assert cache.get_segments("dQw4w9WgXcQ", "en") is None
+        if "es" in available:
+            assert "multi-agent workflow" in result
+            assert cache.get_segments("dQw4w9WgXcQ", "es") is not None
+        else:
+            assert result.startswith("Error")
+            assert cache.get_segments("dQw4w9WgXcQ", "es") is None
+    
+    def test_failed_methods_start_next_without_waiting(self):
+        runner = HedgedStrategyRunner(hedge_delay=10, max_workers=3)
+        
+        def fail():
+            raise RuntimeError("no captions")
+        
+        start = time.perf_counter()
+        name, result = runner.run([("a", fail), ("b", fail), ("c", lambda: "ok")], key="video")
+        
+        assert (name, result) == ("c", "ok")
+        assert time.perf_counter() - start < 1
+        assert runner.run([("a", fail), ("c", lambda: "ok")], key="video")[0] == "c"
 
 class TestContentTools:
     
@@ -42,6 +147,22 @@ class TestContentTools:
         result = tool._run(SAMPLE_TRANSCRIPT)
         assert "SEO Analysis" in result
         assert "word_count" in result
+    
+    def test_typed_results_render_the_tool_text(self):
+        structure = ContentStructureTool().analyze(SAMPLE_TRANSCRIPT, "linkedin")
+        seo = SEOAnalysisTool().analyze(SAMPLE_TRANSCRIPT)
+        
+        assert isinstance(structure, StructureAnalysis) and isinstance(seo, SEOAnalysis)
+        assert str(structure) == ContentStructureTool()._run(f"{SAMPLE_TRANSCRIPT}|||linkedin")
+        assert seo.text == SEOAnalysisTool()._run(SAMPLE_TRANSCRIPT) == AdvancedSEOTool()._run(SAMPLE_TRANSCRIPT)
+        assert json.loads(seo.text.split("SEO Analysis:")[1]) == seo.data
+        assert structure.structure_score == structure.data['structure_score']
+        assert seo.seo_score == seo.data['seo_score']
+    
+    def test_text_is_rendered_once_and_only_on_demand(self):
+        seo = AdvancedSEOTool().analyze(SAMPLE_TRANSCRIPT)
+        assert 'text' not in seo.__dict__
+        assert seo.text is seo.text
 
 class TestSEOTools:
     
@@ -59,4 +180,79 @@ class TestSEOTools:
         tool = KeywordExtractorTool()
         result = tool._run(SAMPLE_TRANSCRIPT)
         assert "Keyword Analysis" in result
-        assert "single_keywords" in result
\ No newline at end of file
+        assert "single_keywords" in result
+    
+    @pytest.mark.parametrize("case", json.load(open(
+        os.path.join(os.path.dirname(__file__), "fixtures", "keyword_golden.json"), encoding="utf-8"
+    )), ids=lambda case: case["name"])
+    def test_keyword_extraction_matches_golden_output(self, case):
+        # Recorded from the previous per-n implementation; output must stay byte-for-byte identical
+        assert KeywordExtractorTool()._run(case["content"]) == case["expected"]
+class TestBatchScoring:
+    
+    DOCUMENTS = [SAMPLE_TRANSCRIPT, "", "# Agents\n\n- plan\n- act\n\nShort post. Another line.", SAMPLE_TRANSCRIPT * 5]
+    
+    def test_matches_tool_output_without_json_round_trip(self):
+        score = score_document(SAMPLE_TRANSCRIPT, index=3)
+        tool_output = AdvancedSEOTool()._run(SAMPLE_TRANSCRIPT)
+        
+        assert score.index == 3
+        assert score.analysis == json.loads(tool_output.split("Advanced SEO Analysis:", 1)[1])
+        assert score.seo_score == score.analysis['seo_score']
+        assert score.readability_score == score.analysis['readability']['score']
+        assert score.word_count == len(SAMPLE_TRANSCRIPT.split())
+    
+    def test_batch_keeps_input_order(self):
+        scores = score_documents(self.DOCUMENTS)
+        assert [score.index for score in scores] == [0, 1, 2, 3]
+        assert scores[1].word_count == 0
+        assert scores[2].analysis['structure']['lists']['bullet_lists'] == 2
+        assert scores[3].word_count == 5 * scores[0].word_count
+    
+    def test_failures_are_reported_per_document(self):
+        scores = score_documents([SAMPLE_TRANSCRIPT, None])
+        assert scores[0].error is None
+        assert scores[1].error.startswith("Scoring failed")
+    
+    def test_process_pool_matches_in_process_scoring(self, monkeypatch):
+        monkeypatch.setattr(settings, "SCORING_PROCESS_MIN_DOCUMENTS", 2)
+        expected = score_documents(self.DOCUMENTS, workers=0)
+        assert score_documents(self.DOCUMENTS, workers=2, chunksize=1) == expected
+
+class TestTextFeatures:
+    
+    TEXT = "Agents plan tasks. They call tools, keep memory!\n\nAgents... scale -- well.  #AI"
+    
+    def test_tokens_and_terms_stay_aligned(self):
+        features = TextFeatures(self.TEXT)
+        assert features.tokens == self.TEXT.split()
+        assert len(features.terms) == len(features.tokens)
+        assert features.terms[features.tokens.index("--")] == ""
+        assert features.terms[features.tokens.index("Agents...")] == "agents"
+        assert features.term_counts["agents"] == 2
+    
+    def test_counts_match_period_and_paragraph_splits(self):
+        features = TextFeatures(self.TEXT)
+        assert features.sentence_count == len([s for s in self.TEXT.split('.') if s.strip()])
+        assert features.paragraph_count == 2
+        assert features.period_count == self.TEXT.count('.')
+        assert features.first_sentence == "Agents plan tasks"
+    
+    def test_keyword_and_ngram_counts(self):
+        features = TextFeatures("the agent plans to act; the agent acts, the agent plans again")
+        assert features.keyword_counts({"the"}) == {"agent": 3, "plans": 2, "act": 1, "acts": 1, "again": 1}
+        assert features.ngram_counts(2)["agent plans"] == 2
+        assert features.ngram_counts(3)["the agent plans"] == 2
+        assert "agent plans to" not in features.ngram_counts(3)
+        table = features.ngram_table((1, 3))
+        assert set(table) == {1, 3}
+        assert table[3] == features.ngram_counts(3)
+        assert list(table[1])[:3] == ["the", "agent", "plans"]
+    
+    def test_readability_helpers_read_shared_features(self):
+        # Vowel groups over the whole text, minus one for the final "e"
+        assert count_syllables("Make make cake") == 5
+        assert count_syllables("") == 1
+        assert calculate_readability_score("") == 0.0
+        assert calculate_readability_score(self.TEXT) == TextFeatures(self.TEXT).readability
+        assert analyze_text(self.TEXT) is analyze_text(self.TEXT)
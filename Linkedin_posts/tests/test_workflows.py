@@ -1,5 +1,12 @@
+import asyncio
 import pytest
+import time
+from fastapi import HTTPException
+from src.config.settings import settings
+from src.workflows.parallel_workflow import ParallelYouTubeWorkflow
+from src.workflows.registry import WorkflowRegistry
 from src.workflows.youtube_workflow import YouTubeWorkflow
+from tests.fixtures.stub_workflow import make_stubbed_workflow
 
 @pytest.fixture
 def workflow():
@@ -18,4 +25,433 @@ class TestYouTubeWorkflow:
         assert info['workflow_version'] == '2.0.0'
         assert len(info['agents']) == 3
         assert 'supported_platforms' in info
-        assert 'workflow_steps' in info
\ No newline at end of file
+        assert 'workflow_steps' in info
+@pytest.mark.asyncio
+class TestParallelYouTubeWorkflow:
+    
+    URL = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+    
+    async def test_matches_sequential_output(self):
+        sequential = make_stubbed_workflow(YouTubeWorkflow)
+        parallel = make_stubbed_workflow(ParallelYouTubeWorkflow)
+        
+        expected = await sequential.process_youtube_video(self.URL)
+        result = await parallel.process_youtube_video(self.URL)
+        
+        assert result['title'] == expected['title']
+        # The content was drafted without the title, so the merge puts it on top
+        assert result['content'] == f"{expected['title']}\n\n{expected['content']}"
+        assert result['seo_analysis'] == expected['seo_analysis']
+        history = [entry['agent'] for entry in result['metadata']['agent_history']]
+        assert history == ["TranscriptAgent", "TitleAgent", "ContentAgent"]
+    
+    @pytest.mark.parametrize("output_format, headline", [("linkedin", "{title}\n\n"), ("blog", "# {title}\n\n"), ("twitter", "")])
+    async def test_merge_puts_the_title_on_top_of_the_content(self, output_format, headline):
+        parallel = make_stubbed_workflow(ParallelYouTubeWorkflow)
+        
+        result = await parallel.process_youtube_video(self.URL, output_format)
+        
+        assert result['content'].startswith(headline.format(title=result['title']))
+        assert result['content'].count(result['title']) == (1 if headline else 0)
+    
+    async def test_title_and_content_run_concurrently(self):
+        parallel = make_stubbed_workflow(ParallelYouTubeWorkflow, llm_delay=0.01)
+        events = []
+        started = {'title': asyncio.Event(), 'content': asyncio.Event()}
+        
+        def overlapping(branch, other, process):
+            async def run(state):
+                events.append(f"{branch} started")
+                started[branch].set()
+                # Neither branch finishes before the other has started; run in sequence, this times out
+                await asyncio.wait_for(started[other].wait(), timeout=2)
+                result = await process(state)
+                events.append(f"{branch} finished")
+                return result
+            return run
+        
+        parallel.title_agent.process = overlapping('title', 'content', parallel.title_agent.process)
+        parallel.content_agent.process = overlapping('content', 'title', parallel.content_agent.process)
+        await parallel.process_youtube_video(self.URL)
+        
+        assert sorted(events[:2]) == ["content started", "title started"]
+        assert sorted(events[2:]) == ["content finished", "title finished"]
+    
+    async def test_branch_error_fails_the_workflow(self):
+        parallel = make_stubbed_workflow(ParallelYouTubeWorkflow)
+        parallel.title_agent.llm.fail_when = lambda prompt: True
+        
+        with pytest.raises(HTTPException) as excinfo:
+            await parallel.process_youtube_video(self.URL)
+        
+        assert excinfo.value.status_code == 400
+        assert "TitleAgent failed" in excinfo.value.detail
+    
+    def test_registry_builds_parallel_variant(self):
+        registry = WorkflowRegistry()
+        
+        workflow = registry.get("youtube_parallel")
+        
+        assert isinstance(workflow, ParallelYouTubeWorkflow)
+        assert workflow.get_workflow_info()['topology'] == 'fan_out'
+        assert registry.get("youtube_parallel") is workflow
+
+@pytest.mark.asyncio
+class TestBulkProcessing:
+    
+    URLS = [f"https://www.youtube.com/watch?v=video{index:06d}" for index in range(10)]
+    
+    async def test_bulk_runs_concurrently(self, monkeypatch):
+        monkeypatch.setattr(settings, "MAX_CONCURRENT_REQUESTS", 10)
+        workflow = make_stubbed_workflow(YouTubeWorkflow, llm_delay=0.05)
+        
+        started = time.perf_counter()
+        await workflow.process_youtube_video(self.URLS[0])
+        single_time = time.perf_counter() - started
+        
+        result = await workflow.process_multiple_videos(self.URLS)
+        
+        assert result['success_count'] == 10
+        assert result['duration_seconds'] < single_time * 3
+        assert all(item['duration_seconds'] >= single_time * 0.5 for item in result['items'])
+    
+    async def test_concurrency_is_capped(self, monkeypatch):
+        monkeypatch.setattr(settings, "MAX_CONCURRENT_REQUESTS", 3)
+        workflow = make_stubbed_workflow(YouTubeWorkflow)
+        in_flight = peak = 0
+        
+        async def process(url, output_format="linkedin", language="en"):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.02)
+            in_flight -= 1
+            return {'content': url}
+        
+        monkeypatch.setattr(workflow, "process_youtube_video", process)
+        result = await workflow.process_multiple_videos(self.URLS)
+        
+        assert peak == 3
+        assert result['success_count'] == 10
+        assert any(item['wait_seconds'] > 0 for item in result['items'])
+    
+    async def test_results_keep_input_order_and_duplicates_run_once(self, monkeypatch):
+        workflow = make_stubbed_workflow(YouTubeWorkflow)
+        calls = []
+        
+        async def process(url, output_format="linkedin", language="en"):
+            calls.append(url)
+            # Later URLs finish first
+            await asyncio.sleep(0.05 if "video000000" in url else 0.0)
+            if "video000002" in url:
+                raise HTTPException(status_code=400, detail="Transcripts are disabled")
+            return {'content': url}
+        
+        monkeypatch.setattr(workflow, "process_youtube_video", process)
+        urls = [self.URLS[0], self.URLS[1], self.URLS[2], "https://youtu.be/video000000"]
+        result = await workflow.process_multiple_videos(urls)
+        
+        assert len(calls) == 3
+        assert [item['url'] for item in result['items']] == urls
+        assert [item['success'] for item in result['items']] == [True, True, False, True]
+        assert result['items'][3]['deduplicated'] is True
+        assert result['items'][3]['video_id'] == "video000000"
+        assert [r['content'] for r in result['results']] == [self.URLS[0], self.URLS[1], self.URLS[0]]
+        assert result['error_count'] == 1
+        assert "Transcripts are disabled" in result['items'][2]['error']
+
+@pytest.mark.asyncio
+class TestStreamingBulkProcessing:
+    
+    URLS = [f"https://www.youtube.com/watch?v=video{index:06d}" for index in range(2000)]
+    
+    async def test_records_arrive_in_completion_order(self, monkeypatch):
+        workflow = make_stubbed_workflow(YouTubeWorkflow)
+        
+        async def process(url, output_format="linkedin", language="en"):
+            await asyncio.sleep(0.05 if "video000000" in url else 0.0)
+            if "video000002" in url:
+                raise HTTPException(status_code=400, detail="Transcripts are disabled")
+            return {'content': url}
+        
+        monkeypatch.setattr(workflow, "process_youtube_video", process)
+        urls = self.URLS[:3] + ["not a url"]
+        records = [record async for record in workflow.stream_multiple_videos(urls, max_concurrency=4)]
+        
+        assert records[-1]['index'] == 0
+        assert sorted(record['index'] for record in records) == [0, 1, 2, 3]
+        failed = {record['index']: record['error'] for record in records if not record['success']}
+        assert "Transcripts are disabled" in failed[2]
+        assert failed[3].startswith("Invalid YouTube URL")
+    
+    async def test_slow_consumer_pauses_intake(self, monkeypatch):
+        workflow = make_stubbed_workflow(YouTubeWorkflow)
+        pulled = []
+        calls = []
+        
+        async def process(url, output_format="linkedin", language="en"):
+            calls.append(url)
+            return {'content': url}
+        
+        def source():
+            for url in self.URLS:
+                pulled.append(url)
+                yield url
+        
+        monkeypatch.setattr(workflow, "process_youtube_video", process)
+        stream = workflow.stream_multiple_videos(source(), max_concurrency=3)
+        
+        first = await stream.__anext__()
+        await asyncio.sleep(0.05)
+        
+        # Nothing new starts while the consumer holds back
+        assert first['success'] is True
+        assert len(calls) == 3
+        assert len(pulled) == 3
+        
+        for _ in range(10):
+            await stream.__anext__()
+        assert len(pulled) <= 11 + 3
+        await stream.aclose()
+    
+    async def test_in_flight_is_capped_across_large_batch(self, monkeypatch):
+        workflow = make_stubbed_workflow(YouTubeWorkflow)
+        in_flight = peak = 0
+        
+        async def process(url, output_format="linkedin", language="en"):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return {'content': url}
+        
+        monkeypatch.setattr(workflow, "process_youtube_video", process)
+        count = 0
+        async for record in workflow.stream_multiple_videos(iter(self.URLS), max_concurrency=5):
+            count += record['success']
+        
+        assert count == len(self.URLS)
+        assert peak == 5
+
+@pytest.mark.asyncio
+class TestStreamedWorkflow:
+    
+    URL = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+    
+    async def collect(self, workflow):
+        return [event async for event in workflow.stream_youtube_video(self.URL)]
+    
+    async def test_stages_tokens_and_result(self):
+        workflow = make_stubbed_workflow(YouTubeWorkflow)
+        expected = await make_stubbed_workflow(YouTubeWorkflow).process_youtube_video(self.URL)
+        
+        events = await self.collect(workflow)
+        
+        completed = {event['data']['stage']: event['data'] for event in events if event['event'] == 'stage_completed'}
+        assert list(completed) == ["transcript_agent", "title_agent", "content_agent"]
+        assert completed["transcript_agent"]['transcript_length'] == len(expected['transcript'])
+        assert completed["title_agent"]['title'] == expected['title']
+        assert 'transcript_length' not in completed["title_agent"]
+        assert completed["content_agent"]['content_length'] == len(expected['content'])
+        
+        draft = "".join(event['data']['text'] for event in events if event['event'] == 'token' and event['data']['phase'] == 'draft')
+        assert draft == "Agents work best with clear roles."
+        assert all("Multi-Agent" not in event['data']['text'] for event in events if event['event'] == 'token')
+        
+        assert events[-1]['event'] == 'result'
+        assert events[-1]['data']['content'] == expected['content']
+    
+    async def test_tokens_arrive_before_content_stage_ends(self):
+        workflow = make_stubbed_workflow(YouTubeWorkflow, llm_delay=0.05)
+        
+        names = [event['event'] for event in await self.collect(workflow)]
+        
+        content_done = max(index for index, name in enumerate(names) if name == 'stage_completed')
+        assert names.index('token') < content_done
+    
+    async def test_parallel_branches_report_their_artifacts(self):
+        workflow = make_stubbed_workflow(ParallelYouTubeWorkflow)
+        
+        events = await self.collect(workflow)
+        
+        completed = {event['data']['stage']: event['data'] for event in events if event['event'] == 'stage_completed'}
+        assert set(completed) == {"transcript_agent", "title_branch", "content_branch", "merge"}
+        assert completed["title_branch"]['title'] == "Building Multi-Agent Workflows"
+        assert events[-1]['event'] == 'result'
+    
+    async def test_agent_error_ends_stream_with_error_event(self):
+        workflow = make_stubbed_workflow(ParallelYouTubeWorkflow)
+        workflow.title_agent.llm.fail_when = lambda prompt: True
+        
+        events = await self.collect(workflow)
+        
+        assert events[-1]['event'] == 'error'
+        assert "TitleAgent failed" in events[-1]['data']['error']
+        assert all(event['event'] != 'result' for event in events)
+
+@pytest.mark.asyncio
+class TestMultiFormatWorkflow:
+    
+    URL = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+    FORMATS = ["linkedin", "blog", "twitter"]
+    
+    def count_shared_work(self, workflow):
+        counts = {'transcript': 0, 'analysis': 0}
+        extract, analyze = workflow.transcript_agent.process, workflow.title_agent.analyze
+        
+        async def counted_extract(state):
+            counts['transcript'] += 1
+            return await extract(state)
+        
+        async def counted_analyze(transcript, deadline=None):
+            counts['analysis'] += 1
+            return await analyze(transcript, deadline)
+        
+        workflow.transcript_agent.process = counted_extract
+        workflow.title_agent.analyze = counted_analyze
+        return counts
+    
+    async def test_shared_stages_run_once_per_video(self):
+        workflow = make_stubbed_workflow(YouTubeWorkflow)
+        counts = self.count_shared_work(workflow)
+        
+        result = await workflow.process_youtube_video_formats(self.URL, self.FORMATS + ["blog"])
+        
+        assert counts == {'transcript': 1, 'analysis': 1}
+        assert list(result['variants']) == self.FORMATS
+        assert result['success_count'] == 3
+        for fmt, variant in result['variants'].items():
+            assert variant['output_format'] == fmt
+            assert variant['metadata']['input_format'] == fmt
+            assert [entry['agent'] for entry in variant['metadata']['agent_history']] == ["TranscriptAgent", "TitleAgent", "ContentAgent"]
+        assert set(result['timings']) == {'transcript_seconds', 'shared_analysis_seconds', 'generation_seconds', 'total_seconds'}
+    
+    async def test_variants_match_single_format_runs(self):
+        expected = await make_stubbed_workflow(YouTubeWorkflow).process_youtube_video(self.URL, "twitter")
+        
+        result = await make_stubbed_workflow(YouTubeWorkflow).process_youtube_video_formats(self.URL, ["twitter"])
+        
+        assert result['variants']['twitter']['title'] == expected['title']
+        assert result['variants']['twitter']['content'] == expected['content']
+        assert result['transcript'] == expected['transcript']
+    
+    async def test_formats_generate_concurrently(self):
+        delay = 0.1
+        workflow = make_stubbed_workflow(YouTubeWorkflow, llm_delay=delay)
+        
+        result = await workflow.process_youtube_video_formats(self.URL, self.FORMATS)
+        
+        # Each variant makes four round trips; run one after another they would take three times as long
+        durations = [variant['duration_seconds'] for variant in result['variants'].values()]
+        assert all(duration >= 4 * delay for duration in durations)
+        assert result['timings']['generation_seconds'] < sum(durations) * 0.6
+    
+    async def test_failed_variant_does_not_sink_the_others(self):
+        workflow = make_stubbed_workflow(YouTubeWorkflow)
+        workflow.content_agent.llm.fail_when = lambda prompt: "twitter" in prompt.lower()
+        
+        result = await workflow.process_youtube_video_formats(self.URL, self.FORMATS)
+        
+        assert result['variants']['twitter']['success'] is False
+        assert "ContentAgent failed" in result['variants']['twitter']['error']
+        assert result['variants']['linkedin']['success'] is True
+        assert (result['success_count'], result['error_count']) == (2, 1)
+    
+    async def test_transcript_failure_fails_the_request(self):
+        workflow = make_stubbed_workflow(YouTubeWorkflow)
+        
+        async def no_transcript(state):
+            state['error'] = "TranscriptAgent failed: no captions"
+            return state
+        
+        workflow.transcript_agent.process = no_transcript
+        
+        with pytest.raises(HTTPException) as raised:
+            await workflow.process_youtube_video_formats(self.URL, self.FORMATS)
+        assert raised.value.status_code == 400
+
+@pytest.mark.asyncio
+class TestWorkflowDeadlines:
+    
+    URL = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+    
+    async def test_fast_run_is_not_flagged(self):
+        result = await make_stubbed_workflow(YouTubeWorkflow).process_youtube_video(self.URL, timeout=5)
+        
+        assert 'deadline_exceeded' not in result['metadata']
+        assert result['workflow_success'] is True
+    
+    async def test_slow_enhancement_keeps_the_draft(self):
+        workflow = make_stubbed_workflow(YouTubeWorkflow)
+        workflow.content_agent.llm.latency = lambda prompt, response: 30.0 if "Enhance the following" in prompt else 0.0
+        
+        started = time.perf_counter()
+        result = await workflow.process_youtube_video(self.URL, timeout=0.5)
+        
+        assert time.perf_counter() - started < 1.5
+        assert "Agents work best with clear roles." in result['content']
+        assert result['metadata']['deadline_exceeded'] is True
+        assert 'partial' not in result['metadata']
+    
+    @pytest.mark.parametrize("workflow_cls", [YouTubeWorkflow, ParallelYouTubeWorkflow])
+    async def test_hung_llm_returns_partial_result(self, workflow_cls):
+        workflow = make_stubbed_workflow(workflow_cls)
+        workflow.content_agent.llm.delay = 30.0
+        
+        started = time.perf_counter()
+        result = await workflow.process_youtube_video(self.URL, timeout=0.3)
+        
+        assert time.perf_counter() - started < 1.0
+        assert result['transcript']
+        assert result['title'] == "Building Multi-Agent Workflows"
+        assert result['content'] == ""
+        assert result['metadata']['partial'] is True
+        assert "content generation" in result['metadata']['partial_reason']
+        assert result['workflow_success'] is False
+    
+    async def test_hung_upstream_is_cancelled_at_the_cutoff(self, monkeypatch):
+        monkeypatch.setattr(settings, "WORKFLOW_DEADLINE_GRACE", 0.1)
+        workflow = make_stubbed_workflow(YouTubeWorkflow)
+        cancelled = asyncio.Event()
+        
+        async def hung_transcript(state):
+            # An upstream call that ignores the deadline in the state
+            try:
+                await asyncio.sleep(30)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+        
+        workflow.transcript_agent.process = hung_transcript
+        workflow.workflow = workflow._build_workflow()
+        
+        started = time.perf_counter()
+        with pytest.raises(HTTPException) as raised:
+            await workflow.process_youtube_video(self.URL, timeout=0.2)
+        
+        assert time.perf_counter() - started < 1.0
+        assert raised.value.status_code == 504
+        assert cancelled.is_set()
+    
+    async def test_slow_trend_search_is_skipped(self, monkeypatch):
+        monkeypatch.setattr(settings, "TREND_SEARCH_TIMEOUT", 0.1)
+        workflow = make_stubbed_workflow(YouTubeWorkflow, search_delay=0.5)
+        
+        started = time.perf_counter()
+        result = await workflow.process_youtube_video(self.URL, timeout=5)
+        
+        assert time.perf_counter() - started < 0.4
+        assert result['title'] == "Building Multi-Agent Workflows"
+        assert 'deadline_exceeded' not in result['metadata']
+    
+    async def test_stream_ends_with_partial_result(self, monkeypatch):
+        monkeypatch.setattr(settings, "WORKFLOW_TIMEOUT", 0.3)
+        workflow = make_stubbed_workflow(YouTubeWorkflow)
+        workflow.content_agent.llm.delay = 30.0
+        
+        events = [event async for event in workflow.stream_youtube_video(self.URL)]
+        
+        assert events[-1]['event'] == 'result'
+        assert events[-1]['data']['metadata']['partial'] is True
+        assert events[-1]['data']['title'] == "Building Multi-Agent Workflows"
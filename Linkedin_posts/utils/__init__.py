@@ -24,7 +24,11 @@ from .helpers import (
     format_for_platform,
     format_for_linkedin,
     format_for_twitter,
-    format_for_blog
+    format_for_blog,
+    split_sentences,
+    chunk_text,
+    calculate_engagement_score,
+    add_linkedin_metadata
 )
 from .exceptions import (
     WorkflowException,
@@ -32,8 +36,15 @@ from .exceptions import (
     TitleGenerationError,
     ContentGenerationError,
     ValidationError,
-    ConfigurationError
+    ConfigurationError,
+    StrategyExhaustedError,
+    DeadlineExceededError,
+    CircuitOpenError
 )
+from .hedging import HedgedStrategyRunner
+from .chapters import detect_chapters
+from .text_analysis import TextFeatures, analyze_text
+from .deadline import deadline_after, time_left, expired, within
 
 __all__ = [
     "setup_logger",
@@ -55,10 +66,25 @@ __all__ = [
     "format_for_linkedin",
     "format_for_twitter",
     "format_for_blog",
+    "split_sentences",
+    "chunk_text",
+    "calculate_engagement_score",
+    "add_linkedin_metadata",
     "WorkflowException",
     "TranscriptExtractionError",
     "TitleGenerationError",
     "ContentGenerationError",
     "ValidationError",
-    "ConfigurationError"
+    "ConfigurationError",
+    "StrategyExhaustedError",
+    "DeadlineExceededError",
+    "CircuitOpenError",
+    "HedgedStrategyRunner",
+    "detect_chapters",
+    "TextFeatures",
+    "analyze_text",
+    "deadline_after",
+    "time_left",
+    "expired",
+    "within"
 ]
@@ -0,0 +1,83 @@
+"""Topical chapter detection for long transcripts from pauses and vocabulary shifts"""
+
+import math
+import re
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from typing import List, Optional, Tuple
+
+_WORD = re.compile(r"[a-z][a-z0-9']+")
+_STOPWORDS = frozenset("""
+    a about after all also an and any are as at be because been but by can could did do does
+    for from get go going got had has have he her here him his how i if in into is it its
+    just know let like me more my no not now of on one or our out really right say see she
+    so some that the their them then there these they thing things think this those to up
+    us very want was way we well were what when where which who why will with would yeah
+    you your
+""".split())
+
+# Boundary score weights: vocabulary change dominates, a long pause nudges the cut
+_PAUSE_WEIGHT = 0.5
+_PAUSE_SECONDS = 2.0
+
+def _bag(text: str) -> Counter:
+    return Counter(word for word in _WORD.findall(text.lower()) if word not in _STOPWORDS)
+
+def _cosine(left: Counter, right: Counter) -> float:
+    if not left or not right:
+        return 0.0
+    if len(left) > len(right):
+        left, right = right, left
+    dot = sum(count * right[word] for word, count in left.items())
+    norm = math.sqrt(sum(v * v for v in left.values())) * math.sqrt(sum(v * v for v in right.values()))
+    return dot / norm if norm else 0.0
+
+def detect_chapters(
+    units: List[str],
+    target_chars: int = 6000,
+    starts: Optional[List[float]] = None,
+    durations: Optional[List[float]] = None,
+    window: int = 8
+) -> List[Tuple[int, int]]:
+    """Split text units into [first, last) chapters of roughly target_chars, cutting where the topic shifts"""
+    count = len(units)
+    prefix = [0]
+    for unit in units:
+        prefix.append(prefix[-1] + len(unit) + 1)
+
+    bags = [_bag(unit) for unit in units]
+
+    def boundary_score(index: int) -> float:
+        """How strongly a chapter should start at units[index]"""
+        left, right = Counter(), Counter()
+        for bag in bags[max(0, index - window):index]:
+            left.update(bag)
+        for bag in bags[index:index + window]:
+            right.update(bag)
+        score = 1.0 - _cosine(left, right)
+        if starts and durations:
+            pause = starts[index] - (starts[index - 1] + durations[index - 1])
+            score += _PAUSE_WEIGHT * min(max(pause, 0.0) / _PAUSE_SECONDS, 1.0)
+        return score
+
+    chapters = []
+    first = 0
+    while first < count:
+        remaining = prefix[count] - prefix[first]
+        if remaining <= target_chars * 1.5:
+            chapters.append((first, count))
+            break
+
+        # Cut between half and one-and-a-half targets, never leaving a tiny final chapter
+        low = prefix[first] + target_chars // 2
+        high = prefix[first] + min(target_chars * 3 // 2, remaining - target_chars // 2)
+        candidates = range(max(first + 1, bisect_left(prefix, low)), bisect_right(prefix, high))
+        if not candidates:
+            # A single oversized unit: it becomes its own chapter
+            cut = first + 1
+        else:
+            middle = prefix[first] + target_chars
+            cut = max(candidates, key=lambda index: (boundary_score(index), -abs(prefix[index] - middle)))
+        chapters.append((first, cut))
+        first = cut
+    return chapters
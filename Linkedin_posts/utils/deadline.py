@@ -0,0 +1,35 @@
+import asyncio
+import time
+from typing import Awaitable, Optional, TypeVar
+from utils.exceptions import DeadlineExceededError
+
+T = TypeVar("T")
+
+# Deadlines are time.monotonic() instants: they only mean something inside the process that set them
+
+def deadline_after(seconds: Optional[float]) -> Optional[float]:
+    """Deadline `seconds` from now; None (no deadline) when seconds is unset or not positive"""
+    return time.monotonic() + seconds if seconds and seconds > 0 else None
+
+def time_left(deadline: Optional[float], cap: Optional[float] = None) -> Optional[float]:
+    """Seconds until the deadline, never below zero or above cap; None when there is neither"""
+    if deadline is None:
+        return cap
+    remaining = max(0.0, deadline - time.monotonic())
+    return remaining if cap is None else min(cap, remaining)
+
+def expired(deadline: Optional[float]) -> bool:
+    return deadline is not None and time.monotonic() >= deadline
+
+async def within(awaitable: Awaitable[T], deadline: Optional[float], cap: Optional[float] = None, what: str = "call") -> T:
+    """Await with whatever budget is left; on expiry the call is cancelled and DeadlineExceededError raised"""
+    timeout = time_left(deadline, cap)
+    if timeout is not None and timeout <= 0:
+        # Don't start work that has no time to finish
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise DeadlineExceededError(f"No time left for {what}")
+    try:
+        return await asyncio.wait_for(awaitable, timeout)
+    except asyncio.TimeoutError:
+        raise DeadlineExceededError(f"{what} timed out after {timeout:.1f}s")
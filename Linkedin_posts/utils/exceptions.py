@@ -1,3 +1,5 @@
+from typing import Dict, Optional
+
 class WorkflowException(Exception):
     """Base exception for workflow-related errors"""
     pass
@@ -20,4 +22,23 @@ class ValidationError(WorkflowException):
 
 class ConfigurationError(WorkflowException):
     """Exception raised when configuration is invalid"""
-    pass 
\ No newline at end of file
+    pass
+
+class StrategyExhaustedError(WorkflowException):
+    """Exception raised when every fallback strategy has failed"""
+    
+    def __init__(self, message: str, errors: Optional[Dict[str, Exception]] = None):
+        super().__init__(message)
+        self.errors = errors or {}
+
+class IdempotencyConflictError(WorkflowException):
+    """Exception raised when an idempotency key is reused for a different request"""
+    pass
+
+class DeadlineExceededError(WorkflowException):
+    """Exception raised when a request runs out of its time budget"""
+    pass
+
+class CircuitOpenError(WorkflowException):
+    """Exception raised when a call is failed fast because its upstream's circuit breaker is open"""
+    pass
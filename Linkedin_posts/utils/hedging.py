@@ -0,0 +1,89 @@
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from utils.exceptions import StrategyExhaustedError
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+class HedgedStrategyRunner:
+    """Run interchangeable strategies with staggered (hedged) starts and keep the first success"""
+    
+    def __init__(self, hedge_delay: Optional[float], max_workers: int, max_remembered: int = 1024):
+        # hedge_delay=None only moves on after failures, i.e. plain sequential fallback
+        self.hedge_delay = hedge_delay
+        self.max_remembered = max_remembered
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hedged-strategy")
+        self._preferred: Dict[str, str] = {}
+        self._lock = threading.Lock()
+    
+    def run(self, strategies: List[Tuple[str, Callable[[], Any]]], key: Optional[str] = None) -> Tuple[str, Any]:
+        """Return (strategy name, result) of the first strategy to succeed"""
+        # The next strategy starts once every running one has failed, or when hedge_delay
+        # passes without a result; the strategy that wins for a key is tried first next time
+        ordered = self._order(strategies, key)
+        pending: Dict[Future, str] = {}
+        errors: Dict[str, Exception] = {}
+        next_index = 0
+        
+        def launch_next():
+            nonlocal next_index
+            name, strategy = ordered[next_index]
+            next_index += 1
+            pending[self._executor.submit(strategy)] = name
+        
+        launch_next()
+        while pending:
+            can_hedge = next_index < len(ordered)
+            done, _ = wait(
+                pending,
+                timeout=self.hedge_delay if can_hedge else None,
+                return_when=FIRST_COMPLETED
+            )
+            
+            if not done:
+                # Slow strategy - hedge with the next one while it keeps running
+                launch_next()
+                continue
+            
+            for future in done:
+                name = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.warning(f"Strategy '{name}' failed: {e}")
+                    errors[name] = e
+                    continue
+                
+                self._remember(key, name)
+                return name, result
+            
+            # Everything running has failed - start the next strategy without waiting
+            if not pending and next_index < len(ordered):
+                launch_next()
+        
+        raise StrategyExhaustedError(
+            "All strategies failed: " + "; ".join(f"{name}: {error}" for name, error in errors.items()),
+            errors
+        )
+    
+    def preferred_strategy(self, key: str) -> Optional[str]:
+        with self._lock:
+            return self._preferred.get(key)
+    
+    def _order(self, strategies: List[Tuple[str, Callable[[], Any]]], key: Optional[str]) -> List[Tuple[str, Callable[[], Any]]]:
+        """Move the strategy that last worked for this key to the front"""
+        preferred = self.preferred_strategy(key) if key else None
+        if preferred is None:
+            return list(strategies)
+        return sorted(strategies, key=lambda item: item[0] != preferred)
+    
+    def _remember(self, key: Optional[str], name: str) -> None:
+        if key is None:
+            return
+        with self._lock:
+            self._preferred.pop(key, None)
+            self._preferred[key] = name
+            # Dicts keep insertion order, so the first key is the least recently updated
+            while len(self._preferred) > self.max_remembered:
+                del self._preferred[next(iter(self._preferred))]
@@ -1,6 +1,7 @@
 import re
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 from datetime import datetime
+from .text_analysis import analyze_text
 
 def create_metadata(
     video_id: str,
@@ -18,42 +19,64 @@ def create_metadata(
         'workflow_version': '2.0.0'
     }
 
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+
+def split_sentences(text: str) -> List[str]:
+    """Split text on sentence-ending punctuation, keeping the punctuation"""
+    return [s for s in _SENTENCE_BOUNDARY.split(text.strip()) if s]
+
+def chunk_text(units: List[str], max_chars: int, overlap_chars: int = 0) -> List[Tuple[str, str]]:
+    """Group text units into (context, body) chunks; context is the tail of the previous body"""
+    pieces = []
+    for unit in units:
+        unit = unit.strip()
+        if len(unit) <= max_chars:
+            if unit:
+                pieces.append(unit)
+            continue
+        # Unpunctuated transcripts can be one huge "sentence"; fall back to word boundaries
+        words, current, size = unit.split(), [], 0
+        for word in words:
+            if current and size + len(word) + 1 > max_chars:
+                pieces.append(" ".join(current))
+                current, size = [], 0
+            current.append(word)
+            size += len(word) + 1
+        if current:
+            pieces.append(" ".join(current))
+    
+    bodies, current, size = [], [], 0
+    for piece in pieces:
+        if current and size + len(piece) + 1 > max_chars:
+            bodies.append(" ".join(current))
+            current, size = [], 0
+        current.append(piece)
+        size += len(piece) + 1
+    if current:
+        bodies.append(" ".join(current))
+    
+    chunks = []
+    for i, body in enumerate(bodies):
+        context = ""
+        if i and overlap_chars > 0:
+            previous = bodies[i - 1]
+            context = previous[-overlap_chars:]
+            # Start the context on a word boundary
+            if len(previous) > overlap_chars and " " in context:
+                context = context.split(" ", 1)[1]
+        chunks.append((context, body))
+    return chunks
+
 def calculate_readability_score(text: str) -> float:
     """Calculate Flesch Reading Ease score for text"""
     try:
-        sentences = [s for s in text.split('.') if s.strip()]
-        words = text.split()
-        syllables = count_syllables(text)
-        
-        if len(sentences) == 0 or len(words) == 0:
-            return 0.0
-        
-        # Flesch Reading Ease formula
-        score = 206.835 - (1.015 * (len(words) / len(sentences))) - (84.6 * (syllables / len(words)))
-        
-        return max(0.0, min(100.0, score))
-        
+        return analyze_text(text).readability
     except Exception:
         return 50.0  # Default score if calculation fails
 
 def count_syllables(text: str) -> int:
     """Count syllables in text (simplified approach)"""
-    text = text.lower()
-    count = 0
-    vowels = "aeiouy"
-    on_vowel = False
-    
-    for char in text:
-        is_vowel = char in vowels
-        if is_vowel and not on_vowel:
-            count += 1
-        on_vowel = is_vowel
-    
-    # Add one for words ending in 'e' (common in English)
-    if text.endswith('e'):
-        count -= 1
-    
-    return max(1, count)  # At least one syllable per word
+    return analyze_text(text).syllable_count
 
 def extract_hashtags(text: str) -> list:
     """Extract hashtags from text"""
@@ -128,4 +151,37 @@ def format_for_blog(content: str) -> str:
             else:
                 formatted_lines.append(line)
     
-    return '\n'.join(formatted_lines) 
\ No newline at end of file
+    return '\n'.join(formatted_lines)
+
+def calculate_engagement_score(content: str) -> int:
+    """Calculate estimated engagement score for LinkedIn content"""
+    score = 50
+    
+    if content.startswith('🚀') or content.startswith('💡'):
+        score += 10
+    if '?' in content:
+        score += 15
+    if content.count('#') >= 3:
+        score += 10
+    if len(content.split('\n\n')) >= 3:
+        score += 5
+    if any(word in content.lower() for word in ['insights', 'tips', 'secrets', 'guide']):
+        score += 10
+    
+    if len(content) > 3000:
+        score -= 20
+    if content.count('#') > 10:
+        score -= 15
+    if content.count('!') > 5:
+        score -= 10
+    
+    return max(0, min(100, score))
+
+def add_linkedin_metadata(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Add LinkedIn-specific metadata to a workflow result in place"""
+    content = result['content']
+    result['metadata']['linkedin_optimized'] = True
+    result['metadata']['estimated_engagement_score'] = calculate_engagement_score(content)
+    result['metadata']['character_count'] = len(content)
+    result['metadata']['hashtag_count'] = content.count('#')
+    return result
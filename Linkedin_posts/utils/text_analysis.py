@@ -0,0 +1,125 @@
+"""Single-pass text analytics shared by the SEO, structure and title tools"""
+
+import re
+from collections import Counter
+from functools import cached_property, lru_cache
+from typing import Dict, Iterable, List
+
+# Tokens come from str.split(), so they never contain whitespace; removing [^\w\s] from the
+# joined tokens cleans each one exactly as a per-token [^\w] substitution would
+_PUNCTUATION = re.compile(r'[^\w\s]')
+_VOWEL_RUN = re.compile(r'[aeiouy]+')
+
+class TextFeatures:
+    """Tokens, sentence pieces and counts of one text; each feature is computed on first use, then reused"""
+    
+    def __init__(self, text: str):
+        self.text = text
+    
+    @cached_property
+    def lower(self) -> str:
+        return self.text.lower()
+    
+    @cached_property
+    def tokens(self) -> List[str]:
+        """Whitespace-separated words, as written"""
+        return self.text.split()
+    
+    @cached_property
+    def lower_tokens(self) -> List[str]:
+        return self.lower.split()
+    
+    @cached_property
+    def terms(self) -> List[str]:
+        """Lowercased tokens without punctuation, aligned with tokens ('' where a token was all punctuation)"""
+        if not self.lower_tokens:
+            return []
+        # One substitution over the whole text; splitting on the single space restores the alignment
+        return _PUNCTUATION.sub('', ' '.join(self.lower_tokens)).split(' ')
+    
+    @cached_property
+    def term_counts(self) -> Counter:
+        """Frequency of every term, in first-occurrence order"""
+        return Counter(self.terms)
+    
+    @cached_property
+    def sentence_pieces(self) -> List[str]:
+        """The text split on periods, blanks included"""
+        return self.text.split('.')
+    
+    @cached_property
+    def sentences(self) -> List[str]:
+        return [piece for piece in self.sentence_pieces if piece.strip()]
+    
+    @cached_property
+    def paragraphs(self) -> List[str]:
+        return [paragraph for paragraph in self.text.split('\n\n') if paragraph.strip()]
+    
+    @property
+    def word_count(self) -> int:
+        return len(self.tokens)
+    
+    @property
+    def sentence_count(self) -> int:
+        return len(self.sentences)
+    
+    @property
+    def paragraph_count(self) -> int:
+        return len(self.paragraphs)
+    
+    @property
+    def period_count(self) -> int:
+        return len(self.sentence_pieces) - 1
+    
+    @property
+    def first_sentence(self) -> str:
+        return self.sentence_pieces[0].strip()
+    
+    @cached_property
+    def syllable_count(self) -> int:
+        """Vowel groups across the whole text (simplified approach), at least one"""
+        count = len(_VOWEL_RUN.findall(self.lower))
+        # Add one for words ending in 'e' (common in English)
+        if self.lower.endswith('e'):
+            count -= 1
+        return max(1, count)
+    
+    @cached_property
+    def readability(self) -> float:
+        """Flesch Reading Ease score, clamped to 0-100"""
+        if self.sentence_count == 0 or self.word_count == 0:
+            return 0.0
+        score = 206.835 - (1.015 * (self.word_count / self.sentence_count)) - (84.6 * (self.syllable_count / self.word_count))
+        return max(0.0, min(100.0, score))
+    
+    def keyword_counts(self, stop_words: Iterable[str] = (), min_length: int = 3) -> Dict[str, int]:
+        """Term frequencies without stop words and short terms, in first-occurrence order"""
+        stop_words = frozenset(stop_words)
+        return {
+            term: count for term, count in self.term_counts.items()
+            if len(term) >= min_length and term not in stop_words
+        }
+    
+    def ngram_counts(self, n: int, min_length: int = 3) -> Counter:
+        """Frequency of n consecutive terms, each at least min_length characters, joined by spaces"""
+        return self.ngram_table((n,), min_length)[n]
+    
+    def ngram_table(self, sizes: Iterable[int] = (1, 2, 3), min_length: int = 3) -> Dict[int, Counter]:
+        """Counts for several n-gram sizes, each in first-occurrence order, from one pass per size"""
+        sizes = set(sizes)
+        # Slot i holds the gram starting at term i, or None if a short term breaks it
+        grams = [term if len(term) >= min_length else None for term in self.terms]
+        valid = grams
+        table = {}
+        for n in range(1, max(sizes) + 1):
+            if n > 1:
+                # Extend each (n-1)-gram by the term after it rather than re-joining whole windows
+                grams = [gram + ' ' + term if gram and term else None for gram, term in zip(grams, valid[n - 1:])]
+            if n in sizes:
+                table[n] = Counter(filter(None, grams))
+        return table
+
+@lru_cache(maxsize=16)
+def analyze_text(text: str) -> TextFeatures:
+    """Shared features of text, so tools looking at the same content tokenize it only once"""
+    return TextFeatures(text)